@@ -0,0 +1,60 @@
+"""
+Compare the chained `pd.merge` calls previously used by `HydroDataMerger`
+with the single-pass `align_frames` engine on synthetic daily series.
+
+Usage: uv run python -m benchmarks.bench_merge
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+from prepare_data.merge_handler import align_frames
+
+REPEAT = 20
+SIZES = (3_300, 30_000, 100_000)
+
+
+def synthetic_frames(n_days: int):
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("1900-01-01", periods=n_days, freq="D")
+    api = pd.DataFrame({"date": dates, "resultat_obs_elab": rng.random(n_days)})
+    prod = pd.DataFrame({"date": dates[::-1][: n_days - 10], "prod_hydro": rng.random(n_days - 10)})
+    weather = pd.DataFrame({
+        "date": dates[5:],
+        "rain_sum": rng.random(n_days - 5),
+        "precipitation_hours": rng.random(n_days - 5),
+    })
+    return api, prod, weather
+
+
+def chained_merge(api, prod, weather):
+    merged = pd.merge(api.copy(), prod, on="date", how="inner")
+    return pd.merge(merged, weather[["date", "rain_sum", "precipitation_hours"]], on="date", how="inner")
+
+
+def single_pass(api, prod, weather):
+    return align_frames({"api": api, "prod": prod, "weather": weather}, how="inner")[0]
+
+
+def timed(fn, *args) -> float:
+    fn(*args)
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn(*args)
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def main():
+    for n_days in SIZES:
+        frames = synthetic_frames(n_days)
+        chained = timed(chained_merge, *frames)
+        aligned = timed(single_pass, *frames)
+        print(
+            f"{n_days:>9} days | chained pd.merge {chained:8.2f} ms | "
+            f"align_frames {aligned:8.2f} ms | {chained / aligned:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
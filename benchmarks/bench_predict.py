@@ -0,0 +1,85 @@
+"""
+Compare the single-row inference paths of the `/predict` route.
+
+- pandas: DataFrame + `transform_date` (previous route implementation)
+- fast: `WIND_FEATURES.transform_one` on a preallocated NumPy row
+
+Uses the published random forest artifact when available, otherwise fits a
+forest of the served size on synthetic data.
+
+Usage: uv run python -m benchmarks.bench_predict
+"""
+
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from models.artifacts import FlatForest, load_current
+from models.data_preparation import transform_date
+from models.features import WIND_FEATURES
+from models.model import initialize_model
+
+REPEAT = 2000
+
+RECORD = {
+    "date": "2025-03-14",
+    "wind_gusts_10m_mean": 32.4,
+    "wind_speed_10m_mean": 14.1,
+    "winddirection_10m_dominant": 290,
+}
+
+
+def synthetic_forest() -> FlatForest:
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2016-09-01", "2025-09-29", freq="D")
+    df = pd.DataFrame({
+        "date": dates,
+        "wind_gusts_10m_mean": rng.gamma(4, 8, len(dates)),
+        "wind_speed_10m_mean": rng.gamma(4, 4, len(dates)),
+        "winddirection_10m_dominant": rng.integers(0, 360, len(dates)),
+    })
+    y = df["wind_speed_10m_mean"] * 3 + rng.normal(0, 5, len(dates))
+    model = initialize_model().fit(WIND_FEATURES.frame(df), y)
+    return FlatForest.from_estimator(model)
+
+
+def pandas_features():
+    return transform_date(pd.DataFrame([RECORD]))[WIND_FEATURES.features]
+
+
+def fast_features():
+    return WIND_FEATURES.transform_one(date.fromisoformat(RECORD["date"]), RECORD)
+
+
+def timed(fn) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    return (time.perf_counter() - start) / REPEAT * 1e6
+
+
+def main():
+    try:
+        model = load_current("random_forest")
+    except FileNotFoundError:
+        print("· No published artifact, fitting a synthetic forest...")
+        model = synthetic_forest()
+    print(f"· Forest: {model.metadata['n_trees']} trees, {model.metadata['n_nodes']} nodes")
+
+    results = {
+        "features (pandas)": timed(pandas_features),
+        "features (fast)": timed(fast_features),
+        "predict (pandas)": timed(lambda: model.predict(pandas_features())),
+        "predict (fast)": timed(lambda: model.predict(fast_features())),
+    }
+    for name, micros in results.items():
+        print(f"{name:<20}: {micros:9.1f} µs/row")
+    print(
+        f"· Feature building speed-up: {results['features (pandas)'] / results['features (fast)']:.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
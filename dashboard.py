@@ -0,0 +1,96 @@
+import os
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from prepare_data.dashboard_data import (
+    PERIODS,
+    PRODUCTION_TABLES,
+    aggregate,
+    downsample,
+    error_summary,
+    load_predictions,
+    load_tables,
+    prediction_errors,
+)
+
+# Seconds a cached range stays valid (new days are ingested at most daily)
+CACHE_TTL = int(os.getenv("DASHBOARD_CACHE_TTL", "900"))
+DEFAULT_YEARS = 3
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def cached_tables(start: date, end: date) -> dict[str, pd.DataFrame]:
+    """Raw production tables of a range, fetched concurrently once per range."""
+    return load_tables(start, end)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def cached_series(table: str, start: date, end: date, period: str) -> pd.DataFrame:
+    """Production of a table aggregated per period, downsampled for plotting."""
+    df = cached_tables(start, end)[table]
+    return downsample(aggregate(df, PRODUCTION_TABLES[table], PERIODS[period]))
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def cached_errors(start: date, end: date) -> pd.DataFrame:
+    """Served wind predictions of a range next to the observed production."""
+    return prediction_errors(load_predictions(start, end), cached_tables(start, end)["eolienne"])
+
+
+def line(df: pd.DataFrame, title: str):
+    figure = px.line(df, x="date", y="value", color="series", title=title, render_mode="webgl")
+    figure.update_layout(xaxis_title=None, yaxis_title=None, legend_title=None)
+    return figure
+
+
+def main():
+    st.set_page_config(page_title="predict-energy-production", layout="wide")
+    st.title("Energy production monitoring")
+
+    with st.sidebar:
+        today = date.today()
+        selected = st.date_input(
+            "Range",
+            value=(today - timedelta(days=365 * DEFAULT_YEARS), today),
+            max_value=today,
+        )
+        period = st.radio("Aggregation", list(PERIODS), horizontal=True)
+        energies = st.multiselect(
+            "Energies", list(PRODUCTION_TABLES), default=list(PRODUCTION_TABLES)
+        )
+        if st.button("Reload data"):
+            st.cache_data.clear()
+    # The range picker returns a single day while the end is being chosen
+    if len(selected) != 2:
+        st.stop()
+    start, end = selected
+
+    started = time.perf_counter()
+    for table in energies:
+        series = cached_series(table, start, end, period)
+        if series.empty:
+            st.info(f"No `{table}` production between {start} and {end}")
+            continue
+        st.plotly_chart(line(series, f"{table} production"), use_container_width=True)
+
+    st.header("Served predictions")
+    errors = cached_errors(start, end)
+    if errors.empty:
+        st.info("No served wind prediction matches an observed day in this range")
+    else:
+        st.dataframe(error_summary(errors), hide_index=True)
+        daily = errors.groupby("date")[["production", "actual"]].mean().reset_index()
+        daily = daily.melt(id_vars="date", var_name="series", value_name="value")
+        st.plotly_chart(
+            line(downsample(daily), "Predicted vs observed wind production"),
+            use_container_width=True,
+        )
+    st.caption(f"Rendered in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
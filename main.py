@@ -1,17 +1,51 @@
 import argparse
+import os
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from prepare_data.prediction_log import prediction_logger
+from routes import analogs, export, forecast, metrics, predict
+from routes.shedding import shedder
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # SCHEDULER_ENABLED=1 runs the refresh job alongside the API; the job lock
+    # keeps a single run at a time across workers
+    scheduler = None
+    if os.getenv("SCHEDULER_ENABLED") == "1":
+        from pipeline.scheduler import Scheduler
+
+        scheduler = Scheduler().start(run_now=False)
+    yield
+    if scheduler is not None:
+        scheduler.stop(timeout=0)
+    # Served predictions still buffered are written before the worker exits
+    prediction_logger.close(timeout=10)
 
-from fastapi import FastAPI
-from pipeline.pipeline import Pipeline
-from prepare_data.db_handler import supabase
-from routes import predict
 
 app = FastAPI(
     title="predict-energy-production",
     description="predict-energy-production API",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.include_router(predict.router)
+app.include_router(forecast.router)
+app.include_router(export.router)
+app.include_router(metrics.router)
+app.include_router(analogs.router)
+
+
+@app.middleware("http")
+async def track_predictions(request: Request, call_next):
+    # Latency is measured from arrival, so time spent waiting for a worker
+    # thread counts towards the load shedding p95
+    if not request.url.path.startswith("/predict"):
+        return await call_next(request)
+    with shedder.track():
+        return await call_next(request)
 
 
 @app.get("/")
@@ -36,18 +70,98 @@ def main():
         action="store_true",
         help="insert clean data into the database",
     )
+    parser.add_argument(
+        "--hourly",
+        action="store_true",
+        help="with -e or -i, also ingest hourly wind data and add its daily features (peak gusts, hours above cut-in speed...)",
+    )
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="with -i, only write new or changed rows (tables do not need to be empty)",
+    )
     parser.add_argument(
         "-p",
         "--production",
         action="store_true",
         help="return production values for a date range",
     )
+    parser.add_argument(
+        "-x",
+        "--export",
+        choices=["eolienne", "solaire", "hydro"],
+        help="stream the rows of a table to stdout (or --output), filtered by --start/--end",
+    )
+    parser.add_argument("--start", help="with -x, first day included <YYYY-MM-DD>")
+    parser.add_argument("--end", help="with -x, last day included <YYYY-MM-DD>")
+    parser.add_argument(
+        "--format",
+        choices=["csv", "ndjson"],
+        default="csv",
+        help="with -x, export format (default: csv)",
+    )
+    parser.add_argument("--output", help="with -x, file to write instead of stdout")
     parser.add_argument(
         "-t",
         "--train",
         action="store_true",
         help="start a new training for our model",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="with -t, only train on days added since the last training (periodic full retrain still applies)",
+    )
+    parser.add_argument(
+        "--energy",
+        choices=["eolienne", "solaire", "hydro"],
+        default="eolienne",
+        help="with -t or -b, energy whose model is trained (default: eolienne)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["random_forest", "xgboost"],
+        default="random_forest",
+        help="with -t or -b, model family (default: random_forest)",
+    )
+    parser.add_argument(
+        "--compact",
+        nargs="?",
+        type=float,
+        const=0.02,
+        metavar="tolerance",
+        help="with -t, also publish a pruned forest whose MAE stays within <tolerance> of the full one (default 0.02)",
+    )
+    parser.add_argument(
+        "-b",
+        "--backtest",
+        action="store_true",
+        help="evaluate the model on rolling-origin folds by date, trained in parallel",
+    )
+    parser.add_argument(
+        "--folds", type=int, default=5, help="with -b, number of folds (default 5)"
+    )
+    parser.add_argument(
+        "--horizon",
+        type=int,
+        default=90,
+        help="with -b, days in the test period of each fold (default 90)",
+    )
+    parser.add_argument(
+        "--window",
+        choices=["expanding", "sliding"],
+        default="expanding",
+        help="with -b, train on all earlier days (expanding) or a fixed window (sliding)",
+    )
+    parser.add_argument(
+        "-s",
+        "--schedule",
+        nargs="?",
+        type=float,
+        const=24,
+        metavar="hours",
+        help="run ingestion, database sync and incremental training every <hours> (default 24) until interrupted",
+    )
     parser.add_argument(
         "-P",
         "--predict",
@@ -56,12 +170,21 @@ def main():
         help="predict production: optionally you can provide (in order) <date> <wind_gusts> <wind_speed> <wind_direction> OR launch interactive mode",
     )
     arguments = parser.parse_args()
-    pipeline = Pipeline(client=supabase)
+    if arguments.backend == "xgboost" and (arguments.incremental or arguments.compact is not None):
+        parser.error("--incremental and --compact are only available with --backend random_forest")
+    # Imported once the command is known: serving the API never loads the
+    # data pipeline, scikit-learn or the database client
+    from pipeline.pipeline import Pipeline
+
+    pipeline = Pipeline(hourly_weather=arguments.hourly)
     if (
         not arguments.explore
         and not arguments.insert
         and not arguments.production
+        and arguments.export is None
         and not arguments.train
+        and not arguments.backtest
+        and arguments.schedule is None
         and arguments.predict is None
     ):
         print(
@@ -70,11 +193,36 @@ def main():
     if arguments.explore:
         pipeline.data_exploration()
     if arguments.insert:
-        pipeline.db_insertion()
+        pipeline.db_insertion(sync=arguments.sync)
     if arguments.production:
         pipeline.get_production_data()
+    if arguments.export is not None:
+        pipeline.export_production_data(
+            table=arguments.export,
+            start=arguments.start,
+            end=arguments.end,
+            fmt=arguments.format,
+            output=arguments.output,
+        )
     if arguments.train:
-        pipeline.start_train()
+        pipeline.start_train(
+            incremental=arguments.incremental,
+            compaction_tolerance=arguments.compact,
+            energy=arguments.energy,
+            backend=arguments.backend,
+        )
+    if arguments.backtest:
+        pipeline.start_backtest(
+            energy=arguments.energy,
+            n_folds=arguments.folds,
+            horizon=arguments.horizon,
+            window=arguments.window,
+            backend=arguments.backend,
+        )
+    if arguments.schedule is not None:
+        from pipeline.scheduler import Scheduler
+
+        Scheduler(interval_hours=arguments.schedule).run_forever()
     if arguments.predict is not None:
         if len(arguments.predict) == 4:
             pipeline.fetch_prediction(
@@ -0,0 +1,271 @@
+import math
+import os
+import threading
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# Table des jours historiques et production observée
+ANALOG_TABLE = "eolienne"
+ANALOG_TARGET = "prod_eolienne"
+# Entrées brutes ; la direction est encodée en sinus / cosinus
+ANALOG_INPUTS = ["wind_speed_10m_mean", "wind_gusts_10m_mean", "winddirection_10m_dominant"]
+# Les jours ajoutés depuis la construction de l'arbre sont parcourus
+# linéairement ; au-delà de cette part de l'arbre, il est reconstruit
+REBUILD_RATIO = 0.1
+MIN_REBUILD_ROWS = 256
+# Intervalle (en secondes) entre deux recherches de nouveaux jours en base,
+# lancées en arrière-plan par les requêtes
+REFRESH_SECONDS = float(os.getenv("ANALOG_REFRESH_SECONDS", "3600"))
+
+
+class AnalogsUnavailable(RuntimeError):
+    """Index impossible à construire : table vide ou base injoignable."""
+
+
+def encode(df: pd.DataFrame) -> np.ndarray:
+    """Vitesse, rafales et direction du vent (sinus, cosinus) d'une table."""
+    radians = np.radians(df["winddirection_10m_dominant"].to_numpy(dtype=np.float64))
+    return np.column_stack([
+        df["wind_speed_10m_mean"].to_numpy(dtype=np.float64),
+        df["wind_gusts_10m_mean"].to_numpy(dtype=np.float64),
+        np.sin(radians),
+        np.cos(radians),
+    ])
+
+
+def encode_one(values: dict) -> np.ndarray:
+    """`encode` d'un seul jour, sans pandas (chemin des requêtes)."""
+    radians = math.radians(values["winddirection_10m_dominant"])
+    return np.array([
+        values["wind_speed_10m_mean"],
+        values["wind_gusts_10m_mean"],
+        math.sin(radians),
+        math.cos(radians),
+    ])
+
+
+def _columns(rows: pd.DataFrame) -> dict:
+    """Colonnes renvoyées par les requêtes, en tableaux NumPy (accès direct par indice)."""
+    columns = {
+        "date": rows["date"].to_numpy(),
+        "inputs": rows[ANALOG_INPUTS].to_numpy(dtype=np.float64),
+        "production": rows[ANALOG_TARGET].to_numpy(dtype=np.float64),
+    }
+    if "site" in rows.columns:
+        columns["site"] = rows["site"].to_numpy()
+    return columns
+
+
+def load_days(start: date | None = None) -> pd.DataFrame:
+    """Jours historiques de la base, à partir de `start` (inclus)."""
+    from prepare_data.db_handler import DBHandler
+
+    return DBHandler().fetch_range(ANALOG_TABLE, start=start)
+
+
+class AnalogIndex:
+    """
+    Index des jours historiques dont la météo ressemble le plus à un jour
+    donné (jours analogues), avec la production observée ces jours-là.
+
+    Les features sont centrées-réduites avec les statistiques de la dernière
+    construction, puis indexées dans un KD-tree. Les jours ingérés ensuite
+    vont dans un petit tampon parcouru linéairement à chaque requête ; quand
+    il dépasse REBUILD_RATIO de l'arbre, l'arbre est reconstruit. Les
+    requêtes lisent un instantané immuable : une reconstruction ne les
+    bloque jamais.
+    """
+
+    def __init__(
+        self,
+        loader=load_days,
+        refresh_seconds: float = REFRESH_SECONDS,
+        rebuild_ratio: float = REBUILD_RATIO,
+    ):
+        self.loader = loader
+        self.refresh_seconds = refresh_seconds
+        self.rebuild_ratio = rebuild_ratio
+        self._snapshot: dict | None = None
+        self._refreshed = 0.0
+        self._lock = threading.Lock()
+        self._building = threading.Lock()
+        self._refreshing = threading.Lock()
+
+    @staticmethod
+    def _clean(df: pd.DataFrame) -> pd.DataFrame:
+        columns = ["date", *ANALOG_INPUTS, ANALOG_TARGET]
+        if "site" in df.columns:
+            columns.append("site")
+        df = df[columns].dropna(subset=[*ANALOG_INPUTS, ANALOG_TARGET])
+        return df.assign(date=pd.to_datetime(df["date"]).dt.strftime("%Y-%m-%d"))
+
+    def _keys(self, df: pd.DataFrame) -> list:
+        return list(zip(df["date"], df["site"])) if "site" in df.columns else list(df["date"])
+
+    def build(self, df: pd.DataFrame | None = None):
+        """
+        Construit l'arbre sur tous les jours (chargés depuis la base par défaut).
+
+        Raises:
+            AnalogsUnavailable: Si aucun jour complet n'est disponible.
+        """
+        from sklearn.neighbors import KDTree
+
+        with self._lock:
+            df = self.loader() if df is None else df
+            if df.empty:
+                raise AnalogsUnavailable(f"× No historical day in `{ANALOG_TABLE}`")
+            rows = self._clean(df).reset_index(drop=True)
+            if rows.empty:
+                raise AnalogsUnavailable(f"× No complete historical day in `{ANALOG_TABLE}`")
+            features = encode(rows)
+            mean = features.mean(axis=0)
+            std = features.std(axis=0)
+            std[std == 0] = 1.0
+            self._snapshot = {
+                "tree": KDTree((features - mean) / std),
+                "rows": rows,
+                "mean": mean,
+                "std": std,
+                "keys": set(self._keys(rows)),
+                "columns": _columns(rows),
+                "delta": np.empty((0, features.shape[1])),
+                "delta_rows": rows.iloc[:0],
+                "delta_columns": _columns(rows.iloc[:0]),
+            }
+            self._refreshed = time.monotonic()
+        print(f"· Analog index built on {len(rows)} days")
+        return self
+
+    def add(self, df: pd.DataFrame) -> int:
+        """
+        Ajoute des jours ingérés (ceux déjà indexés sont ignorés).
+
+        Returns:
+            int: Nombre de jours ajoutés.
+        """
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None:
+                raise RuntimeError("× Analog index is not built")
+            rows = self._clean(df)
+            fresh = [key not in snapshot["keys"] for key in self._keys(rows)]
+            rows = rows[fresh]
+            if rows.empty:
+                return 0
+            delta_rows = pd.concat([snapshot["delta_rows"], rows], ignore_index=True)
+            rebuild = len(delta_rows) > max(
+                MIN_REBUILD_ROWS, self.rebuild_ratio * len(snapshot["rows"])
+            )
+            if not rebuild:
+                delta = (encode(rows) - snapshot["mean"]) / snapshot["std"]
+                self._snapshot = {
+                    **snapshot,
+                    "keys": snapshot["keys"] | set(self._keys(rows)),
+                    "delta": np.vstack([snapshot["delta"], delta]),
+                    "delta_rows": delta_rows,
+                    "delta_columns": _columns(delta_rows),
+                }
+        if rebuild:
+            self.build(pd.concat([snapshot["rows"], delta_rows], ignore_index=True))
+        return len(rows)
+
+    def refresh(self) -> int:
+        """
+        Ajoute les jours de la base plus récents que le dernier jour indexé.
+        Sans effet tant que l'index n'a pas été construit (première requête).
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return 0
+        dates = pd.concat([snapshot["rows"]["date"], snapshot["delta_rows"]["date"]])
+        # Le dernier jour est relu : d'autres sites ont pu être ingérés depuis
+        added = self.add(self.loader(date.fromisoformat(dates.max())))
+        self._refreshed = time.monotonic()
+        return added
+
+    def _ensure_built(self):
+        """
+        Construit l'index à la première requête ; les requêtes concurrentes
+        attendent cette construction au lieu de recharger chacune la table.
+        """
+        if self._snapshot is not None:
+            return
+        with self._building:
+            if self._snapshot is not None:
+                return
+            try:
+                self.build()
+            except AnalogsUnavailable:
+                raise
+            except Exception as e:
+                raise AnalogsUnavailable(f"× Historical days could not be loaded: {e}") from e
+
+    def _refresh_in_background(self):
+        if time.monotonic() - self._refreshed < self.refresh_seconds:
+            return
+        if not self._refreshing.acquire(blocking=False):
+            return
+
+        def run():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"× Analog index refresh failed: {e}")
+                self._refreshed = time.monotonic()
+            finally:
+                self._refreshing.release()
+
+        threading.Thread(target=run, name="analog-refresh", daemon=True).start()
+
+    def query(self, values: dict, k: int = 5) -> list[dict]:
+        """
+        Les `k` jours historiques les plus proches d'une météo.
+
+        Args:
+            values (dict): wind_speed_10m_mean, wind_gusts_10m_mean, winddirection_10m_dominant.
+            k (int): Nombre de jours retournés.
+
+        Returns:
+            list[dict]: Jours du plus proche au moins proche, avec leur distance
+            (dans l'espace centré-réduit), leur météo et leur production.
+
+        Raises:
+            AnalogsUnavailable: Si l'index ne peut pas être construit.
+        """
+        if self._snapshot is None:
+            self._ensure_built()
+        else:
+            self._refresh_in_background()
+        snapshot = self._snapshot
+        assert snapshot is not None
+        point = (encode_one(values) - snapshot["mean"]) / snapshot["std"]
+
+        distances, indices = snapshot["tree"].query(
+            point[None, :], k=min(k, len(snapshot["rows"]))
+        )
+        candidates = [
+            (distance, snapshot["columns"], i) for distance, i in zip(distances[0], indices[0])
+        ]
+        delta = snapshot["delta"]
+        if len(delta):
+            delta_distances = np.sqrt(((delta - point) ** 2).sum(axis=1))
+            for i in np.argsort(delta_distances)[:k]:
+                candidates.append((delta_distances[i], snapshot["delta_columns"], i))
+            candidates.sort(key=lambda candidate: candidate[0])
+
+        analogs = []
+        for distance, columns, i in candidates[:k]:
+            analog = {"date": columns["date"][i], "distance": round(float(distance), 4)}
+            if "site" in columns:
+                analog["site"] = columns["site"][i]
+            analog.update(zip(ANALOG_INPUTS, columns["inputs"][i].tolist()))
+            analog["production"] = float(columns["production"][i])
+            analogs.append(analog)
+        return analogs
+
+
+analog_index = AnalogIndex()
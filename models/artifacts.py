@@ -0,0 +1,342 @@
+import json
+import os
+import shutil
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from prepare_data.profiling import hash_frame  # noqa: F401 (réexporté pour les modèles)
+
+ARTIFACT_DIR = os.getenv("MODEL_ARTIFACT_DIR", "models/artifacts")
+FORMAT_VERSION = 1
+# Nombre de versions conservées par modèle (les workers déjà lancés peuvent
+# encore avoir une ancienne version ouverte en mémoire)
+KEEP_VERSIONS = 3
+# Taille des blocs de lignes parcourus ensemble pour borner la mémoire
+PREDICT_CHUNK = 1024
+
+FOREST_ARRAYS = ("roots", "children_left", "children_right", "feature", "threshold", "value")
+
+
+class FlatForest:
+    """
+    Forêt de régression stockée sous forme de tableaux plats (un nœud par
+    case), lisibles en memory-mapping.
+
+    Tous les arbres sont concaténés : les enfants d'une feuille pointent sur
+    la feuille elle-même, ce qui permet de parcourir tous les arbres en même
+    temps, niveau par niveau, avec des opérations NumPy vectorisées. Les
+    fichiers `.npy` ouverts avec `mmap_mode="r"` sont partagés via le cache de
+    pages entre tous les workers uvicorn qui chargent le même artefact.
+    """
+
+    def __init__(self, arrays: dict, metadata: dict):
+        self.arrays = arrays
+        self.metadata = metadata
+        self.features = metadata["features"]
+
+    @classmethod
+    def from_estimator(cls, model, metadata: dict | None = None, tree_indices=None):
+        """
+        Aplatit un RandomForestRegressor entraîné.
+
+        Args:
+            model: Forêt scikit-learn entraînée.
+            metadata (dict): Informations ajoutées à l'en-tête (date, empreinte des données...).
+            tree_indices: Sous-ensemble d'arbres à conserver (tous par défaut).
+        """
+        estimators = model.estimators_
+        if tree_indices is not None:
+            estimators = [estimators[i] for i in tree_indices]
+
+        roots, left, right, feature, threshold, value = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in estimators:
+            tree = estimator.tree_
+            nodes = np.arange(tree.node_count)
+            is_leaf = tree.children_left == -1
+            roots.append(offset)
+            left.append(np.where(is_leaf, nodes, tree.children_left) + offset)
+            right.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(tree.threshold)
+            value.append(tree.value[:, 0, 0])
+            offset += tree.node_count
+            max_depth = max(max_depth, tree.max_depth)
+
+        arrays = {
+            "roots": np.asarray(roots, dtype=np.int32),
+            "children_left": np.concatenate(left).astype(np.int32),
+            "children_right": np.concatenate(right).astype(np.int32),
+            "feature": np.concatenate(feature).astype(np.int32),
+            "threshold": np.concatenate(threshold).astype(np.float64),
+            "value": np.concatenate(value).astype(np.float64),
+        }
+        header = {
+            "format_version": FORMAT_VERSION,
+            "model_type": type(model).__name__,
+            "features": [str(name) for name in model.feature_names_in_],
+            "n_trees": len(estimators),
+            "n_nodes": int(offset),
+            "max_depth": int(max_depth),
+            **(metadata or {}),
+        }
+        return cls(arrays, header)
+
+    def save(self, path: str):
+        """Écrit l'en-tête `metadata.json` et un fichier `.npy` par tableau."""
+        os.makedirs(path, exist_ok=True)
+        for name in FOREST_ARRAYS:
+            np.save(os.path.join(path, f"{name}.npy"), self.arrays[name])
+        with open(os.path.join(path, "metadata.json"), "w") as file:
+            json.dump(self.metadata, file, indent=2)
+
+    @classmethod
+    def load(cls, path: str, mmap_mode: str | None = "r"):
+        """Ouvre un artefact ; les tableaux sont memory-mappés par défaut."""
+        metadata = read_metadata(path)
+        if metadata.get("format_version") != FORMAT_VERSION:
+            raise ValueError(
+                f"× Unsupported artifact format: {metadata.get('format_version')}"
+            )
+        arrays = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+            for name in FOREST_ARRAYS
+        }
+        return cls(arrays, metadata)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in self.arrays.values())
+
+    def _as_matrix(self, X) -> np.ndarray:
+        return _as_matrix(X, self.features)
+
+    def predict_trees(self, X) -> np.ndarray:
+        """Prédiction de chaque arbre, de forme (n_trees, n_rows)."""
+        X = self._as_matrix(X)
+        n_rows, n_features = X.shape
+        a = self.arrays
+        out = np.empty((len(a["roots"]), n_rows), dtype=np.float64)
+        for start in range(0, n_rows, PREDICT_CHUNK):
+            block = X[start : start + PREDICT_CHUNK]
+            flat = block.ravel()
+            row_offset = np.arange(len(block)) * n_features
+            node = np.repeat(a["roots"][:, None], len(block), axis=1)
+            for _ in range(self.metadata["max_depth"]):
+                x = flat[row_offset + a["feature"][node]]
+                node = np.where(
+                    x <= a["threshold"][node],
+                    a["children_left"][node],
+                    a["children_right"][node],
+                )
+            out[:, start : start + len(block)] = a["value"][node]
+        return out
+
+    def predict(self, X) -> np.ndarray:
+        """Moyenne des arbres, identique à `RandomForestRegressor.predict`."""
+        return self.predict_trees(X).mean(axis=0)
+
+    def predict_quantiles(self, X, quantiles: list[float]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Moyenne et quantiles des prédictions des arbres, tirés du même
+        parcours de la forêt.
+
+        Args:
+            X: Lignes à prédire.
+            quantiles (list[float]): Quantiles voulus, entre 0 et 1.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Prédiction (n_rows,) et quantiles (n_quantiles, n_rows).
+        """
+        trees = self.predict_trees(X)
+        return trees.mean(axis=0), np.quantile(trees, quantiles, axis=0)
+
+
+class BoosterArtifact:
+    """
+    Booster XGBoost publié dans le même format de versions que les forêts :
+    `model.ubj` (format binaire natif) et l'en-tête `metadata.json`.
+
+    xgboost n'est importé qu'au chargement : l'API n'en dépend que si un
+    modèle XGBoost est effectivement servi.
+    """
+
+    model_type = "XGBBooster"
+
+    def __init__(self, booster, metadata: dict):
+        self.booster = booster
+        self.metadata = metadata
+        self.features = metadata["features"]
+        self._nbytes = len(booster.save_raw())
+
+    @classmethod
+    def from_booster(cls, booster, features: list[str], metadata: dict | None = None):
+        """
+        Args:
+            booster: Booster entraîné (arrêt anticipé éventuel : seules les
+                itérations jusqu'à `best_iteration` sont servies).
+            features (list[str]): Ordre des colonnes de la matrice d'entraînement.
+            metadata (dict): Informations ajoutées à l'en-tête.
+        """
+        n_rounds = getattr(booster, "best_iteration", booster.num_boosted_rounds() - 1) + 1
+        header = {
+            "format_version": FORMAT_VERSION,
+            "model_type": cls.model_type,
+            "features": list(features),
+            "n_rounds": int(n_rounds),
+            **(metadata or {}),
+        }
+        return cls(booster, header)
+
+    def save(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        self.booster.save_model(os.path.join(path, "model.ubj"))
+        with open(os.path.join(path, "metadata.json"), "w") as file:
+            json.dump(self.metadata, file, indent=2)
+
+    @classmethod
+    def load(cls, path: str):
+        import xgboost
+
+        metadata = read_metadata(path)
+        booster = xgboost.Booster()
+        booster.load_model(os.path.join(path, "model.ubj"))
+        return cls(booster, metadata)
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def predict(self, X) -> np.ndarray:
+        """Prédiction sans construction de DMatrix (`inplace_predict`)."""
+        predictions = self.booster.inplace_predict(
+            _as_matrix(X, self.features),
+            iteration_range=(0, self.metadata["n_rounds"]),
+        )
+        return np.asarray(predictions, dtype=np.float64)
+
+
+class LinearArtifact:
+    """
+    Régression linéaire standardisée (StandardScaler + LinearRegression),
+    repliée en un seul produit scalaire : `X @ coef + intercept`.
+
+    Modèle de secours servi quand l'API déleste la forêt sous la charge :
+    sa prédiction coûte quelques microsecondes, quelle que soit la taille
+    de la forêt.
+    """
+
+    model_type = "LinearRegression"
+
+    def __init__(self, coef: np.ndarray, metadata: dict):
+        self.coef = coef
+        self.metadata = metadata
+        self.features = metadata["features"]
+        self.intercept = metadata["intercept"]
+
+    @classmethod
+    def from_estimator(cls, scaler, model, features: list[str], metadata: dict | None = None):
+        """
+        Args:
+            scaler: StandardScaler entraîné.
+            model: LinearRegression entraînée sur les features standardisées.
+            features (list[str]): Ordre des colonnes de la matrice d'entraînement.
+            metadata (dict): Informations ajoutées à l'en-tête.
+        """
+        # (x - mean) / scale @ w + b  ==  x @ (w / scale) + (b - mean @ (w / scale))
+        coef = np.asarray(model.coef_, dtype=np.float64) / scaler.scale_
+        header = {
+            "format_version": FORMAT_VERSION,
+            "model_type": cls.model_type,
+            "features": list(features),
+            "intercept": float(model.intercept_ - scaler.mean_ @ coef),
+            **(metadata or {}),
+        }
+        return cls(coef, header)
+
+    def save(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "coef.npy"), self.coef)
+        with open(os.path.join(path, "metadata.json"), "w") as file:
+            json.dump(self.metadata, file, indent=2)
+
+    @classmethod
+    def load(cls, path: str):
+        return cls(np.load(os.path.join(path, "coef.npy")), read_metadata(path))
+
+    @property
+    def nbytes(self) -> int:
+        return self.coef.nbytes
+
+    def predict(self, X) -> np.ndarray:
+        if isinstance(X, pd.DataFrame):
+            X = X[self.features].to_numpy()
+        return np.asarray(X, dtype=np.float64) @ self.coef + self.intercept
+
+
+def _as_matrix(X, features: list[str]) -> np.ndarray:
+    if isinstance(X, pd.DataFrame):
+        X = X[features].to_numpy()
+    # scikit-learn et XGBoost comparent les seuils à des features en float32
+    return np.ascontiguousarray(X, dtype=np.float32)
+
+
+def read_metadata(path: str) -> dict:
+    with open(os.path.join(path, "metadata.json")) as file:
+        return json.load(file)
+
+
+def current_version_path(name: str, root: str = ARTIFACT_DIR) -> str:
+    """Chemin de la version publiée d'un modèle (pointeur `CURRENT`)."""
+    model_dir = os.path.join(root, name)
+    with open(os.path.join(model_dir, "CURRENT")) as file:
+        return os.path.join(model_dir, file.read().strip())
+
+
+def publish(artifact: FlatForest | BoosterArtifact | LinearArtifact, name: str, root: str = ARTIFACT_DIR) -> str:
+    """
+    Écrit l'artefact dans un nouveau dossier de version puis bascule le
+    pointeur `CURRENT` de façon atomique.
+
+    Returns:
+        str: Chemin de la version publiée.
+    """
+    model_dir = os.path.join(root, name)
+    version = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    if "data_hash" in artifact.metadata:
+        version += f"-{artifact.metadata['data_hash'][:8]}"
+    # Inscrite dans l'en-tête : les prédictions journalisées citent leur version
+    artifact.metadata["version"] = version
+    path = os.path.join(model_dir, version)
+    artifact.save(path)
+
+    pointer_tmp = os.path.join(model_dir, f"CURRENT.{os.getpid()}.tmp")
+    with open(pointer_tmp, "w") as file:
+        file.write(version)
+    os.replace(pointer_tmp, os.path.join(model_dir, "CURRENT"))
+
+    versions = sorted(
+        entry
+        for entry in os.listdir(model_dir)
+        if os.path.isdir(os.path.join(model_dir, entry))
+    )
+    for old in versions[:-KEEP_VERSIONS]:
+        shutil.rmtree(os.path.join(model_dir, old), ignore_errors=True)
+    return path
+
+
+def load_current(
+    name: str, root: str = ARTIFACT_DIR
+) -> FlatForest | BoosterArtifact | LinearArtifact:
+    """
+    Charge la version publiée d'un modèle : forêt plate en memory-mapping,
+    booster XGBoost ou régression linéaire selon le type inscrit dans l'en-tête.
+    """
+    path = current_version_path(name, root)
+    model_type = read_metadata(path).get("model_type")
+    for artifact_class in (BoosterArtifact, LinearArtifact):
+        if model_type == artifact_class.model_type:
+            return artifact_class.load(path)
+    return FlatForest.load(path)
@@ -0,0 +1,201 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+from models.data_preparation import load_data
+from models.energies import ENERGIES
+from models.model import initialize_model
+
+# Nombre de plis et longueur (en jours) de la période de test de chaque pli
+N_FOLDS = 5
+HORIZON_DAYS = 90
+WINDOWS = ("expanding", "sliding")
+
+
+def make_folds(
+    dates,
+    n_folds: int = N_FOLDS,
+    horizon: int = HORIZON_DAYS,
+    window: str = "expanding",
+    train_days: int | None = None,
+) -> list[tuple[np.ndarray, np.ndarray]]:
+    """
+    Découpe une série journalière en plis à origine glissante.
+
+    Les `n_folds` dernières périodes de `horizon` jours servent tour à tour
+    de test ; chaque pli n'est entraîné que sur des jours antérieurs à sa
+    période de test : tous (fenêtre `expanding`) ou les `train_days`
+    derniers (fenêtre `sliding`).
+
+    Args:
+        dates: Date de chaque ligne.
+        n_folds (int): Nombre de plis.
+        horizon (int): Longueur de chaque période de test, en jours.
+        window (str): `expanding` ou `sliding`.
+        train_days (int | None): Longueur de la fenêtre `sliding` (par défaut, `horizon` × 4).
+
+    Returns:
+        list[tuple[np.ndarray, np.ndarray]]: Indices des lignes d'entraînement et de test de chaque pli.
+    """
+    if window not in WINDOWS:
+        raise ValueError(f"× Unknown window `{window}`, use one of {WINDOWS}")
+    days = np.asarray(pd.to_datetime(dates).to_numpy(), dtype="datetime64[D]")
+    horizon_span = np.timedelta64(horizon, "D")
+    train_span = np.timedelta64(train_days or horizon * 4, "D")
+    first_test = days.max() + np.timedelta64(1, "D") - n_folds * horizon_span
+    if first_test <= days.min():
+        raise ValueError(
+            f"× Not enough history for {n_folds} folds of {horizon} days"
+        )
+
+    folds = []
+    for fold in range(n_folds):
+        test_start = first_test + fold * horizon_span
+        test = (days >= test_start) & (days < test_start + horizon_span)
+        train = days < test_start
+        if window == "sliding":
+            train &= days >= test_start - train_span
+        folds.append((np.flatnonzero(train), np.flatnonzero(test)))
+    return folds
+
+
+# Tableaux partagés, attachés une fois par processus du pool
+_shared = {}
+
+
+def _attach(specs: dict):
+    """Initialiseur des workers : vues NumPy sur les blocs de mémoire partagée."""
+    for name, (block, shape, dtype) in specs.items():
+        memory = shared_memory.SharedMemory(name=block)
+        _shared[name] = (memory, np.ndarray(shape, dtype=dtype, buffer=memory.buf))
+
+
+def _run_fold(fold: int, train: np.ndarray, test: np.ndarray, params: dict) -> dict:
+    X, y = _shared["X"][1], _shared["y"][1]
+    model = RandomForestRegressor(**params).fit(X[train], y[train])
+    y_pred = model.predict(X[test])
+    return {
+        "fold": fold,
+        "n_train": len(train),
+        "n_test": len(test),
+        "mae": mean_absolute_error(y[test], y_pred),
+        "rmse": float(np.sqrt(mean_squared_error(y[test], y_pred))),
+        "r2": r2_score(y[test], y_pred),
+    }
+
+
+def backtest(
+    X: np.ndarray,
+    y: np.ndarray,
+    dates,
+    params: dict | None = None,
+    workers: int | None = None,
+    **fold_options,
+) -> dict:
+    """
+    Entraîne et évalue un pli par processus, en parallèle.
+
+    La matrice de features et la cible sont copiées une seule fois en
+    mémoire partagée : les workers n'en reçoivent que le nom et ne
+    sérialisent que les indices de leur pli.
+
+    Args:
+        X (np.ndarray): Matrice de features (n_lignes, n_features).
+        y (np.ndarray): Cible.
+        dates: Date de chaque ligne.
+        params (dict | None): Hyperparamètres de la forêt (par défaut ceux
+            de `initialize_model`, un seul cœur par pli).
+        workers (int | None): Taille du pool de processus (par défaut, un par pli dans la limite des cœurs).
+        **fold_options: Options de `make_folds` (n_folds, horizon, window, train_days).
+
+    Returns:
+        dict: Métriques de chaque pli (avec ses dates) et leur moyenne / écart-type.
+    """
+    folds = make_folds(dates, **fold_options)
+    if params is None:
+        params = {**initialize_model().get_params(), "n_jobs": 1}
+    days = pd.to_datetime(dates).to_numpy()
+
+    arrays = {
+        "X": np.ascontiguousarray(X, dtype=np.float64),
+        "y": np.ascontiguousarray(y, dtype=np.float64),
+    }
+    blocks, specs = [], {}
+    try:
+        for name, array in arrays.items():
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            blocks.append(block)
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+            specs[name] = (block.name, array.shape, array.dtype.str)
+
+        workers = workers or min(len(folds), os.cpu_count() or 1)
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_attach, initargs=(specs,)
+        ) as pool:
+            results = list(
+                pool.map(
+                    _run_fold,
+                    range(len(folds)),
+                    *zip(*folds),
+                    [params] * len(folds),
+                )
+            )
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    for result, (train, test) in zip(results, folds):
+        result["train_start"] = str(days[train].min())[:10]
+        result["train_end"] = str(days[train].max())[:10]
+        result["test_start"] = str(days[test].min())[:10]
+        result["test_end"] = str(days[test].max())[:10]
+
+    metrics = ("mae", "rmse", "r2")
+    aggregate = {}
+    for metric in metrics:
+        values = np.array([result[metric] for result in results])
+        aggregate[metric] = float(values.mean())
+        aggregate[f"{metric}_std"] = float(values.std())
+    return {"folds": results, "aggregate": aggregate}
+
+
+def run_backtest(energy: str = "eolienne", workers: int | None = None, **fold_options) -> dict:
+    """
+    Backtest du modèle d'une énergie sur sa table complète, triée par date.
+
+    Args:
+        energy (str): Énergie à évaluer (eolienne, solaire ou hydro).
+        workers (int | None): Taille du pool de processus.
+        **fold_options: Options de `make_folds` (n_folds, horizon, window, train_days).
+    """
+    spec = ENERGIES[energy]
+    df = load_data(spec)
+    df = df.assign(date=pd.to_datetime(df["date"])).sort_values("date", ignore_index=True)
+    print(f"Backtest du modèle ({energy}) sur {len(df)} jours...")
+
+    report = backtest(
+        spec.features.transform(df),
+        df[spec.target].to_numpy(),
+        df["date"],
+        workers=workers,
+        **fold_options,
+    )
+    for fold in report["folds"]:
+        print(
+            f"Pli {fold['fold']} | train {fold['train_start']} → {fold['train_end']} "
+            f"({fold['n_train']} j) | test {fold['test_start']} → {fold['test_end']} | "
+            f"MAE {fold['mae']:.2f} | RMSE {fold['rmse']:.2f} | R² {fold['r2']:.2f}"
+        )
+    aggregate = report["aggregate"]
+    print(
+        f"Moyenne | MAE {aggregate['mae']:.2f} ± {aggregate['mae_std']:.2f} | "
+        f"RMSE {aggregate['rmse']:.2f} ± {aggregate['rmse_std']:.2f} | "
+        f"R² {aggregate['r2']:.2f} ± {aggregate['r2_std']:.2f}"
+    )
+    return report
@@ -0,0 +1,241 @@
+import hashlib
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+from models.artifacts import BoosterArtifact, hash_frame, publish
+from models.backtest import make_folds
+from models.data_preparation import load_data
+from models.drift import reference_profile
+from models.energies import ENERGIES
+
+# Hyperparamètres de départ (ceux de l'exploration `xgbregressor.py`)
+XGB_PARAMS = {
+    "objective": "reg:squarederror",
+    "tree_method": "hist",
+    "max_depth": 6,
+    "learning_rate": 0.05,
+    "subsample": 0.8,
+    "colsample_bytree": 1,
+    "reg_lambda": 1.2,
+    "seed": 1,
+}
+# Nombre de seuils par feature de la matrice quantifiée (commun à tous les fits)
+MAX_BIN = 256
+MAX_ROUNDS = 2000
+EARLY_STOPPING_ROUNDS = 50
+# Derniers jours du jeu d'entraînement réservés à l'arrêt anticipé
+VALIDATION_DAYS = 180
+# Derniers jours de la table réservés à l'évaluation du modèle publié
+TEST_DAYS = 180
+
+
+class QuantizedDataset:
+    """
+    Données d'entraînement XGBoost quantifiées une seule fois.
+
+    Les seuils des histogrammes (`hist`) sont calculés sur la table entière
+    dans une `QuantileDMatrix` de référence ; les matrices des sous-ensembles
+    (entraînement, validation, plis de backtest) réutilisent ces seuils via
+    `ref=` et sont gardées en cache, si bien que les fits répétés (réglage
+    des hyperparamètres, plis) ne requantifient rien.
+
+    XGBoost exige que la matrice de validation ait pour référence celle
+    d'entraînement : elle en hérite les mêmes seuils.
+    """
+
+    def __init__(self, X, y, dates, features: list[str], max_bin: int = MAX_BIN):
+        order = np.argsort(pd.to_datetime(dates).to_numpy(), kind="stable")
+        self.X = np.ascontiguousarray(np.asarray(X)[order], dtype=np.float32)
+        self.y = np.asarray(y, dtype=np.float32)[order]
+        self.days = np.asarray(pd.to_datetime(dates).to_numpy()[order], dtype="datetime64[D]")
+        self.features = list(features)
+        self.max_bin = max_bin
+        self.reference = xgb.QuantileDMatrix(
+            self.X, self.y, max_bin=max_bin, feature_names=self.features
+        )
+        self._matrices: dict[str, xgb.QuantileDMatrix] = {}
+
+    def matrix(self, rows: np.ndarray, ref_rows: np.ndarray | None = None) -> xgb.QuantileDMatrix:
+        """
+        Matrice quantifiée des lignes `rows`, mise en cache.
+
+        Args:
+            rows (np.ndarray): Lignes de la matrice.
+            ref_rows (np.ndarray | None): Lignes de la matrice d'entraînement
+                à prendre pour référence (évaluation), sinon la table entière.
+        """
+        key = hashlib.sha1(np.asarray(rows, dtype=np.int64).tobytes()).hexdigest()
+        ref = self.reference
+        if ref_rows is not None:
+            ref = self.matrix(ref_rows)
+            key += hashlib.sha1(np.asarray(ref_rows, dtype=np.int64).tobytes()).hexdigest()
+        if key not in self._matrices:
+            self._matrices[key] = xgb.QuantileDMatrix(
+                self.X[rows],
+                self.y[rows],
+                ref=ref,
+                max_bin=self.max_bin,
+                feature_names=self.features,
+            )
+        return self._matrices[key]
+
+    def time_split(self, rows: np.ndarray, days: int) -> tuple[np.ndarray, np.ndarray]:
+        """Sépare `rows` en lignes antérieures et lignes des `days` derniers jours."""
+        cutoff = self.days[rows].max() - np.timedelta64(days - 1, "D")
+        late = self.days[rows] >= cutoff
+        return rows[~late], rows[late]
+
+    def fit(
+        self,
+        rows: np.ndarray | None = None,
+        params: dict | None = None,
+        validation_days: int = VALIDATION_DAYS,
+        max_rounds: int = MAX_ROUNDS,
+        early_stopping_rounds: int = EARLY_STOPPING_ROUNDS,
+    ) -> xgb.Booster:
+        """
+        Entraîne un booster sur `rows` (toutes les lignes par défaut), avec
+        arrêt anticipé sur leurs `validation_days` derniers jours.
+        """
+        if rows is None:
+            rows = np.arange(len(self.y))
+        train, valid = self.time_split(rows, validation_days)
+        return xgb.train(
+            {**XGB_PARAMS, **(params or {}), "max_bin": self.max_bin},
+            self.matrix(train),
+            num_boost_round=max_rounds,
+            evals=[(self.matrix(valid, ref_rows=train), "validation")],
+            early_stopping_rounds=early_stopping_rounds,
+            verbose_eval=False,
+        )
+
+    def evaluate(self, booster: xgb.Booster, rows: np.ndarray) -> dict:
+        """MAE, RMSE et R² du booster (jusqu'à sa meilleure itération) sur `rows`."""
+        y_pred = booster.inplace_predict(
+            self.X[rows], iteration_range=(0, booster.best_iteration + 1)
+        )
+        y_true = self.y[rows]
+        return {
+            "mae": float(mean_absolute_error(y_true, y_pred)),
+            "rmse": float(np.sqrt(mean_squared_error(y_true, y_pred))),
+            "r2": float(r2_score(y_true, y_pred)),
+        }
+
+    def tune(self, grid: list[dict], rows: np.ndarray | None = None, **fit_options) -> list[dict]:
+        """
+        Compare plusieurs jeux d'hyperparamètres sur les mêmes matrices.
+
+        Returns:
+            list[dict]: Pour chaque jeu, ses paramètres, le nombre d'itérations
+            retenu et le score de validation, du meilleur au moins bon.
+        """
+        results = []
+        for params in grid:
+            booster = self.fit(rows=rows, params=params, **fit_options)
+            results.append({
+                "params": params,
+                "n_rounds": booster.best_iteration + 1,
+                "validation_rmse": booster.best_score,
+            })
+        return sorted(results, key=lambda result: result["validation_rmse"])
+
+    def backtest(self, params: dict | None = None, **fold_options) -> dict:
+        """
+        Backtest à origine glissante (plis de `make_folds`), même format de
+        rapport que `models.backtest.backtest`.
+        """
+        folds = make_folds(self.days, **fold_options)
+        results = []
+        for fold, (train, test) in enumerate(folds):
+            booster = self.fit(rows=train, params=params)
+            results.append({
+                "fold": fold,
+                "n_train": len(train),
+                "n_test": len(test),
+                "n_rounds": booster.best_iteration + 1,
+                **self.evaluate(booster, test),
+                "train_start": str(self.days[train].min()),
+                "train_end": str(self.days[train].max()),
+                "test_start": str(self.days[test].min()),
+                "test_end": str(self.days[test].max()),
+            })
+        aggregate = {}
+        for metric in ("mae", "rmse", "r2"):
+            values = np.array([result[metric] for result in results])
+            aggregate[metric] = float(values.mean())
+            aggregate[f"{metric}_std"] = float(values.std())
+        return {"folds": results, "aggregate": aggregate}
+
+
+def dataset_for(df: pd.DataFrame, energy) -> QuantizedDataset:
+    """Jeu quantifié d'une énergie, construit avec son pipeline de features."""
+    return QuantizedDataset(
+        energy.features.transform(df),
+        df[energy.target].to_numpy(),
+        df["date"],
+        energy.features.features,
+    )
+
+
+def run_xgboost_training(energy: str = "eolienne", df: pd.DataFrame | None = None) -> dict:
+    """
+    Entraîne et publie le modèle XGBoost d'une énergie.
+
+    Les TEST_DAYS derniers jours servent à l'évaluation ; sur le reste, les
+    VALIDATION_DAYS derniers jours pilotent l'arrêt anticipé. Le booster
+    est publié sous `energy.xgb_artifact`, servi par `/predict?backend=xgboost`.
+
+    Args:
+        energy (str): Énergie à modéliser (eolienne, solaire ou hydro).
+        df (pd.DataFrame | None): Table de l'énergie (chargée depuis la base par défaut).
+    """
+    spec = ENERGIES[energy]
+    if df is None:
+        df = load_data(spec)
+    print(f"Entraînement du modèle XGBoost ({energy})...")
+    data = dataset_for(df, spec)
+    train, test = data.time_split(np.arange(len(data.y)), TEST_DAYS)
+    booster = data.fit(rows=train)
+    metrics = data.evaluate(booster, test)
+    print(
+        f"{booster.best_iteration + 1} itérations retenues | MAE {metrics['mae']:.2f} | "
+        f"RMSE {metrics['rmse']:.2f} | R² {metrics['r2']:.2f}"
+    )
+
+    artifact = BoosterArtifact.from_booster(
+        booster,
+        spec.features.features,
+        metadata={
+            "energy": spec.name,
+            "training_date": datetime.now().isoformat(timespec="seconds"),
+            "data_hash": hash_frame(df),
+            "metrics": metrics,
+            "reference_profile": reference_profile(df, spec.features.raw),
+        },
+    )
+    path = publish(artifact, spec.xgb_artifact)
+    print(f" Booster XGBoost publié sous : {path}")
+    return {"energy": spec.name, "n_rounds": booster.best_iteration + 1, **metrics}
+
+
+def run_xgboost_backtest(energy: str = "eolienne", **fold_options) -> dict:
+    """Backtest XGBoost d'une énergie, tous les plis partageant la même quantification."""
+    spec = ENERGIES[energy]
+    report = dataset_for(load_data(spec), spec).backtest(**fold_options)
+    for fold in report["folds"]:
+        print(
+            f"Pli {fold['fold']} | test {fold['test_start']} → {fold['test_end']} | "
+            f"{fold['n_rounds']} itérations | MAE {fold['mae']:.2f} | "
+            f"RMSE {fold['rmse']:.2f} | R² {fold['r2']:.2f}"
+        )
+    aggregate = report["aggregate"]
+    print(
+        f"Moyenne | MAE {aggregate['mae']:.2f} ± {aggregate['mae_std']:.2f} | "
+        f"RMSE {aggregate['rmse']:.2f} ± {aggregate['rmse_std']:.2f} | "
+        f"R² {aggregate['r2']:.2f} ± {aggregate['r2_std']:.2f}"
+    )
+    return report
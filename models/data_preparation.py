@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
-from prepare_data.db_handler import DBHandler, supabase
+from models.energies import WIND, Energy
+from models.features import date_parts
+from prepare_data.db_handler import DBHandler
 from sklearn.model_selection import train_test_split
 
 
@@ -9,25 +11,43 @@ def transform_date(df: pd.DataFrame) -> pd.DataFrame:
     if "date" not in df.columns:
         return df
 
-    df = df.copy()
-    df["date"] = pd.to_datetime(df["date"])
-    df["year"] = df["date"].dt.year
-    df["month"] = df["date"].dt.month
-    df["day"] = df["date"].dt.day
-    df["dayofweek"] = df["date"].dt.dayofweek
+    parts = date_parts(pd.to_datetime(df["date"]).to_numpy())
+    df = df.drop(columns=["date"])
+    df["year"] = parts["year"]
+    df["month"] = parts["month"]
+    df["day"] = parts["day"]
+    df["dayofweek"] = parts["day_of_week"]
 
-    return df.drop(columns=["date"])
+    return df
 
 
-def prepare_data(test_size=0.2, random_state=42):
-    """Charge, transforme et découpe les données eoliennes."""
-    db = DBHandler(client=supabase)
-    df = db.fetch("eolienne")
+def load_data(energy: Energy = WIND) -> pd.DataFrame:
+    """Charge la table d'une énergie (eolienne par défaut) depuis la base de données."""
+    db = DBHandler()
+    return db.fetch(energy.table)
 
-    y = df["prod_eolienne"]
-    X = df.drop(columns=["prod_eolienne"])
 
-    X = transform_date(X)
+def split_features_target(df: pd.DataFrame, energy: Energy = WIND):
+    """
+    Sépare les features de la cible de production. Les features sont
+    construites par le pipeline de l'énergie, le même que celui de l'API.
+    """
+    y = df[energy.target]
+    X = energy.features.frame(df)
+    return X, y
+
+
+def prepare_data(
+    test_size=0.2,
+    random_state=42,
+    df: pd.DataFrame | None = None,
+    energy: Energy = WIND,
+):
+    """Charge, transforme et découpe les données d'une énergie (eoliennes par défaut)."""
+    if df is None:
+        df = load_data(energy)
+
+    X, y = split_features_target(df, energy)
 
     X_train, X_test, y_train, y_test = train_test_split(
         X, y, test_size=test_size, random_state=random_state
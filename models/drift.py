@@ -0,0 +1,138 @@
+import bisect
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Nombre d'intervalles (quantiles d'entraînement) du profil de référence
+DRIFT_BINS = 10
+# Lissage des proportions nulles dans le calcul du PSI
+PSI_EPSILON = 1e-4
+# Seuils usuels du PSI : stable sous 0.1, dérive modérée jusqu'à 0.25, forte au-delà
+PSI_MODERATE = 0.1
+PSI_SIGNIFICANT = 0.25
+# Requêtes observées en dessous desquelles aucun statut n'est donné : sur
+# quelques valeurs, le PSI d'une distribution stable est arbitrairement grand
+MIN_DRIFT_SAMPLES = 100
+
+
+def reference_profile(df: pd.DataFrame, columns: list[str], bins: int = DRIFT_BINS) -> dict:
+    """
+    Profil des entrées brutes à l'entraînement, inscrit dans l'en-tête de
+    l'artefact : pour chaque colonne, les bornes intérieures des intervalles
+    (quantiles, donc d'effectifs égaux) et la proportion de lignes de chaque
+    intervalle. Les deux intervalles extrêmes sont ouverts.
+
+    Args:
+        df (pd.DataFrame): Données d'entraînement.
+        columns (list[str]): Entrées brutes servies par l'API.
+        bins (int): Nombre d'intervalles visés (moins si des quantiles coïncident).
+    """
+    profile = {}
+    for column in columns:
+        values = pd.to_numeric(df[column], errors="coerce").dropna().to_numpy(dtype=np.float64)
+        if len(values) == 0:
+            continue
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1]))
+        counts = np.bincount(np.searchsorted(edges, values, side="right"), minlength=len(edges) + 1)
+        profile[column] = {
+            "edges": edges.tolist(),
+            "proportions": (counts / counts.sum()).tolist(),
+        }
+    return profile
+
+
+def psi(expected: np.ndarray, observed: np.ndarray) -> float:
+    """Population Stability Index entre deux distributions sur les mêmes intervalles."""
+    expected = np.clip(expected, PSI_EPSILON, None)
+    observed = np.clip(observed, PSI_EPSILON, None)
+    return float(np.sum((observed - expected) * np.log(observed / expected)))
+
+
+def ks(expected: np.ndarray, observed: np.ndarray) -> float:
+    """Statistique de Kolmogorov-Smirnov calculée sur les intervalles du profil."""
+    return float(np.max(np.abs(np.cumsum(expected) - np.cumsum(observed))))
+
+
+class DriftMonitor:
+    """
+    Histogrammes des entrées reçues par l'API, comparés au profil de
+    référence du modèle servi.
+
+    Chaque requête n'incrémente qu'un compteur par colonne (recherche
+    dichotomique parmi une dizaine de bornes) : mémoire constante et coût
+    de l'ordre de la microseconde. Chaque modèle servi (forêt, XGBoost,
+    modèle de secours) a ses propres compteurs, qui repartent de zéro quand
+    une nouvelle version de ce modèle (donc un nouveau profil) est servie.
+    """
+
+    def __init__(self, min_samples: int = MIN_DRIFT_SAMPLES):
+        self.min_samples = min_samples
+        # (énergie, modèle) -> (version, profil, compteurs par colonne)
+        self._state: dict[tuple[str, str], tuple[str | None, dict, dict[str, list[int]]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, energy: str, model: str, metadata: dict, rows: list[dict]):
+        """
+        Args:
+            energy (str): Énergie prédite.
+            model (str): Modèle qui a répondu (random_forest, xgboost, linear_fallback).
+            metadata (dict): En-tête de l'artefact servi (profil et version).
+            rows (list[dict]): Entrées brutes des jours prédits.
+        """
+        profile = metadata.get("reference_profile")
+        if not profile:
+            return
+        version = metadata.get("version")
+        key = (energy, model)
+        with self._lock:
+            state = self._state.get(key)
+            if state is None or state[0] != version:
+                counts = {
+                    column: [0] * (len(spec["edges"]) + 1) for column, spec in profile.items()
+                }
+                state = self._state[key] = (version, profile, counts)
+            _, profile, counts = state
+            for row in rows:
+                for column, spec in profile.items():
+                    value = row.get(column)
+                    if value is not None:
+                        counts[column][bisect.bisect_right(spec["edges"], value)] += 1
+
+    def scores(self) -> dict:
+        """
+        PSI et KS de chaque entrée, par énergie et par modèle, depuis le
+        chargement de la version servie. Le statut reste `insufficient_data`
+        tant que moins de `min_samples` valeurs ont été observées.
+        """
+        with self._lock:
+            snapshot = {
+                key: (version, profile, {column: list(c) for column, c in counts.items()})
+                for key, (version, profile, counts) in self._state.items()
+            }
+        report = {}
+        for (energy, model), (version, profile, counts) in snapshot.items():
+            columns = {}
+            for column, observed in counts.items():
+                n = sum(observed)
+                if n == 0:
+                    continue
+                expected = np.asarray(profile[column]["proportions"])
+                observed = np.asarray(observed) / n
+                score = psi(expected, observed)
+                columns[column] = {
+                    "n": n,
+                    "psi": round(score, 4),
+                    "ks": round(ks(expected, observed), 4),
+                    "status": (
+                        "insufficient_data" if n < self.min_samples
+                        else "significant" if score >= PSI_SIGNIFICANT
+                        else "moderate" if score >= PSI_MODERATE
+                        else "stable"
+                    ),
+                }
+            report.setdefault(energy, {})[model] = {"model_version": version, "inputs": columns}
+        return report
+
+
+drift_monitor = DriftMonitor()
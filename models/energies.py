@@ -0,0 +1,38 @@
+from models.features import (
+    HYDRO_FEATURES,
+    SOLAR_FEATURES,
+    WIND_FEATURES,
+    FeaturePipeline,
+)
+
+
+class Energy:
+    """
+    Décrit un type d'énergie servi par l'API : table source, cible, pipeline
+    de features et emplacements du modèle entraîné.
+    """
+
+    def __init__(self, name: str, target: str, features: FeaturePipeline):
+        self.name = name
+        self.table = name
+        self.target = target
+        self.features = features
+        # L'éolien garde les noms historiques des fichiers du modèle
+        suffix = "" if name == "eolienne" else f"_{name}"
+        self.artifact = f"random_forest{suffix}"
+        self.xgb_artifact = f"xgboost{suffix}"
+        # Régression linéaire servie quand l'API déleste la forêt
+        self.fallback_artifact = f"linear{suffix}"
+        self.model_path = f"models/random_forest_model{suffix}.pkl"
+        self.state_path = f"models/random_forest_state{suffix}.json"
+
+
+ENERGIES = {
+    energy.name: energy
+    for energy in (
+        Energy("eolienne", "prod_eolienne", WIND_FEATURES),
+        Energy("solaire", "prod_solaire", SOLAR_FEATURES),
+        Energy("hydro", "prod_hydro", HYDRO_FEATURES),
+    )
+}
+WIND = ENERGIES["eolienne"]
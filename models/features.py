@@ -0,0 +1,179 @@
+import threading
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# Tables précalculées des encodages cycliques du calendrier, indexées
+# directement par la valeur (jour de l'année 1..366, mois 1..12, jour de la
+# semaine 0..6) : une feature calendaire coûte une lecture de tableau par ligne.
+DAY_OF_YEAR_SIN = np.sin(2 * np.pi * np.arange(367) / 365.25)
+DAY_OF_YEAR_COS = np.cos(2 * np.pi * np.arange(367) / 365.25)
+MONTH_SIN = np.sin(2 * np.pi * np.arange(13) / 12)
+MONTH_COS = np.cos(2 * np.pi * np.arange(13) / 12)
+DAY_OF_WEEK_SIN = np.sin(2 * np.pi * np.arange(7) / 7)
+DAY_OF_WEEK_COS = np.cos(2 * np.pi * np.arange(7) / 7)
+
+
+def date_parts(dates) -> dict:
+    """
+    Décompose des dates en année, mois, jour, jour de l'année et jour de la
+    semaine (lundi = 0) avec l'arithmétique datetime64 de NumPy.
+    """
+    days = np.asarray(dates, dtype="datetime64[D]")
+    years = days.astype("datetime64[Y]")
+    months = days.astype("datetime64[M]")
+    return {
+        "year": years.astype(np.int64) + 1970,
+        "month": months.astype(np.int64) % 12 + 1,
+        "day": (days - months).astype(np.int64) + 1,
+        "day_of_year": (days - years).astype(np.int64) + 1,
+        # Le 1er janvier 1970 était un jeudi
+        "day_of_week": (days.astype(np.int64) + 3) % 7,
+    }
+
+
+def _direction(columns):
+    return np.radians(np.asarray(columns["winddirection_10m_dominant"], dtype=np.float64))
+
+
+# Features dérivées : nom -> fonction(parties de la date, colonnes brutes)
+DERIVED = {
+    "year": lambda parts, columns: parts["year"],
+    "month": lambda parts, columns: parts["month"],
+    "day": lambda parts, columns: parts["day"],
+    "dayofweek": lambda parts, columns: parts["day_of_week"],
+    "month_sin": lambda parts, columns: MONTH_SIN[parts["month"]],
+    "month_cos": lambda parts, columns: MONTH_COS[parts["month"]],
+    "day_of_year_sin": lambda parts, columns: DAY_OF_YEAR_SIN[parts["day_of_year"]],
+    "day_of_year_cos": lambda parts, columns: DAY_OF_YEAR_COS[parts["day_of_year"]],
+    "day_of_week_sin": lambda parts, columns: DAY_OF_WEEK_SIN[parts["day_of_week"]],
+    "day_of_week_cos": lambda parts, columns: DAY_OF_WEEK_COS[parts["day_of_week"]],
+    "wind_direction_sin": lambda parts, columns: np.sin(_direction(columns)),
+    "wind_direction_cos": lambda parts, columns: np.cos(_direction(columns)),
+}
+
+
+class FeaturePipeline:
+    """
+    Construit la matrice de features d'un modèle dans un ordre déclaré.
+
+    La même transformation sert à l'entraînement et à l'inférence : chaque
+    feature est soit une colonne brute, soit une feature dérivée de `DERIVED`.
+    """
+
+    def __init__(self, features: list[str]):
+        self.features = list(features)
+        self.raw = [name for name in self.features if name not in DERIVED]
+        self._local = threading.local()
+
+    def transform(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Transforme un DataFrame contenant `date` et les colonnes brutes en une
+        matrice float64 de forme (n_lignes, n_features).
+        """
+        parts = date_parts(pd.to_datetime(df["date"]).to_numpy())
+        out = np.empty((len(df), len(self.features)), dtype=np.float64)
+        for i, name in enumerate(self.features):
+            if name in DERIVED:
+                out[:, i] = DERIVED[name](parts, df)
+            else:
+                out[:, i] = df[name].to_numpy(dtype=np.float64)
+        return out
+
+    def transform_one(self, day: date, values) -> np.ndarray:
+        """
+        Chemin rapide pour une seule ligne, sans pandas : les parties de la
+        date viennent de `datetime.date` et la ligne est écrite dans un
+        tableau (1, n_features) préalloué, propre à chaque thread.
+
+        Le tableau retourné est réutilisé à l'appel suivant du même thread.
+
+        Args:
+            day (date): Jour à prédire.
+            values: Mapping des colonnes brutes (ex : `vars(data)` d'un modèle pydantic).
+        """
+        row = getattr(self._local, "row", None)
+        if row is None:
+            row = self._local.row = np.empty((1, len(self.features)), dtype=np.float64)
+        parts = {
+            "year": day.year,
+            "month": day.month,
+            "day": day.day,
+            "day_of_year": day.timetuple().tm_yday,
+            "day_of_week": day.weekday(),
+        }
+        for i, name in enumerate(self.features):
+            if name in DERIVED:
+                row[0, i] = DERIVED[name](parts, values)
+            else:
+                row[0, i] = values[name]
+        return row
+
+    def frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Même transformation, sous forme de DataFrame nommé (pour l'entraînement)."""
+        return pd.DataFrame(self.transform(df), columns=self.features, index=df.index)
+
+    def check(self, features: list[str]):
+        """Vérifie qu'un modèle a été entraîné avec exactement ces features."""
+        if list(features) != self.features:
+            raise ValueError(
+                f"× Feature mismatch: model expects {list(features)}, pipeline builds {self.features}"
+            )
+
+
+# Random forest servie : données météo brutes + date décomposée
+WIND_FEATURES = FeaturePipeline(
+    [
+        "wind_gusts_10m_mean",
+        "wind_speed_10m_mean",
+        "winddirection_10m_dominant",
+        "year",
+        "month",
+        "day",
+        "dayofweek",
+    ]
+)
+
+# XGBoost : encodages cycliques du calendrier et de la direction du vent
+CYCLICAL_WIND_FEATURES = FeaturePipeline(
+    [
+        "wind_gusts_10m_mean",
+        "wind_speed_10m_mean",
+        "year",
+        "month_sin",
+        "month_cos",
+        "day_of_year_sin",
+        "day_of_year_cos",
+        "day_of_week_sin",
+        "day_of_week_cos",
+        "wind_direction_sin",
+        "wind_direction_cos",
+    ]
+)
+
+# Solaire : durées d'ensoleillement et couverture nuageuse + date décomposée
+SOLAR_FEATURES = FeaturePipeline(
+    [
+        "daylight_duration",
+        "sunshine_duration",
+        "cloud_cover_mean",
+        "year",
+        "month",
+        "day",
+        "dayofweek",
+    ]
+)
+
+# Hydro : débit moyen journalier (Hub'Eau) et précipitations + date décomposée
+HYDRO_FEATURES = FeaturePipeline(
+    [
+        "resultat_obs_elab",
+        "rain_sum",
+        "precipitation_hours",
+        "year",
+        "month",
+        "day",
+        "dayofweek",
+    ]
+)
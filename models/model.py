@@ -1,8 +1,46 @@
+import json
+import math
+import os
+import time
+import numpy as np
 import pandas as pd
 import pickle
+import hashlib
+import shutil
+from datetime import datetime
 from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
-from models.data_preparation import prepare_data
+from sklearn.preprocessing import StandardScaler
+from models.artifacts import FlatForest, LinearArtifact, hash_frame, publish
+from models.drift import reference_profile
+from models.energies import ENERGIES, WIND, Energy
+from models.data_preparation import load_data, prepare_data, split_features_target
+
+MODEL_PATH = WIND.model_path
+ARTIFACT_NAME = WIND.artifact
+COMPACT_ARTIFACT_NAME = f"{WIND.artifact}_compact"
+STATE_PATH = WIND.state_path
+HISTORY_PATH = "models/training_history.jsonl"
+# Cache des entraînements complets, adressé par le contenu (données + configuration)
+CACHE_DIR = os.getenv("TRAINING_CACHE_DIR", "models/cache")
+# Paramètres de découpage train/test, inclus dans la clé du cache
+TEST_SIZE = 0.2
+RANDOM_STATE = 42
+# Nombre d'entraînements conservés dans le cache (les plus récents)
+CACHE_KEEP = 3
+
+# Nombre de mises à jour incrémentales tolérées avant un réentraînement complet
+FULL_RETRAIN_EVERY = 7
+# Nombre d'arbres ajoutés à la forêt à chaque mise à jour incrémentale
+INCREMENTAL_TREES = 50
+# Fenêtre récente (en jours, nouveaux jours inclus) sur laquelle ces arbres
+# sont entraînés : quelques jours seuls ne donneraient que des souches
+INCREMENTAL_WINDOW_DAYS = 365
+# Dégradation relative du MAE tolérée par défaut lors de la compaction (2 %)
+COMPACTION_TOLERANCE = 0.02
+# Nombre minimal d'arbres conservés, pour garder une moyenne stable
+MIN_COMPACT_TREES = 10
 
 
 def initialize_model() -> RandomForestRegressor:
@@ -40,7 +78,7 @@ def evaluate_model(model, X_test, y_test):
     return mae, mse, r2
 
 
-def save_model(model, path: str = "models/random_forest_model.pkl"):
+def save_model(model, path: str = MODEL_PATH):
     """
     Sauvegarde le modèle entraîné dans un fichier .pkl à l'aide de pickle.
     
@@ -54,28 +92,508 @@ def save_model(model, path: str = "models/random_forest_model.pkl"):
     print(f"\n Modèle sauvegardé au format .pkl sous : {path}")
 
 
-def run_model():
+def publish_artifact(model, df: pd.DataFrame, energy: Energy = WIND) -> str:
+    """
+    Publie le modèle au format plat memory-mappable utilisé par l'API.
+
+    Le .pkl reste le point de reprise de l'entraînement (warm_start) ; l'API
+    ne charge que l'artefact plat, partagé entre tous ses workers.
+
+    Args:
+        model: Le modèle entraîné.
+        df (pd.DataFrame): Données d'entraînement, dont l'empreinte est inscrite dans l'en-tête.
+        energy (Energy): Énergie prédite par le modèle.
+    """
+    artifact = FlatForest.from_estimator(
+        model,
+        metadata={
+            "energy": energy.name,
+            "training_date": datetime.now().isoformat(timespec="seconds"),
+            "data_hash": hash_frame(df),
+            "watermark": pd.to_datetime(df["date"]).max().strftime("%Y-%m-%d"),
+            "reference_profile": reference_profile(df, energy.features.raw),
+        },
+    )
+    path = publish(artifact, energy.artifact)
+    print(f" Artefact memory-mappable publié sous : {path}")
+    return path
+
+
+def publish_fallback(X_train, X_test, y_train, y_test, df: pd.DataFrame, energy: Energy = WIND) -> float:
+    """
+    Entraîne et publie la régression linéaire standardisée (celle de
+    `model_saleh/lin_reg.py`) sur les features de la forêt : c'est le modèle
+    de secours servi par l'API quand elle déleste la forêt.
+
+    Returns:
+        float: MAE du modèle de secours sur le jeu de test.
+    """
+    scaler = StandardScaler().fit(X_train)
+    model = LinearRegression().fit(scaler.transform(X_train), y_train)
+    artifact = LinearArtifact.from_estimator(
+        scaler,
+        model,
+        list(X_train.columns),
+        metadata={
+            "energy": energy.name,
+            "training_date": datetime.now().isoformat(timespec="seconds"),
+            "data_hash": hash_frame(df),
+            "reference_profile": reference_profile(df, energy.features.raw),
+        },
+    )
+    mae = mean_absolute_error(y_test, artifact.predict(X_test))
+    path = publish(artifact, energy.fallback_artifact)
+    print(f" Modèle de secours (régression linéaire, MAE {mae:.2f}) publié sous : {path}")
+    return mae
+
+
+def measure_latency(forest: FlatForest, X, repeat: int = 50) -> float:
+    """Latence moyenne (en ms) d'une prédiction sur une seule ligne."""
+    row = X.iloc[:1]
+    forest.predict(row)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        forest.predict(row)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def compact_model(
+    model,
+    X_test,
+    y_test,
+    df: pd.DataFrame,
+    tolerance: float = COMPACTION_TOLERANCE,
+    energy: Energy = WIND,
+) -> dict:
+    """
+    Sélectionne un sous-ensemble d'arbres de la forêt dont le MAE sur le jeu
+    de test reste dans la tolérance, puis publie l'artefact compact à côté du
+    modèle complet.
+
+    Les arbres sont ajoutés un à un (sélection gloutonne) : à chaque étape on
+    retient celui qui réduit le plus le MAE de l'ensemble, et on s'arrête dès
+    que ce MAE ne dépasse plus celui de la forêt complète de plus de
+    `tolerance`. Toutes les prédictions par arbre sont calculées une seule
+    fois. La sélection se fait sur une moitié du jeu de test et les MAE
+    rapportés sur l'autre moitié, pour ne pas flatter le modèle compact.
+
+    Args:
+        model: La forêt entraînée.
+        X_test, y_test: Jeu de test (holdout).
+        df (pd.DataFrame): Données d'entraînement, pour l'en-tête de l'artefact.
+        tolerance (float): Dégradation relative du MAE acceptée (0.02 = 2 %).
+        energy (Energy): Énergie prédite par le modèle.
+
+    Returns:
+        dict: Compromis taille / latence / précision des deux modèles.
+    """
+    print(f"\n Compaction du modèle (tolérance MAE : {tolerance:.1%})...")
+    full = FlatForest.from_estimator(model)
+    per_tree = full.predict_trees(X_test)
+    y = np.asarray(y_test, dtype=np.float64)
+    # Une ligne sur deux sert à choisir les arbres, l'autre à mesurer le résultat
+    pick = np.arange(len(y)) % 2 == 0
+    per_tree_pick, y_pick = per_tree[:, pick], y[pick]
+    budget = mean_absolute_error(y_pick, per_tree_pick.mean(axis=0)) * (1 + tolerance)
+
+    selected = []
+    remaining = np.ones(len(per_tree), dtype=bool)
+    running_sum = np.zeros_like(y_pick)
+    while remaining.any():
+        candidates = np.flatnonzero(remaining)
+        scores = np.abs(
+            (running_sum + per_tree_pick[candidates]) / (len(selected) + 1) - y_pick
+        ).mean(axis=1)
+        best = candidates[np.argmin(scores)]
+        selected.append(int(best))
+        remaining[best] = False
+        running_sum += per_tree_pick[best]
+        if len(selected) >= MIN_COMPACT_TREES and scores.min() <= budget:
+            break
+
+    compact = FlatForest.from_estimator(
+        model,
+        tree_indices=selected,
+        metadata={
+            "energy": energy.name,
+            "training_date": datetime.now().isoformat(timespec="seconds"),
+            "data_hash": hash_frame(df),
+            "compacted_from": len(per_tree),
+            "tolerance": tolerance,
+        },
+    )
+    full_mae = mean_absolute_error(y[~pick], per_tree[:, ~pick].mean(axis=0))
+    compact_mae = mean_absolute_error(
+        y[~pick], per_tree[selected][:, ~pick].mean(axis=0)
+    )
+    report = {
+        "full": {
+            "n_trees": full.metadata["n_trees"],
+            "size_mb": full.nbytes / 1e6,
+            "latency_ms": measure_latency(full, X_test),
+            "mae": full_mae,
+        },
+        "compact": {
+            "n_trees": compact.metadata["n_trees"],
+            "size_mb": compact.nbytes / 1e6,
+            "latency_ms": measure_latency(compact, X_test),
+            "mae": compact_mae,
+        },
+    }
+    for name, values in report.items():
+        print(
+            f"{name:<8}: {values['n_trees']:>4} arbres | "
+            f"{values['size_mb']:.2f} Mo | {values['latency_ms']:.2f} ms/ligne | "
+            f"MAE {values['mae']:.2f}"
+        )
+
+    path = publish(compact, f"{energy.artifact}_compact")
+    print(f" Artefact compact publié sous : {path}")
+    return report
+
+
+def load_model(path: str = MODEL_PATH):
+    """Recharge un modèle sauvegardé au format .pkl."""
+    with open(path, "rb") as file:
+        return pickle.load(file)
+
+
+def load_training_state(path: str = STATE_PATH) -> dict | None:
+    """
+    Lit l'état du dernier entraînement (watermark, nombre de mises à jour
+    incrémentales depuis le dernier entraînement complet...).
+
+    Returns:
+        dict | None: L'état sauvegardé, ou None si aucun entraînement n'a eu lieu.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path) as file:
+        return json.load(file)
+
+
+def save_training_state(state: dict, path: str = STATE_PATH):
+    """Sauvegarde l'état d'entraînement au format JSON."""
+    with open(path, "w") as file:
+        json.dump(state, file, indent=2)
+
+
+def record_history(entry: dict, path: str = HISTORY_PATH):
+    """
+    Ajoute une ligne à l'historique des entraînements (JSON Lines), afin de
+    suivre la dérive éventuelle des mises à jour incrémentales.
+    """
+    entry = {
+        key: None if isinstance(value, float) and math.isnan(value) else value
+        for key, value in entry.items()
+    }
+    with open(path, "a") as file:
+        file.write(json.dumps(entry) + "\n")
+
+
+def full_retrain_reason(state: dict | None, energy: Energy = WIND) -> str | None:
+    """Retourne la raison d'un réentraînement complet obligatoire, ou None."""
+    if state is None or not os.path.exists(energy.model_path):
+        return "aucun modèle existant"
+    if state.get("incremental_runs", 0) >= FULL_RETRAIN_EVERY:
+        return (
+            f"{state['incremental_runs']} mises à jour incrémentales "
+            "depuis le dernier entraînement complet"
+        )
+    return None
+
+
+def canonical_order(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Table triée par date (puis par site) : la base ne garantit aucun ordre,
+    or l'empreinte des données et le découpage train/test en dépendent.
+    """
+    keys = ["date"] + (["site"] if "site" in df.columns else [])
+    return df.sort_values(keys, kind="stable").reset_index(drop=True)
+
+
+def training_key(df: pd.DataFrame, energy: Energy = WIND) -> str:
+    """
+    Clé du cache d'entraînement : empreinte des données (indépendante de
+    l'ordre des lignes) combinée à la configuration (hyperparamètres,
+    features, découpage train/test).
+    """
+    config = {
+        "energy": energy.name,
+        "features": energy.features.features,
+        "params": initialize_model().get_params(),
+        "test_size": TEST_SIZE,
+        "random_state": RANDOM_STATE,
+    }
+    digest = hashlib.sha256(hash_frame(canonical_order(df)).encode())
+    digest.update(json.dumps(config, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def load_cached_entry(key: str, root: str = CACHE_DIR) -> dict | None:
+    """
+    Retourne les métriques d'un entraînement déjà effectué avec la même
+    clé, ou None.
+    """
+    path = os.path.join(root, key)
+    if not os.path.exists(os.path.join(path, "entry.json")):
+        return None
+    with open(os.path.join(path, "entry.json")) as file:
+        entry = json.load(file)
+    os.utime(path)  # Entrée récemment utilisée : conservée en priorité
+    return entry
+
+
+def load_cached_training(key: str, root: str = CACHE_DIR):
+    """
+    Retourne le modèle et les métriques d'un entraînement déjà effectué avec
+    la même clé, ou None.
+    """
+    entry = load_cached_entry(key, root)
+    if entry is None:
+        return None
+    return load_model(os.path.join(root, key, "model.pkl")), entry
+
+
+def store_cached_training(key: str, model, entry: dict, root: str = CACHE_DIR):
+    """
+    Enregistre un entraînement dans le cache, en ne gardant que les
+    CACHE_KEEP plus récents. `entry.json` est écrit en dernier : un dossier
+    sans ce fichier (écriture interrompue) est ignoré.
+    """
+    path = os.path.join(root, key)
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+    with open(os.path.join(path, "model.pkl"), "wb") as file:
+        pickle.dump(model, file)
+    with open(os.path.join(path, "entry.json"), "w") as file:
+        json.dump(entry, file, indent=2)
+
+    entries = sorted(
+        (os.path.join(root, name) for name in os.listdir(root)),
+        key=os.path.getmtime,
+    )
+    for old in entries[:-CACHE_KEEP]:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def run_full_training(
+    df: pd.DataFrame,
+    compaction_tolerance: float | None = None,
+    energy: Energy = WIND,
+) -> dict:
+    """
+    Entraîne une nouvelle forêt sur la totalité de la table.
+
+    Args:
+        df (pd.DataFrame): Table complète de l'énergie.
+        compaction_tolerance (float | None): Si fourni, publie aussi une forêt
+            compacte (voir `compact_model`).
+        energy (Energy): Énergie à prédire.
+
+    Si les mêmes données ont déjà été entraînées avec la même configuration
+    et que ce modèle est toujours celui publié, l'entraînement s'arrête là :
+    ses métriques sont reprises du cache, rien n'est réécrit ni republié.
+    Si le modèle du cache n'est plus celui publié, il est republié sans
+    réentraînement.
+    """
+    df = canonical_order(df)
+    key = training_key(df, energy)
+    state = load_training_state(energy.state_path)
+    if (
+        state is not None
+        and state.get("training_key") == key
+        and not state.get("incremental_runs")
+        and os.path.exists(energy.model_path)
+    ):
+        cached_entry = load_cached_entry(key)
+        if cached_entry is not None:
+            print(f"· Modèle publié à jour, repris du cache d'entraînement ({key[:12]})")
+            if compaction_tolerance is not None:
+                print("· Compaction ignorée : le modèle publié n'a pas changé")
+            entry = {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "energy": energy.name,
+                "mode": "full",
+                "cache_hit": True,
+                "watermark": state["watermark"],
+                "n_rows": len(df),
+                "n_estimators": state["n_estimators"],
+                **cached_entry,
+            }
+            record_history(entry)
+            return entry
+
+    # Préparation des données
+    X_train, X_test, y_train, y_test = prepare_data(
+        test_size=TEST_SIZE, random_state=RANDOM_STATE, df=df, energy=energy
+    )
+
+    cached = load_cached_training(key)
+    if cached is not None:
+        model, metrics = cached
+        mae, mse, r2 = metrics["mae"], metrics["mse"], metrics["r2"]
+        print(f"· Modèle repris du cache d'entraînement ({key[:12]})")
+        print(f"MAE : {mae:.2f}\nMSE : {mse:.2f}\nR²  : {r2:.2f}")
+    else:
+        # Initialisation et entraînement
+        model = initialize_model()
+        model = train_model(model, X_train, y_train)
+        mae, mse, r2 = evaluate_model(model, X_test, y_test)
+
+    # Sauvegarde
+    save_model(model, energy.model_path)
+    publish_artifact(model, df, energy)
+    fallback_mae = publish_fallback(X_train, X_test, y_train, y_test, df, energy)
+    if cached is None:
+        store_cached_training(
+            key, model, {"mae": mae, "mse": mse, "r2": r2, "fallback_mae": fallback_mae}
+        )
+
+    now = datetime.now().isoformat(timespec="seconds")
+    watermark = pd.to_datetime(df["date"]).max().strftime("%Y-%m-%d")
+    save_training_state(
+        {
+            "watermark": watermark,
+            "last_full_train": now,
+            "incremental_runs": 0,
+            "n_estimators": model.n_estimators,
+            "training_key": key,
+        },
+        energy.state_path,
+    )
+    entry = {
+        "timestamp": now,
+        "energy": energy.name,
+        "mode": "full",
+        "cache_hit": cached is not None,
+        "watermark": watermark,
+        "n_rows": len(df),
+        "n_estimators": model.n_estimators,
+        "mae": mae,
+        "mse": mse,
+        "r2": r2,
+        "fallback_mae": fallback_mae,
+    }
+    if compaction_tolerance is not None:
+        entry["compaction"] = compact_model(
+            model, X_test, y_test, df, tolerance=compaction_tolerance, energy=energy
+        )
+    record_history(entry)
+    return entry
+
+
+def run_incremental_training(
+    df: pd.DataFrame, state: dict, energy: Energy = WIND
+) -> dict | None:
+    """
+    Ajoute des arbres (warm_start) dès que des jours plus récents que le
+    watermark du dernier entraînement sont disponibles. Ces arbres sont
+    entraînés sur les INCREMENTAL_WINDOW_DAYS derniers jours, nouveaux jours
+    compris.
+
+    Le modèle est évalué sur les nouveaux jours *avant* sa mise à jour : ce
+    sont des données qu'il n'a jamais vues, ce qui donne une mesure honnête
+    de sa dérive entre deux entraînements complets. Il est réévalué sur ces
+    mêmes jours *après* la mise à jour (`*_after`), pour vérifier que les
+    arbres ajoutés ne dégradent pas la forêt ; les nouveaux arbres ayant vu
+    ces jours, seule la mesure « avant » du passage suivant est hors
+    échantillon.
+    """
+    dates = pd.to_datetime(df["date"])
+    is_new = dates > pd.Timestamp(state["watermark"])
+    new_rows = df[is_new]
+    if new_rows.empty:
+        print(f"· Aucune nouvelle donnée depuis le {state['watermark']}")
+        return None
+    print(f"· {len(new_rows)} nouveaux jours depuis le {state['watermark']}")
+
+    X_new, y_new = split_features_target(new_rows, energy)
+    model = load_model(energy.model_path)
+    mae, mse, r2 = evaluate_model(model, X_new, y_new)
+
+    window = df[dates > dates.max() - pd.Timedelta(days=INCREMENTAL_WINDOW_DAYS)]
+    X_window, y_window = split_features_target(window, energy)
+    print(
+        f"Ajout de {INCREMENTAL_TREES} arbres au modèle Random Forest "
+        f"({len(window)} jours récents)..."
+    )
+    model.set_params(
+        warm_start=True, n_estimators=model.n_estimators + INCREMENTAL_TREES
+    )
+    model.fit(X_window, y_window)
+    mae_after, mse_after, r2_after = evaluate_model(model, X_new, y_new)
+    save_model(model, energy.model_path)
+    publish_artifact(model, df, energy)
+
+    now = datetime.now().isoformat(timespec="seconds")
+    watermark = dates.max().strftime("%Y-%m-%d")
+    state.update(
+        {
+            "watermark": watermark,
+            "incremental_runs": state.get("incremental_runs", 0) + 1,
+            "n_estimators": model.n_estimators,
+        }
+    )
+    save_training_state(state, energy.state_path)
+    entry = {
+        "timestamp": now,
+        "energy": energy.name,
+        "mode": "incremental",
+        "watermark": watermark,
+        "n_rows": len(new_rows),
+        "n_window_rows": len(window),
+        "n_estimators": model.n_estimators,
+        "mae": mae,
+        "mse": mse,
+        "r2": r2,
+        "mae_after": mae_after,
+        "mse_after": mse_after,
+        "r2_after": r2_after,
+    }
+    record_history(entry)
+    return entry
+
+
+def run_model(
+    incremental: bool = False,
+    compaction_tolerance: float | None = None,
+    energy: str = "eolienne",
+):
     """
     Fonction principale pour exécuter le pipeline complet :
     - Préparation des données
-    - Entraînement
+    - Entraînement (complet, ou incrémental si demandé et possible)
     - Évaluation
     - Sauvegarde
-    """
-    print("Lancement du pipeline de modélisation...\n")
-
-    # Préparation des données
-    X_train, X_test, y_train, y_test = prepare_data()
 
-    # Initialisation et entraînement
-    model = initialize_model()
-    model = train_model(model, X_train, y_train)
+    Args:
+        incremental (bool): Met à jour le modèle existant avec les seuls jours
+            postérieurs au dernier entraînement. Un entraînement complet est
+            forcé tous les FULL_RETRAIN_EVERY passages incrémentaux.
+        compaction_tolerance (float | None): Après un entraînement complet,
+            publie une forêt réduite dont le MAE reste dans cette tolérance.
+        energy (str): Énergie à modéliser (eolienne, solaire ou hydro).
+    """
+    print(f"Lancement du pipeline de modélisation ({energy})...\n")
+    spec = ENERGIES[energy]
 
-    # Évaluation et sauvegarde
-    evaluate_model(model, X_test, y_test)
-    save_model(model)
+    df = load_data(spec)
+    if incremental:
+        state = load_training_state(spec.state_path)
+        reason = full_retrain_reason(state, spec)
+        if reason is None:
+            if compaction_tolerance is not None:
+                print("· Compaction ignorée : elle suit uniquement un entraînement complet")
+            entry = run_incremental_training(df, state, spec)  # pyright: ignore[reportArgumentType]
+        else:
+            print(f"· Entraînement complet forcé : {reason}")
+            entry = run_full_training(df, compaction_tolerance, spec)
+    else:
+        entry = run_full_training(df, compaction_tolerance, spec)
 
     print("\n Pipeline terminé avec succès.")
+    return entry
 
 
 if __name__ == "__main__":
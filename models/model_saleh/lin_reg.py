@@ -1,5 +1,5 @@
 import pandas as pd
-from prepare_data.db_handler import DBHandler, supabase
+from prepare_data.db_handler import DBHandler
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LinearRegression
@@ -9,7 +9,7 @@ from sklearn.metrics import mean_squared_error, r2_score
 class ModelLinearRegression:
     def load(self):
         """Load data from the database and define features and target"""
-        self.data = DBHandler(client=supabase).fetch("eolienne")
+        self.data = DBHandler().fetch("eolienne")
         self.X = self.data[["wind_speed_10m_mean", "wind_gusts_10m_mean", "winddirection_10m_dominant"]]
         self.y = self.data["prod_eolienne"]
 
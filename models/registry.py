@@ -0,0 +1,120 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from models.artifacts import FlatForest, current_version_path, load_current
+
+# Budget mémoire des modèles chargés simultanément par un worker
+MEMORY_BUDGET_MB = float(os.getenv("MODEL_MEMORY_BUDGET_MB", "512"))
+# Intervalle (en secondes) entre deux lectures du pointeur `CURRENT` d'un
+# modèle chargé : une nouvelle version publiée est servie sans redémarrage
+REFRESH_SECONDS = float(os.getenv("MODEL_REFRESH_SECONDS", "10"))
+
+
+class ModelRegistry:
+    """
+    Charge les artefacts publiés à la première demande et les garde en
+    mémoire tant que leur taille cumulée reste sous le budget ; au-delà, les
+    modèles les moins récemment utilisés sont libérés (LRU).
+
+    Le dernier modèle demandé est toujours conservé, même s'il dépasse à lui
+    seul le budget. Un artefact est chargé hors du verrou du registre : le
+    chargement d'un modèle ne bloque pas les requêtes des autres modèles.
+
+    Si `version` est fourni, la version publiée d'un modèle chargé est
+    relue au plus toutes les `refresh_seconds` secondes ; quand elle a
+    changé, le modèle est rechargé (bascule à chaud). Les requêtes en cours
+    terminent sur l'ancienne version, toujours ouverte.
+    """
+
+    def __init__(
+        self,
+        budget_bytes: int,
+        loader=load_current,
+        version=None,
+        refresh_seconds: float = REFRESH_SECONDS,
+    ):
+        self.budget_bytes = budget_bytes
+        self.loader = loader
+        self.version = version
+        self.refresh_seconds = refresh_seconds
+        self._models: OrderedDict[str, FlatForest] = OrderedDict()
+        # nom -> (version chargée, instant de la dernière vérification)
+        self._versions: dict[str, tuple[str | None, float]] = {}
+        self._lock = threading.Lock()
+        # nom -> verrou de chargement, pris hors de `_lock`
+        self._loading: dict[str, threading.Lock] = {}
+
+    def _current_version(self, name: str) -> str | None:
+        if self.version is None:
+            return None
+        try:
+            return self.version(name)
+        except FileNotFoundError:
+            return None
+
+    def _is_stale(self, name: str) -> bool:
+        if self.version is None:
+            return False
+        loaded, checked = self._versions.get(name, (None, 0.0))
+        now = time.monotonic()
+        if now - checked < self.refresh_seconds:
+            return False
+        current = self._current_version(name)
+        self._versions[name] = (loaded, now)
+        return current is not None and current != loaded
+
+    def get(self, name: str) -> FlatForest:
+        with self._lock:
+            model = self._models.get(name)
+            if model is not None and not self._is_stale(name):
+                self._models.move_to_end(name)
+                return model
+            loading = self._loading.setdefault(name, threading.Lock())
+        # Chargement hors du verrou global : les autres modèles restent servis
+        # pendant qu'un artefact est lu, et une seule requête charge chaque nom
+        with loading:
+            with self._lock:
+                current = self._models.get(name)
+                if current is not None and current is not model:
+                    self._models.move_to_end(name)
+                    return current
+            version = self._current_version(name)
+            fresh = self.loader(name)
+            with self._lock:
+                if model is not None:
+                    print(f"· Model `{name}` reloaded (new version published)")
+                self._models[name] = fresh
+                self._models.move_to_end(name)
+                self._versions[name] = (version, time.monotonic())
+                while self._used_bytes() > self.budget_bytes and len(self._models) > 1:
+                    evicted, _ = self._models.popitem(last=False)
+                    self._versions.pop(evicted, None)
+                    print(f"· Model `{evicted}` evicted (memory budget exceeded)")
+            return fresh
+
+    def _used_bytes(self) -> int:
+        return sum(model.nbytes for model in self._models.values())
+
+    @property
+    def used_bytes(self) -> int:
+        with self._lock:
+            return self._used_bytes()
+
+    def reload(self, name: str | None = None):
+        """Oublie un modèle (ou tous) : il sera rechargé à la prochaine demande."""
+        with self._lock:
+            for loaded in [name] if name is not None else list(self._models):
+                self._models.pop(loaded, None)
+                self._versions.pop(loaded, None)
+
+    def loaded(self) -> list[str]:
+        """Noms des modèles en mémoire, du moins au plus récemment utilisé."""
+        with self._lock:
+            return list(self._models)
+
+
+registry = ModelRegistry(
+    budget_bytes=int(MEMORY_BUDGET_MB * 1024 * 1024), version=current_version_path
+)
@@ -1,6 +1,5 @@
-import numpy as np
-import pandas as pd
-from prepare_data.db_handler import DBHandler, supabase
+from models.features import CYCLICAL_WIND_FEATURES
+from prepare_data.db_handler import DBHandler
 from sklearn.metrics import (
     mean_absolute_error,
     mean_squared_error,
@@ -13,44 +12,13 @@ from xgboost import XGBRegressor
 
 class Predict:
     def load(self):
-        self.data = DBHandler(client=supabase).fetch(table_name='eolienne')
+        self.data = DBHandler().fetch(table_name='eolienne')
         return self
 
     def prepare(self):
-        self.data['date'] = pd.to_datetime(self.data['date'])
-
-        self.data['year'] = self.data['date'].dt.year
-        self.data['month'] = self.data['date'].dt.month
-        self.data['day_of_year'] = self.data['date'].dt.day_of_year
-        self.data['day_of_week'] = self.data['date'].dt.day_of_week
-
-        self.data['month_sin'] = np.sin(2 * np.pi * self.data['month'] / 12)
-        self.data['month_cos'] = np.cos(2 * np.pi * self.data['month'] / 12)
-        self.data['day_of_year_sin'] = np.sin(
-            2 * np.pi * self.data['day_of_year'] / 365.25
-        )
-        self.data['day_of_year_cos'] = np.cos(
-            2 * np.pi * self.data['day_of_year'] / 365.25
-        )
-        self.data['day_of_week_sin'] = np.sin(2 * np.pi * self.data['day_of_week'] / 7)
-        self.data['day_of_week_cos'] = np.cos(2 * np.pi * self.data['day_of_week'] / 7)
-        self.data['wind_direction_sin'] = np.sin(
-            2 * np.pi * self.data['winddirection_10m_dominant'] / 360
-        )
-        self.data['wind_direction_cos'] = np.cos(
-            2 * np.pi * self.data['winddirection_10m_dominant'] / 360
-        )
-
-        self.data = self.data.drop(
-            labels=[
-                'date',
-                'month',
-                'day_of_year',
-                'day_of_week',
-                'winddirection_10m_dominant',
-            ],
-            axis=1,
-        )
+        features = CYCLICAL_WIND_FEATURES.frame(self.data)
+        features['prod_eolienne'] = self.data['prod_eolienne']
+        self.data = features
         return self
 
     def run_model(self):
@@ -1,24 +1,50 @@
-from datetime import datetime
+import os
+import sys
+from datetime import date, datetime
+from typing import TYPE_CHECKING
 
-import requests
-from models.model import run_model
-from prepare_data.api_handlers import HubEauAPIHandler, OpenMeteoAPIHandler
+from prepare_data.api_handlers import (
+    HubEauAPIHandler,
+    OpenMeteoAPIHandler,
+    OpenMeteoHourlyAPIHandler,
+)
 from prepare_data.csv_handlers import (
     EolienneCSVHandler,
     HydroCSVHandler,
     SolaireCSVHandler,
 )
 from prepare_data.db_handler import DBHandler
+from prepare_data.export_handler import iter_export
+from prepare_data.http_client import get_client, run_sync
 from prepare_data.merge_handler import DataMerger, DataSpliter, HydroDataMerger
 from productors.productors import ProducteurEolien, ProducteurHydro, ProducteurSolaire
-from supabase import Client
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+# Prediction API queried by `fetch_prediction`
+API_URL = os.getenv('API_URL', 'http://127.0.0.1:8000')
 
 
 class Pipeline:
-    def __init__(self, client: Client):
+    def __init__(
+        self,
+        client: 'Client | None' = None,
+        hourly_weather: bool = False,
+        start: date | None = None,
+        end: date | None = None,
+    ):
+        """
+        Parameters:
+            client (Client | None): Supabase client, defaults to the configured storage backend.
+            hourly_weather (bool): Also ingest hourly wind data and add its daily features to the wind table.
+            start (date | None): First day fetched from the APIs, defaults to the start of their history.
+            end (date | None): Last day fetched from the APIs, defaults to the end of their history.
+        """
+        weather = OpenMeteoHourlyAPIHandler if hourly_weather else OpenMeteoAPIHandler
         self.handlers = {
-            'open_meteo_api_data': OpenMeteoAPIHandler(),
-            'hub_eau_api_data': HubEauAPIHandler(),
+            'open_meteo_api_data': weather(start_date=start, end_date=end),
+            'hub_eau_api_data': HubEauAPIHandler(start_date=start, end_date=end),
             'eolienne_csv_data': EolienneCSVHandler(),
             'solaire_csv_data': SolaireCSVHandler(),
             'hydro_csv_data': HydroCSVHandler(),
@@ -80,12 +106,12 @@ class Pipeline:
         self._is_clean = True
         return self
 
-    def db_insertion(self):
+    def db_insertion(self, sync: bool = False):
         """
         Loops in handlers dict to call their load() method.
 
         Parameters:
-            self
+            sync (bool): Upsert only new or changed rows instead of requiring empty tables.
 
         Returns:
             self
@@ -121,12 +147,22 @@ class Pipeline:
         )
         solar_merge.merge_data('date')
 
-        print('\n· Inserting in database...')
         db = DBHandler(client=self.client)
-
-        db.insert(df_to_insert=wind_merge.merge_df, table_name='eolienne')
-        db.insert(df_to_insert=solar_merge.merge_df, table_name='solaire')
-        db.insert(df_to_insert=hydro_merge.merge_df, table_name='hydro')
+        tables = {
+            'eolienne': wind_merge.merge_df,
+            'solaire': solar_merge.merge_df,
+            'hydro': hydro_merge.merge_df,
+        }
+        if sync:
+            print('\n· Syncing database (new and changed rows only)...')
+            self.sync_report = {
+                table: db.sync(df_to_sync=df, table_name=table)
+                for table, df in tables.items()
+            }
+        else:
+            print('\n· Inserting in database...')
+            for table, df in tables.items():
+                db.insert(df_to_insert=df, table_name=table)
 
         print('· Database insertion process complete')
         return self
@@ -162,12 +198,125 @@ class Pipeline:
         data_hyd.load_data(start=start_date, end=end_date)
         data_hyd.calculer_production()
 
-    def start_train(self):
+    def export_production_data(
+        self,
+        table: str,
+        start: str | None = None,
+        end: str | None = None,
+        fmt: str = 'csv',
+        output: str | None = None,
+    ):
+        """
+        Streams the rows of a table for a date range as CSV or NDJSON.
+
+        Rows are pulled page by page from the database and written as they
+        arrive, so memory stays flat whatever the size of the range.
+
+        Parameters:
+            table (str): `eolienne`, `solaire` or `hydro`.
+            start (str | None): First day included <YYYY-MM-DD>.
+            end (str | None): Last day included <YYYY-MM-DD>.
+            fmt (str): `csv` or `ndjson`.
+            output (str | None): File to write, stdout if None.
+
+        Returns:
+            self
+        """
+        start_date = date.fromisoformat(start) if start else None
+        end_date = date.fromisoformat(end) if end else None
+        if start_date and end_date and start_date > end_date:
+            raise ValueError('× End date cannot be before start date')
+        db = DBHandler(client=self.client)
+        pages = db.iter_range(table, start=start_date, end=end_date)
+        columns = db.columns(table) if fmt == 'csv' else None
+        file = open(output, 'w', newline='') if output else sys.stdout
+        try:
+            for chunk in iter_export(pages, fmt, columns):
+                file.write(chunk)
+        finally:
+            if output:
+                file.close()
+                print(f'· Export of `{table}` written to {output}')
+        return self
+
+    def start_train(
+        self,
+        incremental: bool = False,
+        compaction_tolerance: float | None = None,
+        energy: str = 'eolienne',
+        backend: str = 'random_forest',
+    ):
         """
         Lance la phase de prédiction (entraînement, évaluation et sauvegarde du modèle).
+
+        Parameters:
+            incremental (bool): Only train on days newer than the last training watermark.
+            compaction_tolerance (float | None): Also publish a pruned forest within this MAE tolerance.
+            energy (str): Energy to model (`eolienne`, `solaire` or `hydro`).
+            backend (str): `random_forest` or `xgboost` (full training with early stopping).
+
+        Raises:
+            ValueError: If `incremental` or `compaction_tolerance` is given with `xgboost`.
         """
+        if backend == 'xgboost' and (incremental or compaction_tolerance is not None):
+            raise ValueError(
+                '× Incremental training and compaction are only available with `random_forest`'
+            )
         print('\n Démarrage du processus de prédiction...')
-        run_model()
+        if backend == 'xgboost':
+            from models.boosting import run_xgboost_training
+
+            # Always a full training: the boosted model has no training cache
+            return run_xgboost_training(energy=energy)
+
+        # Imported here: scikit-learn is only needed by training commands
+        from models.model import run_model
+
+        entry = run_model(
+            incremental=incremental,
+            compaction_tolerance=compaction_tolerance,
+            energy=energy,
+        )
+        if entry is not None and entry['mode'] == 'full':
+            status = 'hit' if entry['cache_hit'] else 'miss'
+            print(f'-> Training cache {status}')
+        return entry
+
+    def start_backtest(
+        self,
+        energy: str = 'eolienne',
+        n_folds: int = 5,
+        horizon: int = 90,
+        window: str = 'expanding',
+        backend: str = 'random_forest',
+    ) -> dict:
+        """
+        Evaluate the model on rolling-origin folds by date.
+
+        Parameters:
+            energy (str): Energy to evaluate (`eolienne`, `solaire` or `hydro`).
+            n_folds (int): Number of folds.
+            horizon (int): Days in the test period of each fold.
+            window (str): `expanding` or `sliding` training window.
+            backend (str): `random_forest` (folds in parallel processes) or
+                `xgboost` (folds share one quantized matrix).
+
+        Returns:
+            dict: Per-fold and aggregate MAE, RMSE and R².
+        """
+        print('\n-> BACKTESTING STARTING...')
+        if backend == 'xgboost':
+            from models.boosting import run_xgboost_backtest
+
+            return run_xgboost_backtest(
+                energy=energy, n_folds=n_folds, horizon=horizon, window=window
+            )
+
+        from models.backtest import run_backtest
+
+        return run_backtest(
+            energy=energy, n_folds=n_folds, horizon=horizon, window=window
+        )
 
     def fetch_prediction(
         self, date=None, wind_gusts=None, wind_speed=None, wind_direction=None
@@ -190,5 +339,4 @@ class Pipeline:
             'wind_speed_10m_mean': wind_speed,
             'winddirection_10m_dominant': wind_direction,
         }
-        response = requests.post('http://127.0.0.1:8000/predict', json=data)
-        print(response.json())
+        print(run_sync(get_client().post_json(f'{API_URL}/predict', json=data)))
@@ -0,0 +1,247 @@
+import fcntl
+import json
+import os
+import threading
+import time
+import traceback
+from collections.abc import Callable
+from datetime import date, datetime, timedelta
+
+# Hours between two refresh jobs
+SCHEDULE_INTERVAL_HOURS = float(os.getenv('SCHEDULE_INTERVAL_HOURS', '24'))
+LOCK_PATH = os.getenv('SCHEDULER_LOCK_PATH', 'models/.refresh.lock')
+JOB_HISTORY_PATH = os.getenv('JOB_HISTORY_PATH', 'models/job_history.jsonl')
+ENERGIES = ('eolienne', 'solaire', 'hydro')
+# Days fetched again before the last stored day, for late revisions of the sources
+REFETCH_DAYS = int(os.getenv('SCHEDULE_REFETCH_DAYS', '7'))
+
+
+class JobLocked(Exception):
+    pass
+
+
+class JobLock:
+    def __init__(self, path: str = LOCK_PATH):
+        """
+        Inter-process lock, so that refresh jobs never overlap (several API
+        workers or a CLI run may each host a scheduler).
+
+        The lock is an exclusive `flock` on the lock file, which holds the
+        owner's pid for information. The kernel releases it when its owner
+        exits, so a crashed job never leaves a stale lock behind.
+
+        Parameters:
+            path (str): Lock file.
+        """
+        self.path = path
+        self._file = None
+
+    def acquire(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        file = open(self.path, 'a+')
+        try:
+            fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            file.close()
+            raise JobLocked(f'× Another job holds {self.path}')
+        file.truncate(0)
+        file.write(str(os.getpid()))
+        file.flush()
+        self._file = file
+
+    def release(self):
+        # The file itself stays: removing it would let another process lock a
+        # new file while a third still holds the old one
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def run_job(
+    name: str,
+    steps: list[tuple[str, Callable]],
+    lock: JobLock | None = None,
+    history_path: str = JOB_HISTORY_PATH,
+) -> dict:
+    """
+    Run the steps of a job in order under the job lock, and append the
+    outcome to the job history (JSON Lines).
+
+    A failing step stops the job. When the lock is held by another run the job
+    is skipped.
+
+    Parameters:
+        name (str): Job name.
+        steps (list[tuple[str, Callable]]): Named steps, each called without arguments.
+        lock (JobLock | None): Lock shared by all schedulers, defaults to LOCK_PATH.
+        history_path (str): Job history file.
+
+    Returns:
+        dict: History entry (`status` is `success`, `failed` or `skipped`, with per-step durations).
+    """
+    entry = {
+        'job': name,
+        'started': datetime.now().isoformat(timespec='seconds'),
+        'status': 'success',
+        'steps': [],
+    }
+    start = time.perf_counter()
+    try:
+        with lock or JobLock():
+            for step_name, step in steps:
+                step_start = time.perf_counter()
+                step_entry = {'step': step_name, 'status': 'success'}
+                entry['steps'].append(step_entry)
+                try:
+                    step()
+                except Exception as e:
+                    step_entry['status'] = 'failed'
+                    entry['status'] = 'failed'
+                    entry['error'] = f'{step_name}: {e}'
+                    traceback.print_exc()
+                    break
+                finally:
+                    step_entry['duration_s'] = round(time.perf_counter() - step_start, 3)
+    except JobLocked as e:
+        entry['status'] = 'skipped'
+        entry['error'] = str(e)
+    entry['duration_s'] = round(time.perf_counter() - start, 3)
+
+    os.makedirs(os.path.dirname(history_path) or '.', exist_ok=True)
+    with open(history_path, 'a') as file:
+        file.write(json.dumps(entry) + '\n')
+    print(f'-> Job `{name}` {entry["status"]} in {entry["duration_s"]:.1f}s')
+    return entry
+
+
+def ingestion_window(
+    tables: tuple[str, ...] = ENERGIES,
+    refetch_days: int = REFETCH_DAYS,
+    today: date | None = None,
+) -> tuple[date | None, date | None]:
+    """
+    Days the refresh job fetches from the APIs: from the oldest of the
+    tables' last stored days (minus `refetch_days`, for late revisions) up to
+    today.
+
+    Parameters:
+        tables (tuple[str, ...]): Tables written by the ingestion.
+        refetch_days (int): Stored days fetched again.
+        today (date | None): Last day fetched, defaults to today.
+
+    Returns:
+        tuple[date | None, date | None]: First and last day, (None, None)
+        (whole history) while a table is still empty.
+    """
+    from prepare_data.db_handler import DBHandler
+
+    db = DBHandler()
+    latest = [db.latest_date(table) for table in tables]
+    if any(day is None for day in latest):
+        return None, None
+    end = today or date.today()
+    start = min(min(latest) - timedelta(days=refetch_days), end)  # pyright: ignore[reportArgumentType]
+    return start, end
+
+
+def ingest_and_sync():
+    """Fetch the days since the stored watermark and sync them into the database."""
+    from pipeline.pipeline import Pipeline
+
+    start, end = ingestion_window()
+    if start is None:
+        print('· Empty tables: fetching the whole history')
+    else:
+        print(f'· Fetching {start} → {end}')
+    Pipeline(start=start, end=end).db_insertion(sync=True)
+
+
+def refresh_steps(energies: tuple[str, ...] = ENERGIES) -> list[tuple[str, Callable]]:
+    """
+    Steps of the refresh job: ingestion of the days since the last stored
+    one, cleaning and delta sync of the database, then an incremental
+    training (with evaluation) per energy.
+
+    Each training publishes a new artifact version; serving processes pick it
+    up on their next pointer check, without restart. When the scheduler runs
+    inside the API, the analog-day index also takes the newly ingested days.
+    """
+    from models.analogs import analog_index
+    from models.model import run_model
+
+    steps = [('ingest_and_sync', ingest_and_sync)]
+    for energy in energies:
+        steps.append(
+            (f'train_{energy}', lambda energy=energy: run_model(incremental=True, energy=energy))
+        )
+    steps.append(('refresh_analogs', analog_index.refresh))
+    return steps
+
+
+class Scheduler:
+    def __init__(
+        self,
+        interval_hours: float = SCHEDULE_INTERVAL_HOURS,
+        job: Callable[[], dict] | None = None,
+    ):
+        """
+        Run the refresh job on a fixed cadence in a background thread.
+
+        Parameters:
+            interval_hours (float): Hours between the start of two jobs.
+            job (Callable[[], dict]): Job to run, defaults to the refresh job.
+        """
+        self.interval = interval_hours * 3600
+        self.job = job or (lambda: run_job('refresh', refresh_steps()))
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _loop(self, run_now: bool):
+        if not run_now:
+            self._stop.wait(self.interval)
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.job()
+            except Exception:
+                traceback.print_exc()
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def start(self, run_now: bool = True):
+        """
+        Start the background thread.
+
+        Parameters:
+            run_now (bool): Run a first job immediately, otherwise after one interval.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._loop, args=(run_now,), name='scheduler', daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def run_forever(self):
+        """Blocking mode for the CLI, until interrupted."""
+        print(f'-> Scheduler started, one refresh every {self.interval / 3600:g}h')
+        self.start()
+        try:
+            while self._thread is not None and self._thread.is_alive():
+                self._thread.join(1)
+        except KeyboardInterrupt:
+            print('\n· Stopping scheduler...')
+            self.stop()
@@ -1,28 +1,53 @@
+import os
+from datetime import date
+
+import httpx
 import pandas as pd
-import requests
 
 from prepare_data.cleaning_utils import CleaningUtils
 from prepare_data.data_handler import DataHandler
+from prepare_data.http_client import HTTPClient, fetch_ranges, get_client, run_sync
+from prepare_data.resampling import (
+    HOURLY_PATH,
+    HOURLY_VARIABLES,
+    compact_hourly,
+    hourly_to_daily,
+    save_hourly,
+)
 
 
 class OpenMeteoAPIHandler(DataHandler):
-    def load(self) -> pd.DataFrame:
-        """
-        Fetch data from open meteo API and returns it as a DataFrame.
+    url = os.getenv(
+        'OPEN_METEO_ARCHIVE_URL', 'https://archive-api.open-meteo.com/v1/archive'
+    )
+    start_date = date(2016, 9, 1)
+    end_date = date(2025, 9, 29)
+    # Length of the sub-ranges requested concurrently
+    chunk_days = 366
 
+    def __init__(
+        self,
+        client: HTTPClient | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ):
+        """
         Parameters:
-            None
-
-        Returns:
-            self.df (pd.DataFrame): DataFrame from fetched API data.
+            client (HTTPClient | None): HTTP client, defaults to the shared pooled client.
+            start_date (date | None): First day fetched, defaults to the start of the history.
+            end_date (date | None): Last day fetched, defaults to the end of the history.
         """
-        url = 'https://archive-api.open-meteo.com/v1/archive'
-        params = {
+        self.client = client or get_client()
+        self.start_date = start_date or self.start_date
+        self.end_date = end_date or self.end_date
+
+    def _params(self, start: date, end: date) -> dict:
+        return {
             'latitude': '43.62505',
             'longitude': '3.862038',
             'timezone': 'Europe/Berlin',
-            'start_date': '2016-09-01',
-            'end_date': '2025-09-29',
+            'start_date': start.isoformat(),
+            'end_date': end.isoformat(),
             'daily': [
                 'daylight_duration',
                 'sunshine_duration',
@@ -34,19 +59,44 @@ class OpenMeteoAPIHandler(DataHandler):
                 'precipitation_hours',
             ],
         }
+
+    async def _fetch(self, start: date, end: date) -> dict:
+        return await self.client.get_json(self.url, params=self._params(start, end))
+
+    def _frame(self, pages: list[dict]) -> pd.DataFrame:
+        return pd.concat(
+            [pd.DataFrame(page.get('daily', {})) for page in pages], ignore_index=True
+        )
+
+    def load(self) -> pd.DataFrame:
+        """
+        Fetch data from open meteo API and returns it as a DataFrame.
+
+        The date range is fetched as concurrent sub-range requests.
+
+        Parameters:
+            None
+
+        Returns:
+            self.df (pd.DataFrame): DataFrame from fetched API data.
+        """
         try:
             print('-> FETCHING DATA FROM OPEN-METEO API...')
-            response = requests.get(url, params)
-            response.raise_for_status()
-            print(f'· URL: {response.url}')
-            data = response.json()
-            daily_data = data.get('daily', {})
-            self.df = pd.DataFrame(daily_data)
+            pages = run_sync(
+                fetch_ranges(self._fetch, self.start_date, self.end_date, self.chunk_days)
+            )
+            print(f'· URL: {self.url} ({len(pages)} requests)')
+            if not pages:
+                # Empty or inverted date range: nothing was requested
+                print('No data found')
+                self.df = pd.DataFrame()
+                return self.df
+            self.df = self._frame(pages)
             print('· Successfully loaded API data into a dataframe')
-            print(f'· Column types: {data.get("daily_units", {})}')
+            print(f'· Column types: {pages[0].get("daily_units", {})}')
             print('· Dataframe preview:')
             print(self.df.head(10))
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             print(f'× API request error: {e}')
         return self.df
 
@@ -70,39 +120,106 @@ class OpenMeteoAPIHandler(DataHandler):
         return self.clean_df
 
 
+class OpenMeteoHourlyAPIHandler(OpenMeteoAPIHandler):
+    def __init__(
+        self,
+        client: HTTPClient | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        hourly_path: str = HOURLY_PATH,
+    ):
+        """
+        Daily Open-Meteo data enriched with daily features reduced from
+        hourly wind measurements (peak gusts, hours above cut-in speed...).
+
+        Hourly rows are stored as float32 Parquet in `hourly_path`.
+
+        Parameters:
+            client (HTTPClient): HTTP client, defaults to the shared pooled client.
+            start_date (date | None): First day fetched, defaults to the start of the history.
+            end_date (date | None): Last day fetched, defaults to the end of the history.
+            hourly_path (str): Parquet file receiving the hourly data.
+        """
+        super().__init__(client, start_date, end_date)
+        self.hourly_path = hourly_path
+
+    def _params(self, start: date, end: date) -> dict:
+        return {**super()._params(start, end), 'hourly': HOURLY_VARIABLES}
+
+    def _frame(self, pages: list[dict]) -> pd.DataFrame:
+        hourly = compact_hourly(
+            pd.concat(
+                [pd.DataFrame(page.get('hourly', {})) for page in pages],
+                ignore_index=True,
+            )
+        )
+        save_hourly(hourly, self.hourly_path)
+        daily = hourly_to_daily(hourly).rename(columns={'date': 'time'})
+        return super()._frame(pages).merge(daily, on='time', how='left')
+
+
 class HubEauAPIHandler(DataHandler):
+    url = os.getenv(
+        'HUBEAU_URL', 'https://hubeau.eaufrance.fr/api/v2/hydrometrie/obs_elab'
+    )
+    start_date = date(2022, 7, 7)
+    end_date = date(2025, 2, 23)
+    # One daily value per day: sub-ranges stay below the page size
+    chunk_days = 366
+
+    def __init__(
+        self,
+        client: HTTPClient | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ):
+        """
+        Parameters:
+            client (HTTPClient | None): HTTP client, defaults to the shared pooled client.
+            start_date (date | None): First day fetched, defaults to the start of the history.
+            end_date (date | None): Last day fetched, defaults to the end of the history.
+        """
+        self.client = client or get_client()
+        self.start_date = start_date or self.start_date
+        self.end_date = end_date or self.end_date
+
+    async def _fetch(self, start: date, end: date) -> dict:
+        params = {
+            'code_entite': 'Y321002101',
+            'grandeur_hydro_elab': 'QmnJ',
+            'date_debut': start.isoformat(),
+            'date_fin': end.isoformat(),
+            'size': '2000',
+        }
+        return await self.client.get_json(self.url, params=params)
+
     def load(self) -> pd.DataFrame:
         """
         Fetch data from hub eau API and returns it as a DataFrame.
 
+        The date range is fetched as concurrent sub-range requests.
+
         Parameters:
             None
 
         Returns:
             self.df (pd.DataFrame): DataFrame from fetched API data.
         """
-        url = 'https://hubeau.eaufrance.fr/api/v2/hydrometrie/obs_elab'
-        params = {
-            'code_entite': 'Y321002101',
-            'grandeur_hydro_elab': 'QmnJ',
-            'date_debut': '2022-07-07',
-            'date_fin': ' 2025-02-23',
-            'size': '2000',
-        }
         try:
             print("-> FETCHING DATA FROM HUB'EAU API...")
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            print(f'· URL: {response.url}')
-            data = response.json()
-            if 'data' in data:
-                self.df = pd.DataFrame(data['data'])
+            pages = run_sync(
+                fetch_ranges(self._fetch, self.start_date, self.end_date, self.chunk_days)
+            )
+            print(f'· URL: {self.url} ({len(pages)} requests)')
+            rows = [row for page in pages for row in page.get('data', [])]
+            if rows:
+                self.df = pd.DataFrame(rows)
                 print('· Successfully loaded API data into a dataframe')
                 print('· Dataframe preview:')
                 print(self.df.head(10))
             else:
                 print('No data found')
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             print(f'× API request error: {e}')
         return self.df
 
@@ -5,9 +5,11 @@ from prepare_data.data_handler import DataHandler
 
 
 class EolienneCSVHandler(DataHandler):
+    source_path = './data/prod/prod_eolienne.csv'
+
     def load(self) -> pd.DataFrame:
         print('-> LOADING DATA FROM CSV FILE...')
-        self.df = pd.read_csv('./data/prod/prod_eolienne.csv')
+        self.df = pd.read_csv(self.source_path)
         print('· Successfully loaded `Eolienne` CSV data into a dataframe')
         print('· Dataframe preview:')
         print(self.df.head(10))
@@ -35,9 +37,11 @@ class EolienneCSVHandler(DataHandler):
 
 
 class SolaireCSVHandler(DataHandler):
+    source_path = './data/prod/prod_solaire.csv'
+
     def load(self) -> pd.DataFrame:
         print('-> LOADING DATA FROM CSV FILE...')
-        self.df = pd.read_csv('./data/prod/prod_solaire.csv')
+        self.df = pd.read_csv(self.source_path)
         print('· Successfully loaded `Solaire` CSV data into a dataframe')
         print('· Dataframe preview:')
         print(self.df.head(10))
@@ -65,9 +69,11 @@ class SolaireCSVHandler(DataHandler):
 
 
 class HydroCSVHandler(DataHandler):
+    source_path = './data/prod/prod_hydro.csv'
+
     def load(self) -> pd.DataFrame:
         print('-> LOADING DATA FROM CSV FILE...')
-        self.df = pd.read_csv('./data/prod/prod_hydro.csv')
+        self.df = pd.read_csv(self.source_path)
         print('· Successfully loaded `Hydro` CSV data into a dataframe')
         print('· Dataframe preview:')
         print(self.df.head(10))
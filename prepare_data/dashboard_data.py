@@ -0,0 +1,169 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from prepare_data.db_handler import DBHandler
+from prepare_data.prediction_log import (
+    PREDICTION_LOG,
+    PREDICTION_LOG_PATH,
+    PREDICTION_LOG_TABLE,
+)
+
+PRODUCTION_TABLES = {
+    'eolienne': 'prod_eolienne',
+    'solaire': 'prod_solaire',
+    'hydro': 'prod_hydro',
+}
+# Points plotted per series at most; longer series are downsampled with LTTB
+MAX_POINTS = int(os.getenv('DASHBOARD_MAX_POINTS', '1500'))
+# Aggregation periods offered by the dashboard (pandas frequencies)
+PERIODS = {'Day': 'D', 'Week': 'W', 'Month': 'MS'}
+
+
+def load_tables(
+    start: date | None = None,
+    end: date | None = None,
+    tables: tuple[str, ...] = tuple(PRODUCTION_TABLES),
+) -> dict[str, pd.DataFrame]:
+    """
+    Fetch the production tables for a date range, all at once: each table is
+    read in its own thread, so the wait is the slowest table, not the sum.
+
+    Parameters:
+        start (date | None): First day included.
+        end (date | None): Last day included.
+        tables (tuple[str, ...]): Tables to read.
+
+    Returns:
+        dict[str, pd.DataFrame]: Rows of each table, `date` parsed.
+    """
+    db = DBHandler()
+    with ThreadPoolExecutor(max_workers=len(tables)) as pool:
+        frames = pool.map(lambda table: db.fetch_range(table, start, end), tables)
+        return {table: _parse_dates(df) for table, df in zip(tables, frames)}
+
+
+def load_predictions(start: date | None = None, end: date | None = None) -> pd.DataFrame:
+    """Served predictions (see `prediction_log`) for a date range."""
+    if PREDICTION_LOG == 'file':
+        if not os.path.exists(PREDICTION_LOG_PATH):
+            return pd.DataFrame()
+        df = _parse_dates(pd.read_json(PREDICTION_LOG_PATH, lines=True, dtype={'date': str}))
+        if start is not None:
+            df = df[df['date'] >= pd.Timestamp(start)]
+        if end is not None:
+            df = df[df['date'] <= pd.Timestamp(end)]
+        return df
+    if PREDICTION_LOG == 'storage':
+        db = DBHandler()
+        if db.backend.is_empty(PREDICTION_LOG_TABLE):
+            return pd.DataFrame()
+        return _parse_dates(db.fetch_range(PREDICTION_LOG_TABLE, start, end))
+    return pd.DataFrame()
+
+
+def _parse_dates(df: pd.DataFrame) -> pd.DataFrame:
+    if df.empty:
+        return df
+    return df.assign(date=pd.to_datetime(df['date']))
+
+
+def aggregate(df: pd.DataFrame, value: str, period: str = 'D') -> pd.DataFrame:
+    """
+    Mean of `value` per period, and per site when the table has several.
+
+    Returns:
+        pd.DataFrame: `date`, `series` (site or table total) and `value` columns.
+    """
+    if df.empty or value not in df.columns:
+        return pd.DataFrame(columns=['date', 'series', 'value'])
+    keys = [pd.Grouper(key='date', freq=period)]
+    if 'site' in df.columns:
+        keys.append('site')
+    out = df.groupby(keys)[value].mean().dropna().reset_index()
+    if 'site' in out.columns:
+        out = out.rename(columns={'site': 'series'})
+    else:
+        out['series'] = value
+    return out.rename(columns={value: 'value'})[['date', 'series', 'value']]
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling: indices of `threshold`
+    points that keep the visual shape of a long series (peaks included).
+
+    The first and last points are kept; every bucket in between keeps the
+    point forming the largest triangle with the point kept in the previous
+    bucket and the mean of the next bucket.
+
+    Parameters:
+        x (np.ndarray): Sorted x values (datetimes are compared as integers).
+        y (np.ndarray): Values.
+        threshold (int): Number of points to keep.
+
+    Returns:
+        np.ndarray: Sorted indices of the kept points.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x).astype(np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # Bucket boundaries of the n - 2 inner points
+    bounds = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = bounds[bucket], bounds[bucket + 1]
+        next_end = bounds[bucket + 2] if bucket + 2 < len(bounds) else n
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+        area = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        kept[bucket + 1] = previous
+    return kept
+
+
+def downsample(df: pd.DataFrame, max_points: int = MAX_POINTS) -> pd.DataFrame:
+    """Keep at most `max_points` points per series (LTTB), peaks preserved."""
+    parts = []
+    for _, series in df.groupby('series', sort=False):
+        series = series.sort_values('date')
+        kept = lttb(series['date'].to_numpy(), series['value'].to_numpy(), max_points)
+        parts.append(series.iloc[kept])
+    return pd.concat(parts, ignore_index=True) if parts else df
+
+
+def prediction_errors(predictions: pd.DataFrame, actuals: pd.DataFrame) -> pd.DataFrame:
+    """
+    Served wind predictions next to the production observed on the same day.
+
+    Returns:
+        pd.DataFrame: `date`, `model`, `production` (predicted), `actual` and `error`.
+    """
+    if predictions.empty or actuals.empty:
+        return pd.DataFrame(columns=['date', 'model', 'production', 'actual', 'error'])
+    wind = predictions[predictions['energy'] == 'eolienne']
+    actual = actuals.groupby('date')['prod_eolienne'].sum().rename('actual')
+    merged = wind.merge(actual, left_on='date', right_index=True)
+    merged['error'] = merged['production'] - merged['actual']
+    return merged[['date', 'model', 'production', 'actual', 'error']]
+
+
+def error_summary(errors: pd.DataFrame) -> pd.DataFrame:
+    """MAE and bias of the served predictions, per model."""
+    if errors.empty:
+        return pd.DataFrame(columns=['model', 'n', 'mae', 'bias'])
+    return (
+        errors.groupby('model')['error']
+        .agg(n='size', mae=lambda error: float(np.abs(error).mean()), bias='mean')
+        .reset_index()
+    )
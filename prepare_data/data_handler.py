@@ -1,27 +1,66 @@
+import os
 from abc import ABC, abstractmethod
 
 import pandas as pd
 
+from prepare_data.profiling import (
+    cached_profile,
+    hash_frame,
+    iter_frame_chunks,
+    profile_chunks,
+)
+
 
 class DataHandler(ABC):
+    # File the raw data is read from, if any (used to fingerprint cached profiles)
+    source_path: str | None = None
+
     @abstractmethod
     def load(self) -> pd.DataFrame:
         self.df = pd.DataFrame()
         return self.df
 
+    def fingerprint(self) -> str:
+        """
+        Identify the loaded data: file path, size and mtime for file sources,
+        content hash otherwise.
+        """
+        if self.source_path is not None and os.path.exists(self.source_path):
+            stat = os.stat(self.source_path)
+            return f'{self.source_path}:{stat.st_size}:{stat.st_mtime_ns}'
+        return hash_frame(self.df)
+
     def explore(self) -> dict:
         if self.df is None:
             raise ValueError('× Dataframe not found')
+        profile = cached_profile(
+            type(self).__name__,
+            self.fingerprint(),
+            lambda: profile_chunks(iter_frame_chunks(self.df)),
+        )
+        columns = profile['columns']
         exploration_info = {
-            'shape': self.df.shape,
-            'columns': self.df.columns.tolist(),
-            'dtypes': self.df.dtypes.to_dict(),
-            'missing': self.df.isna().sum().to_dict(),
+            'shape': (profile['rows'], len(columns)),
+            'columns': list(columns),
+            'dtypes': {name: column['dtype'] for name, column in columns.items()},
+            'missing': {name: column['nulls'] for name, column in columns.items()},
+            'profile': profile,
         }
         print(f'· SHAPE: {exploration_info["shape"]}')
         print(f'· COLUMNS: {exploration_info["columns"]}')
         print(f'· DTYPES: {exploration_info["dtypes"]}')
         print(f'· MISSING: {exploration_info["missing"]}')
+        print(f'· PROFILE{" (cached)" if profile["cached"] else ""}:')
+        for name, column in columns.items():
+            if 'mean' in column:
+                quantiles = column['quantiles']
+                print(
+                    f'  {name}: min={column["min"]:.4g} max={column["max"]:.4g} '
+                    f'mean={column["mean"]:.4g} std={column["variance"] ** 0.5:.4g} '
+                    f'p5={quantiles["0.05"]:.4g} p50={quantiles["0.5"]:.4g} p95={quantiles["0.95"]:.4g}'
+                )
+            elif 'min' in column:
+                print(f'  {name}: min={column["min"]} max={column["max"]}')
         return exploration_info
 
     def clean(self) -> pd.DataFrame:
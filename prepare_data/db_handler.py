@@ -1,25 +1,69 @@
 import os
+import threading
+from collections.abc import Iterator
+from datetime import date
+from typing import TYPE_CHECKING
 
 import pandas as pd
 from dotenv import load_dotenv
-from supabase import Client, create_client
+
+from prepare_data.storage import StorageBackend, SupabaseBackend, get_backend
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 load_dotenv()
 
-url = os.getenv('SUPABASE_URL')
-key = os.getenv('SUPABASE_SECRET_KEY')
+_client: 'Client | None' = None
+_client_lock = threading.Lock()
 
-if not url or not key:
-    raise ValueError(
-        'Error: `SUPABASE_URL` and `SUPABASE_KEY` environment variables are missing'
-    )
 
-supabase: Client = create_client(url, key)
+def get_client() -> 'Client':
+    """
+    Return the shared Supabase client, created on first use.
+
+    The supabase package is only imported here, so modules that never touch
+    the database (the prediction API, for instance) start without it and
+    without credentials.
+
+    Raises:
+        ValueError: If `SUPABASE_URL` or `SUPABASE_SECRET_KEY` is missing.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            url = os.getenv('SUPABASE_URL')
+            key = os.getenv('SUPABASE_SECRET_KEY')
+            if not url or not key:
+                raise ValueError(
+                    'Error: `SUPABASE_URL` and `SUPABASE_KEY` environment variables are missing'
+                )
+            from supabase import create_client
+
+            _client = create_client(url, key)
+    return _client
+
+
+def __getattr__(name: str):
+    # `from prepare_data.db_handler import supabase` keeps working, lazily
+    if name == 'supabase':
+        return get_client()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 class DBHandler:
-    def __init__(self, client: Client) -> None:
-        self.client = client
+    def __init__(
+        self, client: 'Client | None' = None, backend: StorageBackend | None = None
+    ) -> None:
+        """
+        Parameters:
+            client (Client | None): Supabase client; when given, the Supabase backend is used.
+            backend (StorageBackend | None): Storage backend, defaults to the one
+                configured by `STORAGE_BACKEND`.
+        """
+        if backend is None:
+            backend = SupabaseBackend(client) if client is not None else get_backend()
+        self.backend = backend
 
     def insert(self, df_to_insert: pd.DataFrame, table_name: str):
         """
@@ -36,10 +80,8 @@ class DBHandler:
             df_to_insert['date'] = df_to_insert['date'].dt.strftime('%Y-%m-%d')
         records = df_to_insert.to_dict(orient='records')
         try:
-            test_fetch = self.client.table(table_name).select('*').limit(1).execute()
-            if len(test_fetch.data) == 0:
-                response = self.client.table(table_name).insert(records).execute()
-                print(response)
+            if self.backend.is_empty(table_name):
+                self.backend.insert(records, table_name)
             else:
                 raise Exception(
                     f'Table `{table_name}` has to be empty before data insertion'
@@ -48,6 +90,71 @@ class DBHandler:
             print(f'× Database insertion did not happen: {e}')
         return None
 
+    def sync(self, df_to_sync: pd.DataFrame, table_name: str) -> dict:
+        """
+        Upsert a DataFrame into a table, writing only new or changed rows.
+
+        Rows are keyed on `date` (and `site` when present). The stored rows of
+        the incoming date range are read back, and both sides are compared
+        with per-row content hashes, so a daily refresh only transfers the
+        rows that differ. Running it twice with the same data writes nothing.
+
+        Parameters:
+            df_to_sync (pd.DataFrame): Merged data to store.
+            table_name (str): Database table to sync.
+
+        Returns:
+            dict: Number of `inserted`, `updated` and `unchanged` rows.
+        """
+        if df_to_sync.empty:
+            # Nothing new in the ingestion window: no range to read back
+            print(f'· `{table_name}` sync: nothing to write')
+            return {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        keys = ['date'] + (['site'] if 'site' in df_to_sync.columns else [])
+        incoming = df_to_sync.copy()
+        dates = pd.to_datetime(incoming['date'])
+        incoming['date'] = dates.dt.strftime('%Y-%m-%d')
+        stored = self.backend.fetch_range(
+            table_name, dates.min().date(), dates.max().date()
+        )
+
+        values = [column for column in incoming.columns if column not in keys]
+        numeric = {
+            column
+            for column in values
+            if pd.api.types.is_numeric_dtype(incoming[column])
+        }
+        incoming_hash = _row_hashes(incoming, keys, values, numeric)
+        if stored.empty:
+            stored_hash = pd.Series(dtype='uint64')
+        else:
+            stored['date'] = pd.to_datetime(stored['date']).dt.strftime('%Y-%m-%d')
+            # A key column the table lacks yet (`site`) is NULL on stored rows
+            for key in keys:
+                if key not in stored.columns:
+                    stored[key] = None
+            stored_hash = _row_hashes(stored, keys, values, numeric)
+
+        known = incoming_hash.index.isin(stored_hash.index)
+        same = known & (
+            incoming_hash.to_numpy()
+            == stored_hash.reindex(incoming_hash.index).to_numpy()
+        )
+        report = {
+            'inserted': int((~known).sum()),
+            'updated': int((known & ~same).sum()),
+            'unchanged': int(same.sum()),
+        }
+        changed = incoming[~same]
+        if not changed.empty:
+            records = changed.astype(object).where(changed.notna(), None)
+            self.backend.upsert(records.to_dict(orient='records'), table_name, keys)
+        print(
+            f'· `{table_name}` sync: {report["inserted"]} inserted, '
+            f'{report["updated"]} updated, {report["unchanged"]} unchanged'
+        )
+        return report
+
     def fetch(self, table_name: str) -> pd.DataFrame:
         """
         Fetch data from a specific database table and return a DataFrame.
@@ -59,8 +166,93 @@ class DBHandler:
             self.df_fetched (pd.DataFrame): DataFrame made of fetched data from database.
         """
         try:
-            response = self.client.table(table_name).select('*').execute()
-            self.df_fetched = pd.DataFrame(response.model_dump().get('data', {}))
+            self.df_fetched = self.backend.fetch(table_name)
         except Exception as e:
             print(f'× Database fetch failed: {e}')
         return self.df_fetched
+
+    def latest_date(self, table_name: str) -> date | None:
+        """
+        Last day stored in a table.
+
+        Parameters:
+            table_name (str): Database table.
+
+        Returns:
+            date | None: Latest `date`, None when the table is empty.
+        """
+        return self.backend.latest_date(table_name)
+
+    def columns(self, table_name: str) -> list[str]:
+        """
+        Column names of a table.
+
+        Parameters:
+            table_name (str): Database table.
+
+        Returns:
+            list[str]: Columns in storage order, [] when they cannot be known.
+        """
+        return self.backend.columns(table_name)
+
+    def fetch_range(
+        self, table_name: str, start: date | None = None, end: date | None = None
+    ) -> pd.DataFrame:
+        """
+        Fetch rows of a table between two dates, ordered by date.
+
+        Parameters:
+            table_name (str): Database table to fetch data from.
+            start (date | None): First day included, no lower bound if None.
+            end (date | None): Last day included, no upper bound if None.
+
+        Returns:
+            pd.DataFrame: Rows of the range.
+        """
+        return self.backend.fetch_range(table_name, start, end)
+
+    def iter_range(
+        self,
+        table_name: str,
+        start: date | None = None,
+        end: date | None = None,
+        page_size: int = 1000,
+    ) -> Iterator[list[dict]]:
+        """
+        Fetch rows of a table between two dates, page by page, ordered by date.
+
+        Only one page is held in memory (keyset pagination on Supabase, a
+        cursor over the date index on SQLite).
+
+        Parameters:
+            table_name (str): Database table to fetch data from.
+            start (date | None): First day included, no lower bound if None.
+            end (date | None): Last day included, no upper bound if None.
+            page_size (int): Rows per request.
+
+        Returns:
+            Iterator[list[dict]]: Pages of records.
+        """
+        return self.backend.iter_range(table_name, start, end, page_size)
+
+
+def _row_hashes(
+    df: pd.DataFrame, keys: list[str], values: list[str], numeric: set[str]
+) -> pd.Series:
+    """
+    Content hash of each row's `values`, indexed by its keys.
+
+    `numeric` columns are compared as float64 and the others as text, so
+    rows read back from the database hash like the frames they were written from.
+    """
+    columns = {}
+    for column in values:
+        series = df[column] if column in df.columns else pd.Series(None, index=df.index)
+        if column in numeric:
+            columns[column] = pd.to_numeric(series, errors='coerce').astype('float64')
+        else:
+            columns[column] = series.astype(str)
+    hashes = pd.util.hash_pandas_object(pd.DataFrame(columns), index=False)
+    return pd.Series(
+        hashes.to_numpy(), index=pd.MultiIndex.from_frame(df[keys].astype(str))
+    )
@@ -0,0 +1,67 @@
+import csv
+import io
+import json
+from collections.abc import Iterable, Iterator
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def iter_csv(
+    pages: Iterable[list[dict]], columns: list[str] | None = None
+) -> Iterator[str]:
+    """
+    Serialize pages of records as CSV, one chunk per page.
+
+    The header comes from the first row. When no row comes back, it is
+    written from `columns` alone, so an empty range still gives a valid CSV
+    (an empty body if `columns` is not known either).
+
+    Parameters:
+        pages (Iterable[list[dict]]): Pages of database rows.
+        columns (list[str] | None): Table columns, for the header of an empty export.
+
+    Returns:
+        Iterator[str]: Header chunk followed by one chunk per non-empty page.
+    """
+    header = None
+    for page in pages:
+        if not page:
+            continue
+        buffer = io.StringIO()
+        if header is None:
+            header = list(page[0])
+            csv.writer(buffer).writerow(header)
+        csv.DictWriter(buffer, fieldnames=header).writerows(page)
+        yield buffer.getvalue()
+    if header is None and columns:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(columns)
+        yield buffer.getvalue()
+
+
+def iter_ndjson(pages: Iterable[list[dict]]) -> Iterator[str]:
+    """
+    Serialize pages of records as newline-delimited JSON, one chunk per page.
+
+    Parameters:
+        pages (Iterable[list[dict]]): Pages of database rows.
+
+    Returns:
+        Iterator[str]: One chunk per page.
+    """
+    for page in pages:
+        yield ''.join(json.dumps(record) + '\n' for record in page)
+
+
+def iter_export(
+    pages: Iterable[list[dict]], fmt: str, columns: list[str] | None = None
+) -> Iterator[str]:
+    """Serialize pages of records in one of `EXPORT_FORMATS`."""
+    if fmt == 'csv':
+        return iter_csv(pages, columns)
+    if fmt == 'ndjson':
+        return iter_ndjson(pages)
+    raise ValueError(f'× Unknown export format `{fmt}`')
@@ -0,0 +1,185 @@
+import asyncio
+import email.utils
+import os
+import random
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from datetime import date, timedelta
+
+import httpx
+
+HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '10'))
+HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', '3'))
+# Maximum requests per second sent to a single host (0 disables the limit)
+HTTP_RATE_LIMIT = float(os.getenv('HTTP_RATE_LIMIT', '5'))
+HTTP_MAX_CONNECTIONS = int(os.getenv('HTTP_MAX_CONNECTIONS', '10'))
+# Statuses worth another attempt: throttling and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class HTTPClient:
+    def __init__(
+        self,
+        timeout: float = HTTP_TIMEOUT,
+        retries: int = HTTP_RETRIES,
+        backoff: float = 0.5,
+        rate_limit: float = HTTP_RATE_LIMIT,
+        max_connections: int = HTTP_MAX_CONNECTIONS,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        """
+        Async HTTP client with keep-alive pooling, timeouts, retries with
+        jittered exponential backoff and a per-host rate limit.
+
+        The underlying `httpx.AsyncClient` is created on first use and bound
+        to the event loop it runs on: synchronous code should go through
+        `run_sync`, which always uses the same background loop.
+
+        Parameters:
+            timeout (float): Connect/read/write/pool timeout in seconds.
+            retries (int): Extra attempts on transport errors and RETRY_STATUSES.
+            backoff (float): Base delay in seconds, doubled at each attempt.
+            rate_limit (float): Requests per second per host, 0 for no limit.
+            max_connections (int): Size of the connection pool.
+            transport (httpx.AsyncBaseTransport): Custom transport (e.g. `httpx.MockTransport` in tests).
+        """
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.rate_limit = rate_limit
+        self.max_connections = max_connections
+        self.transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self._next_slot: dict[str, float] = {}
+
+    def _session(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                transport=self.transport,
+                follow_redirects=True,
+            )
+        return self._client
+
+    async def _throttle(self, host: str):
+        """Reserve the next free slot for `host` and wait for it."""
+        if not self.rate_limit:
+            return
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + 1 / self.rate_limit
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def _delay(self, attempt: int, response: httpx.Response | None = None) -> float:
+        """Server-requested delay (`Retry-After`) or full-jitter exponential backoff."""
+        if response is not None and 'Retry-After' in response.headers:
+            value = response.headers['Retry-After']
+            if value.isdigit():
+                return float(value)
+            retry_at = email.utils.parsedate_to_datetime(value)
+            return max(0.0, retry_at.timestamp() - time.time())
+        return random.uniform(0, self.backoff * 2**attempt)
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request, retrying transient failures.
+
+        Returns:
+            httpx.Response: Successful response.
+
+        Raises:
+            httpx.HTTPError: Once the retries are exhausted, or on a non-retryable status.
+        """
+        host = httpx.URL(url).host
+        for attempt in range(self.retries + 1):
+            await self._throttle(host)
+            try:
+                response = await self._session().request(method, url, **kwargs)
+            except httpx.TransportError:
+                if attempt == self.retries:
+                    raise
+                delay = self._delay(attempt)
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    response.raise_for_status()
+                    return response
+                delay = self._delay(attempt, response)
+            await asyncio.sleep(delay)
+        raise AssertionError('unreachable')
+
+    async def get_json(self, url: str, params: dict | None = None):
+        return (await self.request('GET', url, params=params)).json()
+
+    async def post_json(self, url: str, json: dict):
+        return (await self.request('POST', url, json=json)).json()
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def split_range(start: date, end: date, days: int) -> list[tuple[date, date]]:
+    """Cut [start, end] into consecutive sub-ranges of at most `days` days."""
+    ranges = []
+    while start <= end:
+        stop = min(end, start + timedelta(days=days - 1))
+        ranges.append((start, stop))
+        start = stop + timedelta(days=1)
+    return ranges
+
+
+async def fetch_ranges(
+    fetch: Callable[[date, date], Awaitable], start: date, end: date, days: int
+) -> list:
+    """
+    Fetch a long date range as concurrent sub-range requests.
+
+    Parameters:
+        fetch (Callable): Coroutine function fetching one sub-range.
+        start (date): First day.
+        end (date): Last day (included).
+        days (int): Maximum length of a sub-range.
+
+    Returns:
+        list: Results of `fetch`, in date order.
+    """
+    return await asyncio.gather(
+        *(fetch(first, last) for first, last in split_range(start, end, days))
+    )
+
+
+_loop: asyncio.AbstractEventLoop | None = None
+_client: HTTPClient | None = None
+_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name='http-client', daemon=True
+            ).start()
+    return _loop
+
+
+def run_sync(coroutine):
+    """Run a coroutine on the shared HTTP event loop and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coroutine, _background_loop()).result()
+
+
+def get_client() -> HTTPClient:
+    """Client shared by all outbound calls, so that connections are reused."""
+    global _client
+    with _lock:
+        if _client is None:
+            _client = HTTPClient()
+    return _client
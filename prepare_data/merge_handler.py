@@ -1,6 +1,168 @@
 from typing import Any
+
+import numpy as np
 import pandas as pd
 
+from prepare_data.resampling import HOURLY_WIND_FEATURES
+
+
+DAY_NS = 86_400 * 10**9
+
+
+def align_frames(
+    frames: dict[str, pd.DataFrame], on: str = 'date', how: str = 'inner'
+) -> tuple[pd.DataFrame, dict]:
+    """
+    Align any number of date-keyed frames in one pass.
+
+    Every frame is first located on the result dates, then each column is
+    gathered once into the result: no intermediate merged frame is built.
+    Daily dates are used directly as array positions (day number minus the
+    first day); other dates fall back to a binary search over sorted keys.
+    Dates must be unique in each frame. Time-zone aware dates are matched
+    as instants and keep their time zone in the result.
+
+    Parameters:
+        frames (dict[str, pd.DataFrame]): Frames to align, by name (columns keep this order).
+        on (str): Date column shared by all frames.
+        how (str): `inner` keeps dates present everywhere, `outer` keeps every date.
+
+    Returns:
+        tuple[pd.DataFrame, dict]: Aligned frame sorted by date, and per-frame
+        diagnostics (rows, dates dropped by an inner join, dates missing from
+        the frame in an outer join).
+    """
+    if how not in ('inner', 'outer'):
+        raise ValueError(f'× Unsupported join `{how}`, use `inner` or `outer`')
+
+    keys = {}
+    zones = set()
+    seen_columns = {on}
+    for name, frame in frames.items():
+        columns = [column for column in frame.columns if column != on]
+        overlap = seen_columns.intersection(columns)
+        if overlap:
+            raise ValueError(f'× Columns {sorted(overlap)} of `{name}` already exist')
+        seen_columns.update(columns)
+        dates = frame[on]
+        zone = getattr(dates.dtype, 'tz', None)
+        zones.add(str(zone) if zone is not None else None)
+        if zone is not None:
+            dates = dates.dt.tz_convert('UTC').dt.tz_localize(None)
+        keys[name] = dates.to_numpy().astype('datetime64[ns]').view('int64')
+    if None in zones and len(zones) > 1:
+        raise ValueError('× Cannot align time-zone aware and naive dates')
+
+    if _is_daily(list(keys.values())):
+        result_keys, rows = _locate_daily(keys, how)
+    else:
+        result_keys, rows = _locate_sorted(keys, how)
+
+    result_dates = result_keys.view('datetime64[ns]')
+    if None not in zones:
+        # Several time zones: the instants are reported in UTC, as pd.merge does
+        zone = zones.pop() if len(zones) == 1 else 'UTC'
+        result_dates = pd.DatetimeIndex(result_dates).tz_localize('UTC').tz_convert(zone)
+    data = {on: result_dates}
+    report = {}
+    for name, frame in frames.items():
+        found = rows[name] >= 0
+        for column in frame.columns:
+            if column != on:
+                data[column] = pd.api.extensions.take(
+                    frame[column].to_numpy(), rows[name], allow_fill=not found.all()
+                )
+        report[name] = {
+            'rows': len(frame),
+            'unmatched': len(frame) - int(found.sum()),
+            'missing': int((~found).sum()),
+        }
+        if report[name]['unmatched']:
+            kept = np.zeros(len(frame), dtype=bool)
+            kept[rows[name][found]] = True
+            unmatched = np.sort(keys[name][~kept])[:10].view('datetime64[ns]')
+            report[name]['unmatched_dates'] = (
+                pd.to_datetime(unmatched).strftime('%Y-%m-%d').tolist()
+            )
+    return pd.DataFrame(data), report
+
+
+def _is_daily(keys: list[np.ndarray]) -> bool:
+    """True when all keys are midnights over a span small enough to index densely."""
+    if any(len(k) == 0 for k in keys):
+        return False
+    if not all((k % DAY_NS == 0).all() for k in keys):
+        return False
+    span = (max(k.max() for k in keys) - min(k.min() for k in keys)) // DAY_NS + 1
+    return span <= 4 * sum(len(k) for k in keys)
+
+
+def _locate_daily(keys: dict[str, np.ndarray], how: str):
+    """Locate rows through one day-indexed lookup array per frame."""
+    days = {name: k // DAY_NS for name, k in keys.items()}
+    first = min(d.min() for d in days.values())
+    span = max(d.max() for d in days.values()) - first + 1
+    lookups = {}
+    for name, d in days.items():
+        lookup = np.full(span, -1, dtype=np.int64)
+        lookup[d - first] = np.arange(len(d))
+        if np.count_nonzero(lookup >= 0) != len(d):
+            raise ValueError(f'× Duplicate dates in `{name}`')
+        lookups[name] = lookup
+    present = [lookup >= 0 for lookup in lookups.values()]
+    combine = np.logical_and if how == 'inner' else np.logical_or
+    slots = np.flatnonzero(combine.reduce(present))
+    result_keys = (slots + first) * DAY_NS
+    return result_keys, {name: lookup[slots] for name, lookup in lookups.items()}
+
+
+def _locate_sorted(keys: dict[str, np.ndarray], how: str):
+    """Locate rows by binary search over each frame's sorted keys."""
+    ordered = {}
+    for name, k in keys.items():
+        order = np.argsort(k, kind='stable')
+        k = k[order]
+        if (k[1:] == k[:-1]).any():
+            raise ValueError(f'× Duplicate dates in `{name}`')
+        ordered[name] = (k, order)
+
+    sorted_keys = [k for k, _ in ordered.values()]
+    if how == 'inner':
+        result_keys = sorted_keys[0]
+        for k in sorted_keys[1:]:
+            positions = np.searchsorted(k, result_keys)
+            result_keys = result_keys[_found(k, result_keys, positions)]
+    else:
+        result_keys = np.unique(np.concatenate(sorted_keys))
+
+    rows = {}
+    for name, (k, order) in ordered.items():
+        if len(k) == 0:
+            rows[name] = np.full(len(result_keys), -1, dtype=np.int64)
+            continue
+        positions = np.searchsorted(k, result_keys)
+        found = _found(k, result_keys, positions)
+        rows[name] = np.where(found, order[np.minimum(positions, len(k) - 1)], -1)
+    return result_keys, rows
+
+
+def _found(sorted_keys: np.ndarray, values: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """Mask of `values` present in `sorted_keys`, given their insertion positions."""
+    found = positions < len(sorted_keys)
+    found[found] = sorted_keys[positions[found]] == values[found]
+    return found
+
+
+def print_merge_report(report: dict):
+    for name, diagnostics in report.items():
+        line = (
+            f'· `{name}`: {diagnostics["rows"]} rows, '
+            f'{diagnostics["unmatched"]} unmatched, {diagnostics["missing"]} missing dates'
+        )
+        if 'unmatched_dates' in diagnostics:
+            line += f' (first unmatched: {", ".join(diagnostics["unmatched_dates"])})'
+        print(line)
+
 
 class DataSpliter:
     def __init__(self, df: pd.DataFrame):
@@ -14,12 +176,15 @@ class DataSpliter:
         return : 2 DataFrames
         """
         print('start splitting.......')
+        # Daily features from hourly data, when the hourly ingestion is enabled
+        hourly = [column for column in HOURLY_WIND_FEATURES if column in self.df.columns]
         self.group_wind = self.df[
             [
                 'date',
                 'wind_gusts_10m_mean',
                 'wind_speed_10m_mean',
                 'winddirection_10m_dominant',
+                *hourly,
             ]
         ]
         self.group_solar = self.df[
@@ -49,19 +214,19 @@ class DataMerger:
         Merge  available DataFrames on a specific column.
         Parameters:
             on_column (str): The column name to merge on (must exist in both DataFrames)
-            how (str): Type of join ('inner')
+            how (str): Type of join ('inner' or 'outer')
         Returns:
             pd.DataFrame: merged dataframe
         """
-        # Start with API DataFrame
-        if self.api_df is not None:
-            self.merge_df = self.api_df.copy()
-        else:
+        if self.api_df is None:
             raise ValueError('API Data is required to start merging !!')
         # Merge with dataframe from csv
         if self.prod_df is not None:
-            self.merge_df = pd.merge(self.merge_df, self.prod_df, on=on_column, how=how)
+            self.merge_df, self.report = align_frames(
+                {'api': self.api_df, 'prod': self.prod_df}, on=on_column, how=how
+            )
             print(self.name)
+            print_merge_report(self.report)
             print(self.merge_df)
 
             return self.merge_df
@@ -79,23 +244,21 @@ class HydroDataMerger(DataMerger):
         self.second_api_df = second_api_df
 
     def merge_data(self, on_column, how: Any = 'inner'):
-        # Start with API DataFrame
-        if self.api_df is not None:
-            self.merge_df = self.api_df.copy()
-        else:
+        if self.api_df is None:
             raise ValueError('API Data is required to start merging !!')
         if self.prod_df is not None:
-            self.merge_df = pd.merge(self.merge_df, self.prod_df, on=on_column, how=how)
-            self.second_api_df = self.second_api_df[
-                ['date', 'rain_sum', 'precipitation_hours']
-            ]
-            self.merge_df = pd.merge(
-                self.merge_df,
-                self.second_api_df,  # pyright: ignore[reportArgumentType]
+            self.merge_df, self.report = align_frames(
+                {
+                    'api': self.api_df,
+                    'prod': self.prod_df,
+                    'weather': self.second_api_df[
+                        [on_column, 'rain_sum', 'precipitation_hours']
+                    ],  # pyright: ignore[reportArgumentType]
+                },
                 on=on_column,
                 how=how,
             )
             print(self.name)
+            print_merge_report(self.report)
             print(self.merge_df)
             return self.merge_df
-
@@ -0,0 +1,195 @@
+import json
+import os
+import queue
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+
+# `storage` (database chosen by STORAGE_BACKEND), `file` (JSON Lines) or `off`
+PREDICTION_LOG = os.getenv('PREDICTION_LOG', 'storage')
+PREDICTION_LOG_TABLE = os.getenv('PREDICTION_LOG_TABLE', 'predictions')
+PREDICTION_LOG_PATH = os.getenv('PREDICTION_LOG_PATH', 'data/predictions.jsonl')
+# Records held in memory at most; beyond that, new records wait or are dropped
+MAX_PENDING = int(os.getenv('PREDICTION_LOG_MAX_PENDING', '10000'))
+# A batch is written once it holds BATCH_SIZE records or is FLUSH_SECONDS old
+BATCH_SIZE = int(os.getenv('PREDICTION_LOG_BATCH_SIZE', '500'))
+FLUSH_SECONDS = float(os.getenv('PREDICTION_LOG_FLUSH_SECONDS', '5'))
+# How long a request may wait for room in a full buffer before its record is dropped
+BLOCK_SECONDS = float(os.getenv('PREDICTION_LOG_BLOCK_SECONDS', '0'))
+
+# Queued by `close` to wake the background thread up
+_WAKE: dict = {}
+
+
+def storage_sink(table: str = PREDICTION_LOG_TABLE) -> Callable[[list[dict]], None]:
+    """Write batches to the storage backend (Supabase or SQLite)."""
+
+    def write(records: list[dict]):
+        from prepare_data.storage import get_backend
+
+        get_backend().append(records, table)
+
+    return write
+
+
+def file_sink(path: str = PREDICTION_LOG_PATH) -> Callable[[list[dict]], None]:
+    """Append batches to a local JSON Lines file."""
+
+    def write(records: list[dict]):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'a') as file:
+            file.writelines(json.dumps(record) + '\n' for record in records)
+
+    return write
+
+
+SINKS = {'storage': storage_sink, 'file': file_sink}
+
+
+class PredictionLogger:
+    def __init__(
+        self,
+        sink: Callable[[list[dict]], None] | None = None,
+        max_pending: int = MAX_PENDING,
+        batch_size: int = BATCH_SIZE,
+        flush_seconds: float = FLUSH_SECONDS,
+        block_seconds: float = BLOCK_SECONDS,
+    ):
+        """
+        Write-behind log of served predictions.
+
+        `log` only appends to a bounded in-memory queue; a background thread
+        writes batches to the sink when BATCH_SIZE records are waiting or the
+        oldest one is FLUSH_SECONDS old, so requests never wait on the
+        database. When the queue is full, `log` waits up to `block_seconds`
+        (back-pressure) and then drops the record, counting it.
+
+        Parameters:
+            sink (Callable): Writes a batch of records, defaults to the `PREDICTION_LOG` sink.
+            max_pending (int): Records held in memory at most.
+            batch_size (int): Records per write.
+            flush_seconds (float): Maximum age of a pending record.
+            block_seconds (float): Wait for room in a full queue before dropping (0: drop at once).
+        """
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.block_seconds = block_seconds
+        self.counts: Counter[str] = Counter()
+        self._counts_lock = threading.Lock()
+        self._queue: queue.Queue[dict] = queue.Queue(maxsize=max_pending)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.sink is not None
+
+    def log(self, record: dict):
+        """Queue a record; never blocks longer than `block_seconds`."""
+        if not self.enabled:
+            return
+        self._ensure_started()
+        try:
+            if self.block_seconds > 0:
+                self._queue.put(record, timeout=self.block_seconds)
+            else:
+                self._queue.put_nowait(record)
+            self._count('queued')
+        except queue.Full:
+            self._count('dropped')
+
+    def _count(self, key: str, n: int = 1):
+        with self._counts_lock:
+            self.counts[key] += n
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name='prediction-log', daemon=True
+                )
+                self._thread.start()
+
+    def _take_batch(self) -> list[dict]:
+        """Wait for a first record, then gather a batch until full or FLUSH_SECONDS old."""
+        batch = []
+        try:
+            batch.append(self._queue.get(timeout=self.flush_seconds))
+        except queue.Empty:
+            return batch
+        deadline = time.monotonic() + self.flush_seconds
+        while len(batch) < self.batch_size and not self._stop.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return [record for record in batch if record is not _WAKE]
+
+    def _write(self, batch: list[dict]):
+        try:
+            self.sink(batch)  # pyright: ignore[reportOptionalCall]
+            self._count('written', len(batch))
+        except Exception as e:
+            self._count('failed', len(batch))
+            print(f'× Could not write {len(batch)} logged predictions: {e}')
+
+    def _drain(self) -> list[dict]:
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                record = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if record is not _WAKE:
+                batch.append(record)
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._take_batch()
+            if batch:
+                self._write(batch)
+
+    def flush(self):
+        """Write every pending record now (from the calling thread)."""
+        while batch := self._drain():
+            self._write(batch)
+
+    def close(self, timeout: float | None = None):
+        """Stop the background thread and write what is left (on shutdown)."""
+        self._stop.set()
+        if self._thread is not None:
+            try:
+                self._queue.put_nowait(_WAKE)
+            except queue.Full:
+                pass
+            self._thread.join(timeout)
+        self.flush()
+
+    def stats(self) -> dict:
+        with self._counts_lock:
+            counts = {key: self.counts[key] for key in ('queued', 'written', 'dropped', 'failed')}
+        return {'pending': self._queue.qsize(), **counts}
+
+
+def make_logger() -> PredictionLogger:
+    """Logger configured by the `PREDICTION_LOG*` environment variables."""
+    if PREDICTION_LOG == 'off':
+        return PredictionLogger(sink=None)
+    if PREDICTION_LOG not in SINKS:
+        raise ValueError(
+            f'× Unknown prediction log `{PREDICTION_LOG}`, use one of {[*SINKS, "off"]}'
+        )
+    return PredictionLogger(sink=SINKS[PREDICTION_LOG]())
+
+
+prediction_logger = make_logger()
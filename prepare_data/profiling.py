@@ -0,0 +1,219 @@
+import hashlib
+import json
+import math
+import os
+from collections.abc import Iterable
+
+import numpy as np
+import pandas as pd
+
+PROFILE_DIR = os.getenv('PROFILE_CACHE_DIR', 'data/.profiles')
+# Capacity of each quantile sketch level
+SKETCH_CAPACITY = 256
+HISTOGRAM_BINS = 10
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+def hash_frame(df: pd.DataFrame) -> str:
+    """SHA-256 fingerprint of a DataFrame content (columns and values)."""
+    digest = hashlib.sha256()
+    digest.update(','.join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class QuantileSketch:
+    """
+    Approximate quantile sketch (KLL-style compactors) in constant memory.
+
+    Values are buffered in level 0. When a level is full it is sorted and
+    every other value is promoted to the next level, where each value stands
+    for twice as many input values. Memory stays around
+    `capacity * log2(n / capacity)` values whatever the number of inputs.
+    """
+
+    def __init__(self, capacity: int = SKETCH_CAPACITY, seed: int = 0):
+        self.capacity = capacity
+        self.levels: list[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray):
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        level = 0
+        while level < len(self.levels):
+            if len(self.levels[level]) >= self.capacity:
+                ordered = np.sort(self.levels[level])
+                promoted = ordered[self._rng.integers(2) :: 2]
+                self.levels[level] = np.empty(0)
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[level + 1] = np.concatenate(
+                    [self.levels[level + 1], promoted]
+                )
+            level += 1
+
+    def _weighted(self) -> tuple[np.ndarray, np.ndarray]:
+        values = np.concatenate(self.levels)
+        weights = np.concatenate(
+            [np.full(len(items), 2.0**level) for level, items in enumerate(self.levels)]
+        )
+        order = np.argsort(values)
+        return values[order], weights[order]
+
+    def quantiles(self, qs: Iterable[float]) -> list[float]:
+        values, weights = self._weighted()
+        if len(values) == 0:
+            return [math.nan for _ in qs]
+        cumulative = np.cumsum(weights) / weights.sum()
+        positions = np.searchsorted(cumulative, np.asarray(list(qs)), side='left')
+        return values[np.minimum(positions, len(values) - 1)].tolist()
+
+    def histogram(
+        self, low: float, high: float, bins: int, total: int
+    ) -> tuple[list, list]:
+        """Approximate histogram, scaled so that counts add up to `total`."""
+        values, weights = self._weighted()
+        counts, edges = np.histogram(
+            values, bins=bins, range=(low, high), weights=weights / weights.sum()
+        )
+        counts = _round_preserving_sum(counts * total)
+        return counts.tolist(), edges.tolist()
+
+
+def _round_preserving_sum(values: np.ndarray) -> np.ndarray:
+    """Round to integers while keeping the exact sum (largest remainders)."""
+    floored = np.floor(values).astype(int)
+    missing = int(round(values.sum())) - floored.sum()
+    floored[np.argsort(floored - values)[:missing]] += 1
+    return floored
+
+
+class ColumnProfile:
+    """Streaming statistics of a single column (Welford mean/variance)."""
+
+    def __init__(self, numeric: bool):
+        self.numeric = numeric
+        self.count = 0
+        self.nulls = 0
+        self.min = None
+        self.max = None
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.sketch = QuantileSketch() if numeric else None
+
+    def update(self, series: pd.Series):
+        self.nulls += int(series.isna().sum())
+        values = series.dropna()
+        n = len(values)
+        if n == 0:
+            return
+        try:
+            low, high = values.min(), values.max()
+            self.min = low if self.min is None else min(self.min, low)
+            self.max = high if self.max is None else max(self.max, high)
+        except TypeError:
+            # Mixed-type object column: no total order
+            pass
+        if not self.numeric:
+            self.count += n
+            return
+        values = values.to_numpy(dtype=np.float64)
+        # Chunked Welford update (Chan et al. parallel combination)
+        chunk_mean = values.mean()
+        chunk_m2 = ((values - chunk_mean) ** 2).sum()
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta**2 * self.count * n / total
+        self.count = total
+        self.sketch.update(values)  # pyright: ignore[reportOptionalMemberAccess]
+
+    def to_dict(self) -> dict:
+        profile = {'count': self.count, 'nulls': self.nulls}
+        if self.count == 0:
+            return profile
+        profile['min'] = _json_value(self.min)
+        profile['max'] = _json_value(self.max)
+        if self.numeric:
+            profile['mean'] = self.mean
+            profile['variance'] = self.m2 / (self.count - 1) if self.count > 1 else 0.0
+            profile['quantiles'] = dict(
+                zip(map(str, QUANTILES), self.sketch.quantiles(QUANTILES))  # pyright: ignore[reportOptionalMemberAccess]
+            )
+            counts, edges = self.sketch.histogram(  # pyright: ignore[reportOptionalMemberAccess]
+                float(self.min), float(self.max), HISTOGRAM_BINS, self.count  # pyright: ignore[reportArgumentType]
+            )
+            profile['histogram'] = {'counts': counts, 'edges': edges}
+        return profile
+
+
+def _json_value(value):
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def profile_chunks(chunks: Iterable[pd.DataFrame]) -> dict:
+    """
+    Profile a dataset in a single streaming pass over its chunks.
+
+    Parameters:
+        chunks (Iterable[pd.DataFrame]): Chunks sharing the same columns.
+
+    Returns:
+        dict: Row count and, per column, dtype, count, nulls, min/max and for
+        numeric columns mean, variance, approximate quantiles and histogram.
+    """
+    columns: dict[str, ColumnProfile] = {}
+    dtypes: dict[str, str] = {}
+    rows = 0
+    for chunk in chunks:
+        rows += len(chunk)
+        for name in chunk.columns:
+            if name not in columns:
+                dtypes[name] = str(chunk[name].dtype)
+                numeric = pd.api.types.is_numeric_dtype(chunk[name]) and not (
+                    pd.api.types.is_bool_dtype(chunk[name])
+                )
+                columns[name] = ColumnProfile(numeric)
+            columns[name].update(chunk[name])
+    return {
+        'rows': rows,
+        'columns': {
+            name: {'dtype': dtypes[name], **profile.to_dict()}
+            for name, profile in columns.items()
+        },
+    }
+
+
+def iter_frame_chunks(df: pd.DataFrame, chunk_size: int = 50_000):
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start : start + chunk_size]
+
+
+def cached_profile(name: str, fingerprint: str, compute) -> dict:
+    """
+    Return the profile cached for `name` if its fingerprint still matches,
+    otherwise compute and store it.
+
+    Parameters:
+        name (str): Dataset name, used as cache file name.
+        fingerprint (str): Identifies the data content (hash, file mtime/size...).
+        compute (Callable[[], dict]): Builds the profile on cache miss.
+
+    Returns:
+        dict: Profile, with a `cached` flag.
+    """
+    path = os.path.join(PROFILE_DIR, f'{name}.json')
+    if os.path.exists(path):
+        with open(path) as file:
+            cached = json.load(file)
+        if cached.get('fingerprint') == fingerprint:
+            return {**cached['profile'], 'cached': True}
+    profile = compute()
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    with open(path, 'w') as file:
+        json.dump({'fingerprint': fingerprint, 'profile': profile}, file, default=str)
+    return {**profile, 'cached': False}
@@ -0,0 +1,377 @@
+import os
+import re
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from datetime import date
+from typing import TYPE_CHECKING
+
+import pandas as pd
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+# `supabase` (default) or `sqlite`
+STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'supabase')
+SQLITE_PATH = os.getenv('SQLITE_PATH', 'data/energy.sqlite')
+
+_TABLE_NAME = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+class StorageBackend(ABC):
+    """Where production tables live. Dates are exchanged as `YYYY-MM-DD` strings."""
+
+    @abstractmethod
+    def is_empty(self, table_name: str) -> bool:
+        """Whether a table holds no rows."""
+
+    @abstractmethod
+    def insert(self, records: list[dict], table_name: str):
+        """Append records to a table."""
+
+    @abstractmethod
+    def append(self, records: list[dict], table_name: str):
+        """Append log records (no unique date: several rows may share a day)."""
+
+    @abstractmethod
+    def upsert(self, records: list[dict], table_name: str, keys: list[str]):
+        """Insert records, replacing the stored rows that share their `keys`."""
+
+    @abstractmethod
+    def fetch(self, table_name: str) -> pd.DataFrame:
+        """Return a whole table."""
+
+    @abstractmethod
+    def latest_date(self, table_name: str) -> date | None:
+        """Last day stored in a table, None when it is empty."""
+
+    @abstractmethod
+    def columns(self, table_name: str) -> list[str]:
+        """Column names of a table, in storage order ([] when unknown)."""
+
+    @abstractmethod
+    def iter_range(
+        self,
+        table_name: str,
+        start: date | None = None,
+        end: date | None = None,
+        page_size: int = 1000,
+    ) -> Iterator[list[dict]]:
+        """
+        Rows of a table between two dates (both included), page by page,
+        ordered by date.
+        """
+
+    def fetch_range(
+        self, table_name: str, start: date | None = None, end: date | None = None
+    ) -> pd.DataFrame:
+        """Rows of a table between two dates (both included), ordered by date."""
+        return pd.DataFrame(
+            [row for page in self.iter_range(table_name, start, end) for row in page]
+        )
+
+
+class SupabaseBackend(StorageBackend):
+    def __init__(self, client: 'Client | None' = None):
+        """
+        Tables stored in Supabase (PostgreSQL, over HTTP).
+
+        Parameters:
+            client (Client | None): Supabase client, defaults to the shared one (created on first query).
+        """
+        self._client = client
+
+    @property
+    def client(self) -> 'Client':
+        if self._client is None:
+            from prepare_data.db_handler import get_client
+
+            self._client = get_client()
+        return self._client
+
+    def is_empty(self, table_name: str) -> bool:
+        return not self.client.table(table_name).select('*').limit(1).execute().data
+
+    def insert(self, records: list[dict], table_name: str):
+        print(self.client.table(table_name).insert(records).execute())
+
+    def append(self, records: list[dict], table_name: str):
+        self.client.table(table_name).insert(records).execute()
+
+    def upsert(self, records: list[dict], table_name: str, keys: list[str]):
+        # Requires a unique constraint on `keys` in the database
+        self.client.table(table_name).upsert(
+            records, on_conflict=','.join(keys)
+        ).execute()
+
+    def fetch(self, table_name: str) -> pd.DataFrame:
+        response = self.client.table(table_name).select('*').execute()
+        return pd.DataFrame(response.model_dump().get('data', {}))
+
+    def latest_date(self, table_name: str) -> date | None:
+        rows = (
+            self.client.table(table_name)
+            .select('date')
+            .order('date', desc=True)
+            .limit(1)
+            .execute()
+            .data
+        )
+        return date.fromisoformat(str(rows[0]['date'])[:10]) if rows else None
+
+    def columns(self, table_name: str) -> list[str]:
+        # PostgREST exposes no schema: the columns are read from a stored row
+        rows = self.client.table(table_name).select('*').limit(1).execute().data
+        return list(rows[0]) if rows else []
+
+    def iter_range(
+        self,
+        table_name: str,
+        start: date | None = None,
+        end: date | None = None,
+        page_size: int = 1000,
+    ) -> Iterator[list[dict]]:
+        # Keyset pagination on (date, tiebreak): each page starts after the
+        # last row of the previous one, so every request costs the same.
+        # Several rows may share a date (one per site, prediction logs): they
+        # are ordered by `id`, or `site`, so a page may end within a date
+        probe = self.client.table(table_name).select('*').limit(1).execute().data
+        if not probe:
+            return
+        tiebreak = next((column for column in ('id', 'site') if column in probe[0]), None)
+        last = None
+        while True:
+            query = self.client.table(table_name).select('*').order('date')
+            if tiebreak is not None:
+                query = query.order(tiebreak)
+            if start is not None:
+                query = query.gte('date', start.isoformat())
+            if end is not None:
+                query = query.lte('date', end.isoformat())
+            if last is not None:
+                query = _after(query, tiebreak, *last)
+            page = query.limit(page_size).execute().data
+            if not page:
+                return
+            yield page
+            if len(page) < page_size:
+                return
+            last = (page[-1]['date'], page[-1].get(tiebreak) if tiebreak else None)
+
+
+def _quote(value) -> str:
+    """PostgREST filter value, quoted so commas and parentheses are kept."""
+    text = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{text}"'
+
+
+def _after(query, tiebreak: str | None, last_date: str, last_key):
+    """Filter `query` to the rows after (`last_date`, `last_key`) in keyset order."""
+    if tiebreak is None or last_key is None:
+        # Dates are unique (or the tiebreak is NULL, sorted last): next date
+        return query.gt('date', last_date)
+    return query.or_(
+        f'date.gt.{_quote(last_date)},'
+        f'and(date.eq.{_quote(last_date)},{tiebreak}.gt.{_quote(last_key)})'
+    )
+
+
+class SQLiteBackend(StorageBackend):
+    def __init__(self, path: str = SQLITE_PATH):
+        """
+        Tables stored in a local SQLite file, with a unique index on `date`
+        (and `site` for tables holding several sites).
+
+        Runs offline, and range queries are served by the date index without
+        any network round trip. Each thread gets its own connection.
+
+        Parameters:
+            path (str): Database file.
+        """
+        self.path = path
+        self._local = threading.local()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            # Generators (export streaming) may be resumed from another thread
+            connection = self._local.connection = sqlite3.connect(
+                self.path, check_same_thread=False
+            )
+        return connection
+
+    @staticmethod
+    def _table(table_name: str) -> str:
+        if not _TABLE_NAME.match(table_name):
+            raise ValueError(f'× Invalid table name `{table_name}`')
+        return f'"{table_name}"'
+
+    def _exists(self, table_name: str) -> bool:
+        return (
+            self.connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (table_name,),
+            ).fetchone()
+            is not None
+        )
+
+    def is_empty(self, table_name: str) -> bool:
+        table = self._table(table_name)
+        if not self._exists(table_name):
+            return True
+        return self.connection.execute(f'SELECT 1 FROM {table} LIMIT 1').fetchone() is None
+
+    @staticmethod
+    def _keys(records: list[dict]) -> list[str]:
+        return ['date'] + (['site'] if records and 'site' in records[0] else [])
+
+    def _create(self, records: list[dict], table_name: str, keys: list[str]):
+        self._table(table_name)
+        with self.connection:
+            pd.DataFrame(records).to_sql(
+                table_name, self.connection, if_exists='append', index=False
+            )
+            self._unique_index(table_name, keys)
+
+    def _unique_index(self, table_name: str, keys: list[str]):
+        table = self._table(table_name)
+        if keys != ['date']:
+            # Rows keyed by several columns share dates: the date-only index goes
+            self.connection.execute(f'DROP INDEX IF EXISTS "{table_name}_date"')
+        key_names = ', '.join(f'"{key}"' for key in keys)
+        self.connection.execute(
+            f'CREATE UNIQUE INDEX IF NOT EXISTS "{table_name}_{"_".join(keys)}" '
+            f'ON {table} ({key_names})'
+        )
+
+    def _add_columns(self, table_name: str, records: list[dict]):
+        """Add the columns of `records` the table does not have yet."""
+        table = self._table(table_name)
+        existing = set(self.columns(table_name))
+        for column in records[0]:
+            if column in existing:
+                continue
+            self._table(column)
+            value = next(
+                (record[column] for record in records if record[column] is not None), None
+            )
+            if isinstance(value, (bool, int)):
+                kind = 'INTEGER'
+            elif isinstance(value, float):
+                kind = 'REAL'
+            else:
+                kind = 'TEXT'
+            self.connection.execute(f'ALTER TABLE {table} ADD COLUMN "{column}" {kind}')
+
+    def insert(self, records: list[dict], table_name: str):
+        self._create(records, table_name, self._keys(records))
+        print(f'· {len(records)} rows written to `{table_name}` ({self.path})')
+
+    def append(self, records: list[dict], table_name: str):
+        self._table(table_name)
+        with self.connection:
+            pd.DataFrame(records).to_sql(
+                table_name, self.connection, if_exists='append', index=False
+            )
+
+    def upsert(self, records: list[dict], table_name: str, keys: list[str]):
+        table = self._table(table_name)
+        if not records:
+            return
+        if not self._exists(table_name):
+            self._create(records, table_name, keys)
+            print(f'· {len(records)} rows written to `{table_name}` ({self.path})')
+            return
+        columns = list(records[0])
+        for column in columns:
+            self._table(column)
+        names = ', '.join(f'"{column}"' for column in columns)
+        updates = ', '.join(
+            f'"{column}" = excluded."{column}"' for column in columns if column not in keys
+        )
+        action = f'DO UPDATE SET {updates}' if updates else 'DO NOTHING'
+        key_names = ', '.join(f'"{key}"' for key in keys)
+        with self.connection:
+            self._add_columns(table_name, records)
+            self._unique_index(table_name, keys)
+            self.connection.executemany(
+                f'INSERT INTO {table} ({names}) VALUES ({", ".join("?" * len(columns))}) '
+                f'ON CONFLICT ({key_names}) {action}',
+                [tuple(record[column] for column in columns) for record in records],
+            )
+
+    def fetch(self, table_name: str) -> pd.DataFrame:
+        return self.fetch_range(table_name)
+
+    def latest_date(self, table_name: str) -> date | None:
+        table = self._table(table_name)
+        if not self._exists(table_name):
+            return None
+        (latest,) = self.connection.execute(f'SELECT MAX(date) FROM {table}').fetchone()
+        return date.fromisoformat(str(latest)[:10]) if latest is not None else None
+
+    def columns(self, table_name: str) -> list[str]:
+        table = self._table(table_name)
+        return [row[1] for row in self.connection.execute(f'PRAGMA table_info({table})')]
+
+    def _where(self, start: date | None, end: date | None) -> tuple[str, list]:
+        clauses, params = [], []
+        if start is not None:
+            clauses.append('date >= ?')
+            params.append(start.isoformat())
+        if end is not None:
+            clauses.append('date <= ?')
+            params.append(end.isoformat())
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+    def fetch_range(
+        self, table_name: str, start: date | None = None, end: date | None = None
+    ) -> pd.DataFrame:
+        table = self._table(table_name)
+        if not self._exists(table_name):
+            return pd.DataFrame()
+        where, params = self._where(start, end)
+        return pd.read_sql_query(
+            f'SELECT * FROM {table}{where} ORDER BY date',
+            self.connection,
+            params=params,
+        )
+
+    def iter_range(
+        self,
+        table_name: str,
+        start: date | None = None,
+        end: date | None = None,
+        page_size: int = 1000,
+    ) -> Iterator[list[dict]]:
+        table = self._table(table_name)
+        if not self._exists(table_name):
+            return
+        where, params = self._where(start, end)
+        cursor = self.connection.execute(
+            f'SELECT * FROM {table}{where} ORDER BY date', params
+        )
+        columns = [column[0] for column in cursor.description]
+        while page := cursor.fetchmany(page_size):
+            yield [dict(zip(columns, row)) for row in page]
+
+
+BACKENDS = {'supabase': SupabaseBackend, 'sqlite': SQLiteBackend}
+_backend: StorageBackend | None = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> StorageBackend:
+    """Backend chosen by the `STORAGE_BACKEND` environment variable, shared by all handlers."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            if STORAGE_BACKEND not in BACKENDS:
+                raise ValueError(
+                    f'× Unknown storage backend `{STORAGE_BACKEND}`, use one of {list(BACKENDS)}'
+                )
+            _backend = BACKENDS[STORAGE_BACKEND]()
+    return _backend
@@ -0,0 +1,143 @@
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import date, timedelta
+
+import pandas as pd
+
+from prepare_data.http_client import HTTPClient, get_client, run_sync
+
+WIND_VARIABLES = [
+    'wind_gusts_10m_mean',
+    'wind_speed_10m_mean',
+    'winddirection_10m_dominant',
+]
+
+
+class WeatherSource(ABC):
+    @abstractmethod
+    def fetch_daily(self, start: date, end: date) -> pd.DataFrame:
+        """
+        Return daily weather between two dates (both included).
+
+        Parameters:
+            start (date): First day.
+            end (date): Last day.
+
+        Returns:
+            pd.DataFrame: One row per day, a `date` column and one column per variable.
+        """
+
+
+class OpenMeteoForecastSource(WeatherSource):
+    def __init__(
+        self,
+        base_url: str | None = None,
+        variables: list[str] | None = None,
+        latitude: str = '43.62505',
+        longitude: str = '3.862038',
+        timezone: str = 'Europe/Berlin',
+        client: HTTPClient | None = None,
+    ):
+        """
+        Daily forecasts from an Open-Meteo compatible API.
+
+        Parameters:
+            base_url (str): Forecast endpoint, defaults to `OPEN_METEO_FORECAST_URL` or the public API.
+            variables (list[str]): Daily variables to request, defaults to the wind features.
+            client (HTTPClient): HTTP client, defaults to the shared pooled client.
+        """
+        self.base_url = base_url or os.getenv(
+            'OPEN_METEO_FORECAST_URL', 'https://api.open-meteo.com/v1/forecast'
+        )
+        self.variables = variables or WIND_VARIABLES
+        self.latitude = latitude
+        self.longitude = longitude
+        self.timezone = timezone
+        self.client = client or get_client()
+
+    def fetch_daily(self, start: date, end: date) -> pd.DataFrame:
+        params = {
+            'latitude': self.latitude,
+            'longitude': self.longitude,
+            'timezone': self.timezone,
+            'start_date': start.isoformat(),
+            'end_date': end.isoformat(),
+            'daily': self.variables,
+        }
+        data = run_sync(self.client.get_json(self.base_url, params=params))
+        df = pd.DataFrame(data.get('daily', {}))
+        return df.rename(columns={'time': 'date'})
+
+
+class CachedWeatherSource(WeatherSource):
+    def __init__(self, source: WeatherSource, ttl: float = 3600):
+        """
+        Per-day cache in front of another weather source.
+
+        Only the days missing from the cache (or older than `ttl` seconds) are
+        requested, one call per run of consecutive missing days. Expired days
+        are dropped whenever the cache is written, so it does not grow with
+        every date ever asked about.
+
+        Parameters:
+            source (WeatherSource): Source used on cache misses.
+            ttl (float): Seconds after which a cached day is fetched again.
+        """
+        self.source = source
+        self.ttl = ttl
+        self._cache: dict[date, tuple[float, dict]] = {}
+        self._lock = threading.Lock()
+
+    def fetch_daily(self, start: date, end: date) -> pd.DataFrame:
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        now = time.monotonic()
+        with self._lock:
+            missing = [
+                day
+                for day in days
+                if day not in self._cache or now - self._cache[day][0] > self.ttl
+            ]
+        for first, last in _runs(missing):
+            fetched = self.source.fetch_daily(first, last)
+            fetched_dates = pd.to_datetime(fetched['date']).dt.date
+            with self._lock:
+                for day, row in zip(
+                    fetched_dates, fetched.drop(columns='date').to_dict('records')
+                ):
+                    self._cache[day] = (now, row)
+        if missing:
+            with self._lock:
+                self._evict(now, keep=set(days))
+        with self._lock:
+            rows = [
+                {'date': day.isoformat(), **self._cache[day][1]}
+                for day in days
+                if day in self._cache
+            ]
+        return pd.DataFrame(rows)
+
+    def _evict(self, now: float, keep: set[date]):
+        # Days of the current request stay, even when the source returned old data
+        for day in [
+            day
+            for day, (fetched_at, _) in self._cache.items()
+            if now - fetched_at > self.ttl and day not in keep
+        ]:
+            del self._cache[day]
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+def _runs(days: list[date]) -> list[tuple[date, date]]:
+    """First and last day of each run of consecutive days (`days` sorted)."""
+    runs = []
+    for day in days:
+        if runs and day == runs[-1][1] + timedelta(days=1):
+            runs[-1] = (runs[-1][0], day)
+        else:
+            runs.append((day, day))
+    return runs
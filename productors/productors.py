@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 
 import pandas as pd
-from prepare_data.db_handler import DBHandler, supabase
+from prepare_data.db_handler import DBHandler
 
 
 class Producteur(ABC):
@@ -10,7 +10,7 @@ class Producteur(ABC):
 
     def load_data(self, start=None, end=None):
         # Fetch all data from the database
-        self.df = DBHandler(client=supabase).fetch(table_name=self.table_name)
+        self.df = DBHandler().fetch(table_name=self.table_name)
         self.df['date'] = pd.to_datetime(self.df['date']).dt.date
         # If start and end are provided, apply filter
         if start is not None and end is not None:
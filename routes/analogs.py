@@ -0,0 +1,47 @@
+from fastapi import APIRouter, HTTPException, Query
+from models.analogs import AnalogsUnavailable, analog_index
+from pydantic import BaseModel
+
+router = APIRouter(prefix="/analogs", tags=["Analogs"])
+
+
+class Analog(BaseModel):
+    date: str
+    distance: float
+    site: str | int | None = None
+    wind_speed_10m_mean: float
+    wind_gusts_10m_mean: float
+    winddirection_10m_dominant: float
+    production: float
+
+
+@router.get("/", response_model=list[Analog], response_model_exclude_none=True)
+def analogs(
+    wind_speed_10m_mean: float,
+    wind_gusts_10m_mean: float,
+    winddirection_10m_dominant: float,
+    k: int = Query(5, ge=1, le=100),
+):
+    """
+    Historical days whose weather most resembles the given one
+
+    Parameters:
+        wind_speed_10m_mean (float): mean wind speed of the queried day
+        wind_gusts_10m_mean (float): mean wind gusts of the queried day
+        winddirection_10m_dominant (float): dominant wind direction (degrees)
+        k (int): number of days returned (default 5)
+
+    Returns:
+        list[Analog]: nearest days first, with their weather and observed production
+    """
+    try:
+        return analog_index.query(
+            {
+                "wind_speed_10m_mean": wind_speed_10m_mean,
+                "wind_gusts_10m_mean": wind_gusts_10m_mean,
+                "winddirection_10m_dominant": winddirection_10m_dominant,
+            },
+            k=k,
+        )
+    except AnalogsUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e).lstrip("× "))
@@ -0,0 +1,42 @@
+from datetime import date
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from prepare_data.db_handler import DBHandler
+from prepare_data.export_handler import EXPORT_FORMATS, iter_export
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+
+@router.get("/{table}")
+def export(
+    table: Literal["eolienne", "solaire", "hydro"],
+    start: date | None = None,
+    end: date | None = None,
+    format: Literal["csv", "ndjson"] = "csv",
+):
+    """
+    Stream production rows of a table for a date range
+
+    Parameters:
+        table (str): eolienne, solaire or hydro
+        start (date): first day included (optional)
+        end (date): last day included (optional)
+        format (str): csv or ndjson
+
+    Returns:
+        StreamingResponse: rows pulled page by page from the database (a CSV
+        of an empty range holds only the header)
+    """
+    if start is not None and end is not None and start > end:
+        raise HTTPException(status_code=422, detail="End date cannot be before start date")
+    db = DBHandler()
+    pages = db.iter_range(table, start=start, end=end)
+    # An empty range still exports the CSV header
+    columns = db.columns(table) if format == "csv" else None
+    return StreamingResponse(
+        iter_export(pages, format, columns),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{table}.{format}"'},
+    )
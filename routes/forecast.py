@@ -0,0 +1,72 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException
+from models.artifacts import FlatForest
+from models.features import WIND_FEATURES
+from prepare_data.weather_sources import (
+    CachedWeatherSource,
+    OpenMeteoForecastSource,
+    WeatherSource,
+)
+from pydantic import BaseModel
+from routes.predict import Output, get_model
+
+router = APIRouter(prefix="/forecast", tags=["Forecast"])
+
+# Open-Meteo serves up to 16 days of daily forecasts
+MAX_FORECAST_DAYS = 16
+
+_weather_source: WeatherSource | None = None
+
+
+def get_weather_source() -> WeatherSource:
+    """Shared cached forecast source (override this dependency to plug another one)."""
+    global _weather_source
+    if _weather_source is None:
+        _weather_source = CachedWeatherSource(OpenMeteoForecastSource())
+    return _weather_source
+
+
+class Forecast(BaseModel):
+    start: date
+    end: date
+    predictions: list[Output]
+
+
+@router.get("/", response_model=Forecast, response_model_exclude_none=True)
+def forecast(
+    start: date,
+    end: date,
+    model: FlatForest = Depends(get_model),
+    source: WeatherSource = Depends(get_weather_source),
+):
+    """
+    Predict production for every day of a range from forecast weather
+
+    Parameters:
+        start (date): first day of the range
+        end (date): last day of the range (included)
+
+    Returns:
+        Forecast: start, end and one prediction per day with available weather
+    """
+    if end < start:
+        raise HTTPException(status_code=422, detail="End date cannot be before start date")
+    if (end - start).days + 1 > MAX_FORECAST_DAYS:
+        raise HTTPException(
+            status_code=422, detail=f"Range is limited to {MAX_FORECAST_DAYS} days"
+        )
+
+    weather = source.fetch_daily(start, end)
+    if weather.empty:
+        return Forecast(start=start, end=end, predictions=[])
+    weather = weather.dropna()
+    predictions = model.predict(WIND_FEATURES.transform(weather))
+    return Forecast(
+        start=start,
+        end=end,
+        predictions=[
+            Output(date=day, production=prediction)
+            for day, prediction in zip(weather["date"], predictions)
+        ],
+    )
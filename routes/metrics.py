@@ -0,0 +1,39 @@
+from fastapi import APIRouter
+from models.drift import drift_monitor
+from models.registry import registry
+from prepare_data.prediction_log import prediction_logger
+from routes.shedding import shedder
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("/")
+def metrics():
+    """
+    Serving metrics of this worker
+
+    Returns:
+        dict: load shedding state (in-flight requests, recent p95, requests
+        answered by the primary or the fallback model), prediction log
+        counters (pending, written, dropped) and the loaded models
+    """
+    return {
+        "load_shedding": shedder.stats(),
+        "prediction_log": prediction_logger.stats(),
+        "models": {"loaded": registry.loaded(), "used_bytes": registry.used_bytes},
+    }
+
+
+@router.get("/drift")
+def drift():
+    """
+    Drift of the inputs received since the served model was loaded
+
+    Returns:
+        dict: per energy and served model (random_forest, xgboost,
+        linear_fallback), the model version and for each raw input its
+        request count, PSI and KS against that model's training profile and
+        a status (stable below 0.1 PSI, moderate below 0.25, significant
+        above, insufficient_data before 100 requests)
+    """
+    return drift_monitor.scores()
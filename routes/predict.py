@@ -1,46 +1,293 @@
-import joblib
+import json
+import time
+from datetime import date, datetime
+from typing import Annotated, Literal
+
+import numpy as np
 import pandas as pd
-from fastapi import APIRouter
-from models.data_preparation import transform_date
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Query
+from models.artifacts import BoosterArtifact, FlatForest, LinearArtifact
+from models.drift import drift_monitor
+from models.energies import ENERGIES, WIND, Energy
+from models.registry import registry
+from prepare_data.prediction_log import prediction_logger
+from pydantic import AfterValidator, BaseModel
+from routes.shedding import shedder
 
 router = APIRouter(prefix="/predict", tags=["Predict"])
 
+Backend = Literal["random_forest", "xgboost"]
+# Name reported in responses answered by the fallback model
+FALLBACK = "linear_fallback"
+
+
+def get_energy_model(
+    energy: Energy, backend: Backend = "random_forest"
+) -> FlatForest | BoosterArtifact:
+    """
+    Return the published model of an energy, loaded lazily by the registry.
+
+    Forest arrays are memory-mapped, so every worker shares the same page-cached copy.
+    The artifact must have been trained on the features built by the energy pipeline.
+    """
+    name = energy.xgb_artifact if backend == "xgboost" else energy.artifact
+    try:
+        model = registry.get(name)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=503,
+            detail=f"No trained {backend} model published for `{energy.name}`",
+        )
+    energy.features.check(model.features)
+    return model
+
+
+def serve_model(
+    energy: Energy, backend: Backend = "random_forest", rows: int = 1
+) -> tuple[FlatForest | BoosterArtifact | LinearArtifact, str]:
+    """
+    Pick the model answering a request: the requested one, or the linear
+    fallback when the API is under latency pressure (see `routes.shedding`).
+
+    Without a published fallback, the requested model keeps answering.
+    Single-row requests answered by the requested model feed the shedding
+    p95, minus the time spent loading the model.
+
+    Parameters:
+        energy (Energy): energy predicted
+        backend (str): requested backend
+        rows (int): rows predicted by the request
+
+    Returns:
+        tuple: model and the name reported in the response
+    """
+    if shedder.should_shed():
+        try:
+            model = registry.get(energy.fallback_artifact)
+        except FileNotFoundError:
+            shedder.record("fallback_unavailable")
+        else:
+            energy.features.check(model.features)
+            shedder.record("shed")
+            return model, FALLBACK
+    shedder.record("primary")
+    loading = time.perf_counter()
+    model = get_energy_model(energy, backend)
+    if rows == 1:
+        shedder.sample(excluded_ms=(time.perf_counter() - loading) * 1000)
+    return model, backend
+
+
+def get_model() -> FlatForest:
+    """Return the wind model served by `/predict`."""
+    return get_energy_model(WIND)
+
+
+def check_iso_date(value: str) -> str:
+    """Reject dates the feature pipelines cannot parse (422 instead of a 500)."""
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"`{value}` is not an ISO date (YYYY-MM-DD)")
+    return value
+
+
+IsoDate = Annotated[str, AfterValidator(check_iso_date)]
+
 
 class Input(BaseModel):
-    date: str
+    date: IsoDate
     wind_gusts_10m_mean: float
     wind_speed_10m_mean: float
     winddirection_10m_dominant: int
 
 
+class SolarInput(BaseModel):
+    date: IsoDate
+    daylight_duration: float
+    sunshine_duration: float
+    cloud_cover_mean: float
+
+
+class HydroInput(BaseModel):
+    date: IsoDate
+    resultat_obs_elab: float
+    rain_sum: float
+    precipitation_hours: float
+
+
+INPUTS = {
+    "eolienne": Input,
+    "solaire": SolarInput,
+    "hydro": HydroInput,
+}
+
+
 class Output(BaseModel):
     date: str
     production: float
+    # Only filled when quantiles are requested, e.g. {"p10": ..., "p90": ...}
+    quantiles: dict[str, float] | None = None
+    # Model that answered: the requested backend, or `linear_fallback` under load
+    model: str | None = None
 
 
-@router.post("/", response_model=Output)
-def predict(data: Input):
+def run_model(
+    model: FlatForest | BoosterArtifact | LinearArtifact, X, quantiles: list[float]
+) -> tuple[np.ndarray, list[dict[str, float] | None]]:
+    """
+    Predict rows, with the requested quantiles of the per-tree predictions.
+
+    Without quantiles this is the plain point prediction. With quantiles, the
+    mean and every quantile come from the same pass over the forest.
+
+    Parameters:
+        model (FlatForest | BoosterArtifact | LinearArtifact): served model
+        X: feature rows
+        quantiles (list[float]): quantiles between 0 and 1, may be empty
+
+    Returns:
+        tuple: predictions, and for each row its quantiles by name (None if not requested)
+    """
+    if not quantiles:
+        return model.predict(X), [None] * len(X)
+    if not isinstance(model, FlatForest):
+        raise HTTPException(
+            status_code=422, detail="Quantiles are only available with the random_forest backend"
+        )
+    if any(not 0 <= q <= 1 for q in quantiles):
+        raise HTTPException(status_code=422, detail="Quantiles must be between 0 and 1")
+    predictions, values = model.predict_quantiles(X, quantiles)
+    names = [f"p{q * 100:g}" for q in quantiles]
+    return predictions, [dict(zip(names, map(float, row))) for row in values.T]
+
+
+def log_predictions(
+    energy: Energy,
+    served_by: str,
+    model: FlatForest | BoosterArtifact | LinearArtifact,
+    items: list[BaseModel],
+    predictions,
+    started: float,
+):
+    """
+    Queue one record per served prediction (inputs, output, model version,
+    latency) for later accuracy tracking; written behind the response.
+    The inputs also feed the drift histograms of the served model.
+    """
+    latency_ms = round((time.perf_counter() - started) * 1000, 3)
+    logged_at = datetime.now().isoformat(timespec="milliseconds")
+    rows = [vars(item) for item in items]
+    drift_monitor.observe(energy.name, served_by, model.metadata, rows)
+    for item, row, prediction in zip(items, rows, predictions):
+        inputs = {key: value for key, value in row.items() if key != "date"}
+        prediction_logger.log({
+            "logged_at": logged_at,
+            "date": item.date,  # pyright: ignore[reportAttributeAccessIssue]
+            "energy": energy.name,
+            "model": served_by,
+            "model_version": model.metadata.get("version"),
+            "inputs": json.dumps(inputs),
+            "production": float(prediction),
+            "latency_ms": latency_ms,
+            "batch_size": len(items),
+        })
+
+
+@router.post("/", response_model=Output, response_model_exclude_none=True)
+def predict(
+    data: Input,
+    backend: Backend = "random_forest",
+    quantiles: list[float] = Query([]),
+):
     """
     Predict production for a specific day
 
     Parameters:
         data (Input): date, wind_gusts_10m_mean, wind_speed_10m_mean, winddirection_10m_dominant
+        backend (str): random_forest (default) or xgboost
+        quantiles (list[float]): optional quantiles of the trees' predictions, e.g. ?quantiles=0.1&quantiles=0.9
 
     Returns:
-        Output: date, production (predicted)
-    """
-    model = joblib.load("./models/random_forest_model.pkl")
-    df = pd.DataFrame(
-        [
-            {
-                "date": data.date,
-                "wind_gusts_10m_mean": data.wind_gusts_10m_mean,
-                "wind_speed_10m_mean": data.wind_speed_10m_mean,
-                "winddirection_10m_dominant": data.winddirection_10m_dominant,
-            }
-        ]
+        Output: date, production (predicted), the requested quantiles and the model that answered
+    """
+    started = time.perf_counter()
+    model, served_by = serve_model(WIND, backend)
+    if served_by == FALLBACK:
+        quantiles = []
+    row = WIND.features.transform_one(date.fromisoformat(data.date), vars(data))
+    predictions, intervals = run_model(model, row, quantiles)
+    log_predictions(WIND, served_by, model, [data], predictions, started)
+    return Output(
+        date=data.date, production=predictions[0], quantiles=intervals[0], model=served_by
+    )
+
+
+@router.post("/batch", response_model=list[Output], response_model_exclude_none=True)
+def predict_batch(
+    data: list[Input],
+    backend: Backend = "random_forest",
+    quantiles: list[float] = Query([]),
+):
+    """
+    Predict production for several days in a single model call
+
+    Parameters:
+        data (list[Input]): one entry per day
+        backend (str): random_forest (default) or xgboost
+        quantiles (list[float]): optional quantiles of the trees' predictions, e.g. ?quantiles=0.1&quantiles=0.9
+
+    Returns:
+        list[Output]: date, production (predicted), the requested quantiles and the model that answered for each entry
+    """
+    if not data:
+        return []
+    started = time.perf_counter()
+    model, served_by = serve_model(WIND, backend, rows=len(data))
+    if served_by == FALLBACK:
+        quantiles = []
+    df = pd.DataFrame([vars(item) for item in data])
+    predictions, intervals = run_model(model, WIND.features.transform(df), quantiles)
+    log_predictions(WIND, served_by, model, data, predictions, started)
+    return [
+        Output(date=item.date, production=prediction, quantiles=interval, model=served_by)
+        for item, prediction, interval in zip(data, predictions, intervals)
+    ]
+
+
+def energy_route(energy: Energy, input_model: type[BaseModel]):
+    """Build the `/predict/{energy}` handler validating the energy's own input schema."""
+
+    def predict_energy(
+        data: input_model,  # pyright: ignore[reportInvalidTypeForm]
+        backend: Backend = "random_forest",
+    ):
+        started = time.perf_counter()
+        model, served_by = serve_model(energy, backend)
+        row = energy.features.transform_one(date.fromisoformat(data.date), vars(data))
+        prediction = model.predict(row)[0]
+        log_predictions(energy, served_by, model, [data], [prediction], started)
+        return Output(date=data.date, production=prediction, model=served_by)
+
+    predict_energy.__doc__ = f"""
+    Predict {energy.name} production for a specific day
+
+    Parameters:
+        data ({input_model.__name__}): date, {", ".join(energy.features.raw)}
+        backend (str): random_forest (default) or xgboost
+
+    Returns:
+        Output: date, production (predicted) and the model that answered
+    """
+    return predict_energy
+
+
+for name, input_model in INPUTS.items():
+    router.add_api_route(
+        f"/{name}",
+        energy_route(ENERGIES[name], input_model),
+        methods=["POST"],
+        response_model=Output,
+        response_model_exclude_none=True,
+        name=f"predict_{name}",
     )
-    df = transform_date(df)
-    prediction = model.predict(df)[0]
-    return Output(date=data.date, production=prediction)
@@ -0,0 +1,146 @@
+import os
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import numpy as np
+
+# Load shedding is on unless LOAD_SHEDDING=0
+LOAD_SHEDDING = os.getenv("LOAD_SHEDDING", "1") == "1"
+# Prediction requests in flight (queued or running) above which the fallback answers
+SHED_MAX_IN_FLIGHT = int(os.getenv("SHED_MAX_IN_FLIGHT", "32"))
+# Recent p95 latency (ms) above which the fallback answers
+SHED_P95_MS = float(os.getenv("SHED_P95_MS", "250"))
+# Number of recent request latencies the p95 is computed on
+LATENCY_WINDOW = int(os.getenv("SHED_LATENCY_WINDOW", "200"))
+# The p95 is only trusted on at least this many recent latencies (warm-up)
+SHED_MIN_SAMPLES = int(os.getenv("SHED_MIN_SAMPLES", "20"))
+# Latencies older than this (seconds) are dropped: while every request is
+# shed, the window empties and the primary model gets tried again
+LATENCY_MAX_AGE = float(os.getenv("SHED_LATENCY_MAX_AGE", "30"))
+# The p95 is recomputed at most this often (seconds)
+P95_REFRESH_SECONDS = 0.5
+
+# Latency sample of the request being served, set by `LoadShedder.track`
+_sample: ContextVar[dict | None] = ContextVar("shed_sample", default=None)
+
+
+class LoadShedder:
+    def __init__(
+        self,
+        max_in_flight: int = SHED_MAX_IN_FLIGHT,
+        p95_ms: float = SHED_P95_MS,
+        window: int = LATENCY_WINDOW,
+        enabled: bool = LOAD_SHEDDING,
+        min_samples: int = SHED_MIN_SAMPLES,
+        max_age: float = LATENCY_MAX_AGE,
+    ):
+        """
+        Decide when prediction requests should be answered by the cheap
+        fallback model instead of the full one.
+
+        Requests are tracked end to end (including the time spent waiting for
+        a worker thread), so both the queue depth and the recent p95 latency
+        reflect what callers see. Only single-row requests answered by the
+        primary model feed the p95 (see `sample`), without the time spent
+        loading the model: batch calls and cold starts are slow for reasons
+        unrelated to load.
+
+        Parameters:
+            max_in_flight (int): In-flight requests above which requests are shed.
+            p95_ms (float): Recent p95 latency (ms) above which requests are shed.
+            window (int): Number of recent latencies kept for the p95.
+            enabled (bool): When False, requests are never shed.
+            min_samples (int): Recent latencies needed before the p95 is trusted.
+            max_age (float): Age (seconds) after which a latency is dropped.
+        """
+        self.max_in_flight = max_in_flight
+        self.p95_ms = p95_ms
+        self.enabled = enabled
+        self.min_samples = min_samples
+        self.max_age = max_age
+        self.in_flight = 0
+        # (time recorded, latency in ms)
+        self._latencies: deque[tuple[float, float]] = deque(maxlen=window)
+        self._p95 = 0.0
+        self._p95_at = 0.0
+        self._counts: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def track(self):
+        """
+        Count a request as in flight, and record its latency if the handler
+        marked it as a sample.
+        """
+        sample = {"record": False, "excluded_ms": 0.0}
+        token = _sample.set(sample)
+        with self._lock:
+            self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            _sample.reset(token)
+            elapsed = (time.perf_counter() - start) * 1000 - sample["excluded_ms"]
+            with self._lock:
+                self.in_flight -= 1
+                if sample["record"]:
+                    self._latencies.append((time.monotonic(), elapsed))
+
+    def sample(self, excluded_ms: float = 0.0):
+        """
+        Mark the current request as a p95 sample (a single row answered by
+        the primary model), `excluded_ms` (model loading) left out.
+        """
+        sample = _sample.get()
+        if sample is not None:
+            sample["record"] = True
+            sample["excluded_ms"] += excluded_ms
+
+    def p95(self) -> float:
+        """
+        Recent p95 latency in ms, refreshed at most every P95_REFRESH_SECONDS;
+        0 until `min_samples` latencies younger than `max_age` are available.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now - self._p95_at >= P95_REFRESH_SECONDS:
+                while self._latencies and now - self._latencies[0][0] > self.max_age:
+                    self._latencies.popleft()
+                if len(self._latencies) >= self.min_samples:
+                    self._p95 = float(
+                        np.percentile([latency for _, latency in self._latencies], 95)
+                    )
+                else:
+                    self._p95 = 0.0
+                self._p95_at = now
+            return self._p95
+
+    def should_shed(self) -> bool:
+        if not self.enabled:
+            return False
+        return self.in_flight > self.max_in_flight or self.p95() > self.p95_ms
+
+    def record(self, event: str):
+        """Count a serving event (`primary`, `shed`, `fallback_unavailable`)."""
+        with self._lock:
+            self._counts[event] += 1
+
+    def stats(self) -> dict:
+        p95 = self.p95()
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "in_flight": self.in_flight,
+                "p95_ms": round(p95, 3),
+                "samples": len(self._latencies),
+                "max_in_flight": self.max_in_flight,
+                "p95_threshold_ms": self.p95_ms,
+                "requests": dict(self._counts),
+            }
+
+
+shedder = LoadShedder()
@@ -0,0 +1,104 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+import routes.analogs
+from main import app
+from models.analogs import AnalogIndex, encode
+
+
+def _days(n, start="2020-01-01", seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "date": pd.date_range(start, periods=n, freq="D").strftime("%Y-%m-%d"),
+        "wind_speed_10m_mean": rng.random(n) * 30,
+        "wind_gusts_10m_mean": rng.random(n) * 60,
+        "winddirection_10m_dominant": rng.integers(0, 360, n),
+        "prod_eolienne": rng.random(n) * 100,
+    })
+
+
+##### Test des jours analogues #####
+# Vérifie que l'index renvoie les mêmes jours qu'un parcours exhaustif
+def test_query_matches_brute_force():
+    days = _days(2000)
+    index = AnalogIndex(loader=lambda start=None: days).build()
+    query = {"wind_speed_10m_mean": 12.0, "wind_gusts_10m_mean": 25.0, "winddirection_10m_dominant": 350}
+
+    analogs = index.query(query, k=5)
+
+    features = encode(days)
+    scaled = (features - features.mean(axis=0)) / features.std(axis=0)
+    point = (encode(pd.DataFrame([query])) - features.mean(axis=0)) / features.std(axis=0)
+    expected = np.argsort(((scaled - point) ** 2).sum(axis=1))[:5]
+    assert [analog["date"] for analog in analogs] == days["date"].iloc[expected].tolist()
+    assert analogs[0]["production"] == days["prod_eolienne"].iloc[expected[0]]
+
+
+##### Test de l'ajout incrémental #####
+# Vérifie qu'un jour ingéré est trouvé sans reconstruction, et qu'au-delà du
+# seuil l'arbre est reconstruit avec tous les jours
+def test_ingested_days_are_found():
+    days = _days(3000)
+    index = AnalogIndex(loader=lambda start=None: days).build()
+    new_day = pd.DataFrame([{
+        "date": "2030-01-01", "wind_speed_10m_mean": 99.0, "wind_gusts_10m_mean": 120.0,
+        "winddirection_10m_dominant": 90, "prod_eolienne": 42.0,
+    }])
+
+    assert index.add(pd.concat([days.tail(3), new_day])) == 1
+    analogs = index.query({"wind_speed_10m_mean": 99.0, "wind_gusts_10m_mean": 120.0, "winddirection_10m_dominant": 90}, k=1)
+    assert analogs[0]["date"] == "2030-01-01"
+
+    assert index.add(_days(400, start="2031-01-01", seed=1)) == 400
+    assert len(index._snapshot["rows"]) == 3401
+    assert len(index._snapshot["delta"]) == 0
+
+
+##### Test de l'endpoint /analogs #####
+# Vérifie la réponse de l'endpoint et une latence inférieure à la milliseconde
+def test_analogs_endpoint_is_fast(monkeypatch):
+    days = _days(5000)
+    index = AnalogIndex(loader=lambda start=None: days).build()
+    monkeypatch.setattr(routes.analogs, "analog_index", index)
+    params = {"wind_speed_10m_mean": 12.0, "wind_gusts_10m_mean": 25.0, "winddirection_10m_dominant": 200}
+
+    response = TestClient(app).get("/analogs/", params={**params, "k": 3})
+
+    assert response.status_code == 200
+    assert len(response.json()) == 3
+    start = time.perf_counter()
+    for _ in range(200):
+        index.query(params, k=5)
+    assert (time.perf_counter() - start) / 200 < 1e-3
+
+
+##### Test de l'indisponibilité de l'index #####
+# Vérifie qu'une table vide ou une base injoignable donne un 503, et que des
+# requêtes simultanées ne chargent la table qu'une fois
+def test_unavailable_index_returns_503_and_builds_once(monkeypatch):
+    params = {"wind_speed_10m_mean": 12.0, "wind_gusts_10m_mean": 25.0, "winddirection_10m_dominant": 200}
+    client = TestClient(app)
+
+    def unreachable(start=None):
+        raise ConnectionError("database down")
+
+    for loader in (lambda start=None: pd.DataFrame(), unreachable):
+        monkeypatch.setattr(routes.analogs, "analog_index", AnalogIndex(loader=loader))
+        assert client.get("/analogs/", params=params).status_code == 503
+
+    loads = []
+
+    def slow_loader(start=None):
+        loads.append(start)
+        time.sleep(0.2)
+        return _days(100)
+
+    index = AnalogIndex(loader=slow_loader)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: index.query(params, k=2), range(4)))
+    assert len(loads) == 1
+    assert all(len(result) == 2 for result in results)
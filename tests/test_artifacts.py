@@ -0,0 +1,161 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import StandardScaler
+from models.artifacts import FlatForest, LinearArtifact, current_version_path, load_current, publish
+from models.energies import WIND
+from models.model import compact_model
+from models.registry import ModelRegistry
+
+
+def _fit_forest():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.random((200, 4)), columns=["a", "b", "c", "d"])
+    y = X["a"] * 10 + rng.random(200)
+    model = RandomForestRegressor(n_estimators=15, min_samples_leaf=5, random_state=0)
+    return model.fit(X, y), X
+
+
+##### Test de l'artefact plat #####
+# Vérifie que la forêt aplatie prédit exactement comme scikit-learn
+def test_flat_forest_matches_sklearn():
+    model, X = _fit_forest()
+    artifact = FlatForest.from_estimator(model)
+
+    np.testing.assert_allclose(artifact.predict(X), model.predict(X))
+
+
+##### Test du modèle de secours #####
+# Vérifie que la régression standardisée repliée prédit comme scikit-learn
+def test_linear_artifact_matches_standardized_regression(tmp_path):
+    _, X = _fit_forest()
+    y = X["a"] * 3 - X["c"]
+    scaler = StandardScaler().fit(X)
+    model = LinearRegression().fit(scaler.transform(X), y)
+    publish(LinearArtifact.from_estimator(scaler, model, list(X.columns)), "linear", root=str(tmp_path))
+
+    loaded = load_current("linear", root=str(tmp_path))
+
+    assert isinstance(loaded, LinearArtifact)
+    np.testing.assert_allclose(loaded.predict(X), model.predict(scaler.transform(X)))
+
+
+##### Test de publication #####
+# Vérifie que l'artefact publié est rechargé en memory-mapping avec son en-tête
+def test_publish_and_load_memory_mapped(tmp_path):
+    model, X = _fit_forest()
+    publish(FlatForest.from_estimator(model, metadata={"data_hash": "abc"}), "rf", root=str(tmp_path))
+
+    loaded = load_current("rf", root=str(tmp_path))
+
+    assert isinstance(loaded.arrays["threshold"], np.memmap)
+    assert loaded.metadata["features"] == ["a", "b", "c", "d"]
+    assert loaded.metadata["data_hash"] == "abc"
+    # L'ordre des colonnes est repris de l'en-tête
+    np.testing.assert_allclose(loaded.predict(X[["d", "c", "b", "a"]]), model.predict(X))
+
+
+##### Test du registre de modèles #####
+# Vérifie le chargement paresseux et l'éviction LRU au-delà du budget mémoire
+def test_registry_lazy_load_and_lru_eviction():
+    model, _ = _fit_forest()
+    forest = FlatForest.from_estimator(model)
+    loads = []
+
+    def loader(name):
+        loads.append(name)
+        return forest
+
+    registry = ModelRegistry(budget_bytes=forest.nbytes * 2, loader=loader)
+    assert registry.loaded() == []
+
+    registry.get("eolienne")
+    registry.get("solaire")
+    registry.get("eolienne")
+    registry.get("hydro")
+
+    assert loads == ["eolienne", "solaire", "hydro"]
+    assert registry.loaded() == ["eolienne", "hydro"]
+
+
+##### Test de la bascule à chaud #####
+# Vérifie qu'une nouvelle version publiée est servie sans redémarrage
+def test_registry_hot_swaps_published_version(tmp_path):
+    model, X = _fit_forest()
+    small = RandomForestRegressor(n_estimators=3, random_state=1).fit(X, X["b"])
+    root = str(tmp_path)
+    publish(FlatForest.from_estimator(model), "rf", root=root)
+    registry = ModelRegistry(
+        budget_bytes=10**9,
+        loader=lambda name: load_current(name, root=root),
+        version=lambda name: current_version_path(name, root=root),
+        refresh_seconds=0,
+    )
+    assert registry.get("rf").metadata["n_trees"] == 15
+
+    publish(FlatForest.from_estimator(small), "rf", root=root)
+
+    assert registry.get("rf").metadata["n_trees"] == 3
+
+
+##### Test de la compaction #####
+# Vérifie que la forêt compacte reste dans la tolérance du MAE de la forêt
+# complète (sur les lignes de sélection) et qu'elle est publiée sous son propre nom
+def test_compact_model_stays_within_tolerance(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    rng = np.random.default_rng(1)
+    X = pd.DataFrame(rng.random((600, 4)), columns=["a", "b", "c", "d"])
+    y = X["a"] * 10 + X["b"] * 3 + rng.random(600)
+    model = RandomForestRegressor(n_estimators=60, min_samples_leaf=5, random_state=0)
+    model.fit(X.iloc[:400], y.iloc[:400])
+    X_test, y_test = X.iloc[400:], y.iloc[400:]
+
+    report = compact_model(model, X_test, y_test, X, tolerance=0.05, energy=WIND)
+
+    compact = load_current(f"{WIND.artifact}_compact")
+    assert report["compact"]["n_trees"] == compact.metadata["n_trees"] < 60
+    assert compact.metadata["compacted_from"] == 60
+    with pytest.raises(FileNotFoundError):
+        current_version_path(WIND.artifact)
+    pick = np.arange(len(y_test)) % 2 == 0
+    full_mae = np.abs(model.predict(X_test[pick]) - y_test[pick]).mean()
+    compact_mae = np.abs(compact.predict(X_test[pick]) - y_test[pick]).mean()
+    assert compact_mae <= full_mae * 1.05 + 1e-9
+
+
+##### Test du chargement concurrent #####
+# Vérifie que le chargement d'un modèle ne bloque pas les modèles déjà en
+# mémoire, et que les requêtes concurrentes d'un même modèle le chargent une fois
+def test_registry_loads_outside_global_lock():
+    model, _ = _fit_forest()
+    forest = FlatForest.from_estimator(model)
+    release = threading.Event()
+    loads = []
+
+    def loader(name):
+        loads.append(name)
+        if name == "eolienne":
+            release.wait(2)
+        return forest
+
+    registry = ModelRegistry(budget_bytes=10**9, loader=loader)
+    registry.get("solaire")
+    threads = [threading.Thread(target=registry.get, args=("eolienne",)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+
+    start = time.monotonic()
+    assert registry.get("solaire") is forest
+    assert registry.used_bytes == forest.nbytes
+    assert time.monotonic() - start < 1
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert loads == ["solaire", "eolienne"]
+    assert registry.used_bytes == forest.nbytes * 2
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+from models.backtest import backtest, make_folds
+
+
+##### Test du découpage en plis #####
+# Vérifie qu'aucun pli ne s'entraîne sur des jours postérieurs à sa période de test
+@pytest.mark.parametrize("window", ["expanding", "sliding"])
+def test_folds_never_train_on_the_future(window):
+    dates = pd.date_range("2023-01-01", periods=400, freq="D")
+
+    folds = make_folds(dates, n_folds=4, horizon=30, window=window, train_days=60)
+
+    assert len(folds) == 4
+    for train, test in folds:
+        assert dates[train].max() < dates[test].min()
+        assert len(test) == 30
+        if window == "sliding":
+            assert len(train) == 60
+    # Les périodes de test se suivent et finissent au dernier jour
+    assert dates[folds[-1][1]].max() == dates[-1]
+
+
+##### Test du backtest parallèle #####
+# Vérifie les métriques par pli et agrégées calculées par le pool de processus
+def test_backtest_reports_fold_and_aggregate_metrics():
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2023-01-01", periods=300, freq="D")
+    X = rng.random((300, 3))
+    y = X[:, 0] * 10 + rng.random(300)
+
+    report = backtest(
+        X, y, dates, params={"n_estimators": 10, "random_state": 0},
+        workers=2, n_folds=3, horizon=20,
+    )
+
+    assert [fold["fold"] for fold in report["folds"]] == [0, 1, 2]
+    assert report["folds"][0]["test_start"] == "2023-08-29"
+    assert all(fold["r2"] > 0.5 for fold in report["folds"])
+    assert report["aggregate"]["mae"] == pytest.approx(
+        np.mean([fold["mae"] for fold in report["folds"]])
+    )
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+from models.artifacts import BoosterArtifact, load_current, publish
+from models.boosting import QuantizedDataset
+
+
+def _dataset():
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2023-01-01", periods=500, freq="D")
+    X = rng.random((500, 3))
+    y = X[:, 0] * 10 + rng.random(500)
+    # Lignes mélangées : le jeu les remet dans l'ordre chronologique
+    order = rng.permutation(500)
+    return QuantizedDataset(X[order], y[order], dates[order], ["a", "b", "c"]), X, y
+
+
+##### Test de l'arrêt anticipé #####
+# Vérifie que l'entraînement s'arrête avant le nombre maximal d'itérations
+def test_fit_stops_early_on_late_days():
+    data, _, _ = _dataset()
+
+    booster = data.fit(validation_days=60, max_rounds=1000, early_stopping_rounds=10)
+
+    assert booster.best_iteration + 1 < 1000
+    assert data.evaluate(booster, np.arange(400, 500))["r2"] > 0.8
+
+
+##### Test du cache des matrices quantifiées #####
+# Vérifie que les fits répétés réutilisent les mêmes matrices (mêmes seuils)
+def test_matrices_are_quantized_once():
+    data, _, _ = _dataset()
+    rows = np.arange(300)
+
+    assert data.matrix(rows) is data.matrix(rows.copy())
+    results = data.tune([{"max_depth": 2}, {"max_depth": 4}], validation_days=60, max_rounds=100)
+    assert len(results) == 2
+    assert results[0]["validation_rmse"] <= results[1]["validation_rmse"]
+
+    report = data.backtest(n_folds=2, horizon=30)
+    assert report["folds"][-1]["test_end"] == "2024-05-14"
+    assert set(report["aggregate"]) >= {"mae", "rmse", "r2"}
+
+
+##### Test de publication du booster #####
+# Vérifie que le booster publié est rechargé et prédit comme avant publication
+def test_publish_and_load_booster(tmp_path):
+    data, X, _ = _dataset()
+    booster = data.fit(validation_days=60, max_rounds=200, early_stopping_rounds=10)
+    artifact = BoosterArtifact.from_booster(booster, ["a", "b", "c"])
+    publish(artifact, "xgb", root=str(tmp_path))
+
+    loaded = load_current("xgb", root=str(tmp_path))
+
+    assert isinstance(loaded, BoosterArtifact)
+    assert loaded.metadata["n_rounds"] == booster.best_iteration + 1
+    frame = pd.DataFrame(X, columns=["a", "b", "c"])
+    np.testing.assert_allclose(loaded.predict(frame[["c", "b", "a"]]), artifact.predict(X))
+
+
+##### Test des options d'entraînement #####
+# Vérifie que l'entraînement incrémental et la compaction sont refusés avec
+# XGBoost au lieu d'être ignorés
+def test_xgboost_rejects_incremental_and_compaction():
+    from pipeline.pipeline import Pipeline
+
+    pipeline = Pipeline()
+    with pytest.raises(ValueError):
+        pipeline.start_train(incremental=True, backend="xgboost")
+    with pytest.raises(ValueError):
+        pipeline.start_train(compaction_tolerance=0.02, backend="xgboost")
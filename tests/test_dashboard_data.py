@@ -0,0 +1,71 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from prepare_data.dashboard_data import (
+    aggregate,
+    downsample,
+    error_summary,
+    load_tables,
+    lttb,
+    prediction_errors,
+)
+from prepare_data.storage import SQLiteBackend
+
+
+##### Test du chargement des tables #####
+# Vérifie que les trois tables sont lues (en parallèle) sur la plage demandée
+def test_load_tables_reads_each_table_for_the_range(tmp_path, monkeypatch):
+    backend = SQLiteBackend(str(tmp_path / "db.sqlite"))
+    monkeypatch.setattr("prepare_data.storage._backend", backend)
+    days = pd.date_range("2024-01-01", periods=60, freq="D").strftime("%Y-%m-%d")
+    for table, column in (("eolienne", "prod_eolienne"), ("solaire", "prod_solaire"), ("hydro", "prod_hydro")):
+        backend.insert(pd.DataFrame({"date": days, column: np.arange(60.0)}).to_dict("records"), table)
+
+    tables = load_tables(date(2024, 1, 10), date(2024, 1, 19))
+
+    assert list(tables) == ["eolienne", "solaire", "hydro"]
+    assert all(len(df) == 10 for df in tables.values())
+    assert tables["hydro"]["date"].min() == pd.Timestamp("2024-01-10")
+
+
+##### Test de la couche d'agrégats #####
+# Vérifie l'agrégation par site, le plafond de points par série et l'erreur des prédictions servies
+def test_aggregate_downsample_and_errors():
+    dates = pd.date_range("2000-01-01", periods=9000, freq="D")
+    df = pd.DataFrame({
+        "date": np.tile(dates, 2),
+        "site": np.repeat(["nord", "sud"], 9000),
+        "prod_eolienne": np.random.default_rng(0).random(18000),
+    })
+
+    daily = downsample(aggregate(df, "prod_eolienne", "D"), max_points=1000)
+    monthly = aggregate(df, "prod_eolienne", "MS")
+
+    assert daily.groupby("series").size().to_dict() == {"nord": 1000, "sud": 1000}
+    assert set(monthly["series"]) == {"nord", "sud"}
+    assert len(monthly) == 2 * 296
+
+    predictions = pd.DataFrame({
+        "date": dates[:3], "energy": "eolienne", "model": "random_forest", "production": [1.0, 2.0, 3.0],
+    })
+    errors = prediction_errors(predictions, df)
+    summary = error_summary(errors)
+    assert errors["actual"].tolist() == df.groupby("date")["prod_eolienne"].sum().iloc[:3].tolist()
+    assert summary["n"].tolist() == [3]
+
+
+##### Test du sous-échantillonnage LTTB #####
+# Vérifie le nombre de points gardés, les extrémités et la conservation d'un pic isolé
+def test_lttb_keeps_shape_and_peaks():
+    x = pd.date_range("2000-01-01", periods=20_000, freq="D").to_numpy()
+    y = np.sin(np.arange(20_000) / 500)
+    y[12_345] = 10.0
+
+    kept = lttb(x, y, 500)
+
+    assert len(kept) == 500
+    assert kept[0] == 0 and kept[-1] == 19_999
+    assert np.all(np.diff(kept) > 0)
+    assert 12_345 in kept
+    np.testing.assert_array_equal(lttb(x[:100], y[:100], 500), np.arange(100))
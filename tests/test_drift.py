@@ -0,0 +1,84 @@
+import time
+
+import numpy as np
+import pandas as pd
+from models.drift import DriftMonitor, reference_profile
+
+COLUMNS = ["wind_speed_10m_mean", "wind_gusts_10m_mean"]
+
+
+def _frame(rng, n, shift=0.0):
+    return pd.DataFrame({
+        "wind_speed_10m_mean": rng.normal(15 + shift, 5, n),
+        "wind_gusts_10m_mean": rng.normal(30, 8, n),
+    })
+
+
+##### Test du profil de référence #####
+# Vérifie que les intervalles sont des quantiles (effectifs égaux) de l'entraînement
+def test_reference_profile_has_equal_frequency_bins():
+    profile = reference_profile(_frame(np.random.default_rng(0), 5000), COLUMNS)
+
+    assert set(profile) == set(COLUMNS)
+    assert len(profile["wind_speed_10m_mean"]["edges"]) == 9
+    np.testing.assert_allclose(profile["wind_speed_10m_mean"]["proportions"], 0.1, atol=1e-3)
+
+
+##### Test de la détection de dérive #####
+# Vérifie qu'un décalage de la vitesse du vent est signalé sur cette seule entrée,
+# et que les compteurs repartent de zéro avec une nouvelle version du modèle
+def test_monitor_flags_shifted_input_only():
+    rng = np.random.default_rng(0)
+    metadata = {"version": "v1", "reference_profile": reference_profile(_frame(rng, 5000), COLUMNS)}
+    monitor = DriftMonitor()
+
+    monitor.observe("eolienne", "random_forest", metadata, _frame(rng, 2000, shift=8).to_dict("records"))
+    inputs = monitor.scores()["eolienne"]["random_forest"]["inputs"]
+
+    assert inputs["wind_speed_10m_mean"]["status"] == "significant"
+    assert inputs["wind_speed_10m_mean"]["ks"] > 0.4
+    assert inputs["wind_gusts_10m_mean"]["status"] == "stable"
+
+    monitor.observe("eolienne", "random_forest", {**metadata, "version": "v2"}, _frame(rng, 10).to_dict("records"))
+    report = monitor.scores()["eolienne"]["random_forest"]
+    assert report["model_version"] == "v2"
+    assert report["inputs"]["wind_speed_10m_mean"]["n"] == 10
+    assert report["inputs"]["wind_speed_10m_mean"]["status"] == "insufficient_data"
+
+
+##### Test des modèles servis en alternance #####
+# Vérifie que la forêt et le modèle de secours gardent chacun leurs compteurs :
+# une alternance (délestage, ?backend=) ne les remet pas à zéro
+def test_monitor_keeps_one_histogram_per_model():
+    rng = np.random.default_rng(0)
+    forest = {"version": "forest-v1", "reference_profile": reference_profile(_frame(rng, 5000), COLUMNS)}
+    fallback = {"version": "linear-v1", "reference_profile": reference_profile(_frame(rng, 5000), COLUMNS)}
+    monitor = DriftMonitor()
+
+    for i, row in enumerate(_frame(rng, 400).to_dict("records")):
+        if i % 2:
+            monitor.observe("eolienne", "linear_fallback", fallback, [row])
+        else:
+            monitor.observe("eolienne", "random_forest", forest, [row])
+
+    report = monitor.scores()["eolienne"]
+    for model in ("random_forest", "linear_fallback"):
+        speed = report[model]["inputs"]["wind_speed_10m_mean"]
+        assert speed["n"] == 200
+        assert speed["status"] == "stable"
+
+
+##### Test du coût par requête #####
+# Vérifie que la mise à jour des histogrammes reste de l'ordre de la microseconde
+def test_observe_is_cheap():
+    rng = np.random.default_rng(0)
+    metadata = {"reference_profile": reference_profile(_frame(rng, 1000), COLUMNS)}
+    monitor = DriftMonitor()
+    rows = [{"wind_speed_10m_mean": 12.0, "wind_gusts_10m_mean": 30.0}]
+
+    start = time.perf_counter()
+    for _ in range(10_000):
+        monitor.observe("eolienne", "random_forest", metadata, rows)
+    per_call_us = (time.perf_counter() - start) / 10_000 * 1e6
+
+    assert per_call_us < 50
@@ -0,0 +1,122 @@
+import re
+from datetime import date
+
+import pandas as pd
+from fastapi.testclient import TestClient
+
+import prepare_data.storage as storage
+from main import app
+from prepare_data.db_handler import DBHandler
+from prepare_data.export_handler import iter_csv
+from prepare_data.storage import SQLiteBackend, SupabaseBackend
+
+ROWS = [
+    {"date": f"2024-01-{day:02d}", "site": site, "prod_eolienne": float(day)}
+    for day in range(1, 6)
+    for site in ("a", "b", "c")
+]
+
+
+class FakeQuery:
+    """Requête PostgREST minimale, évaluée sur une liste de lignes."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.filters = []
+        self.orders = []
+        self.n = None
+
+    def select(self, _):
+        return self
+
+    def order(self, column):
+        self.orders.append(column)
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(lambda row: row[column] >= value)
+        return self
+
+    def lte(self, column, value):
+        self.filters.append(lambda row: row[column] <= value)
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(lambda row: row[column] > value)
+        return self
+
+    def or_(self, expression):
+        date, _, key, value = re.fullmatch(
+            r'date\.gt\."(.+)",and\(date\.eq\."(.+)",(\w+)\.gt\."(.+)"\)', expression
+        ).groups()
+        self.filters.append(
+            lambda row: row["date"] > date or (row["date"] == date and row[key] > value)
+        )
+        return self
+
+    def limit(self, n):
+        self.n = n
+        return self
+
+    def execute(self):
+        rows = [row for row in self.rows if all(keep(row) for keep in self.filters)]
+        rows.sort(key=lambda row: [row[column] for column in self.orders])
+        return type("Response", (), {"data": rows[: self.n]})
+
+
+class FakeClient:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def table(self, _):
+        return FakeQuery(self.rows)
+
+
+##### Test de la pagination Supabase #####
+# Vérifie qu'une page qui s'arrête au milieu d'une date (plusieurs sites)
+# ne fait perdre aucune ligne de cette date
+def test_supabase_pages_split_within_a_date():
+    backend = SupabaseBackend(client=FakeClient(ROWS))  # pyright: ignore[reportArgumentType]
+
+    pages = list(backend.iter_range("eolienne", start=date(2024, 1, 2), page_size=4))
+
+    rows = [row for page in pages for row in page]
+    assert [len(page) for page in pages] == [4, 4, 4]
+    assert rows == ROWS[3:]
+
+
+##### Test de l'export en flux #####
+# Vérifie l'export CSV d'une table à plusieurs sites et le refus d'une période inversée
+def test_export_route_streams_csv(tmp_path, monkeypatch):
+    backend = SQLiteBackend(str(tmp_path / "energy.sqlite"))
+    DBHandler(backend=backend).sync(pd.DataFrame(ROWS), "eolienne")
+    monkeypatch.setattr(storage, "_backend", backend)
+    client = TestClient(app)
+
+    response = client.get("/export/eolienne", params={"start": "2024-01-04"})
+    lines = response.text.strip().splitlines()
+    assert lines[0] == "date,site,prod_eolienne"
+    assert len(lines) == 1 + 6
+
+    ndjson = client.get("/export/eolienne", params={"end": "2024-01-01", "format": "ndjson"})
+    assert len(ndjson.text.strip().splitlines()) == 3
+
+    inverted = client.get("/export/eolienne", params={"start": "2024-01-04", "end": "2024-01-01"})
+    assert inverted.status_code == 422
+
+
+##### Test de l'export d'une période vide #####
+# Vérifie qu'une période sans ligne donne un CSV réduit à l'en-tête, et que
+# les pages vides sont ignorées
+def test_export_empty_range_keeps_csv_header(tmp_path, monkeypatch):
+    backend = SQLiteBackend(str(tmp_path / "energy.sqlite"))
+    DBHandler(backend=backend).sync(pd.DataFrame(ROWS), "eolienne")
+    monkeypatch.setattr(storage, "_backend", backend)
+    client = TestClient(app)
+
+    response = client.get("/export/eolienne", params={"start": "2025-01-01"})
+    assert response.text.strip() == "date,site,prod_eolienne"
+    assert client.get("/export/eolienne", params={"start": "2025-01-01", "format": "ndjson"}).text == ""
+
+    chunks = list(iter_csv([[], [{"date": "2024-01-01", "prod_eolienne": 1.0}]]))
+    assert "".join(chunks).splitlines() == ["date,prod_eolienne", "2024-01-01,1.0"]
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+from models.features import CYCLICAL_WIND_FEATURES, WIND_FEATURES, date_parts
+
+
+##### Test de la décomposition des dates #####
+# Vérifie que les tables précalculées donnent les mêmes valeurs que pandas (années bissextiles comprises)
+def test_date_parts_matches_pandas():
+    dates = pd.date_range("2015-12-25", "2025-03-05", freq="D")
+    parts = date_parts(dates.to_numpy())
+
+    assert (parts["year"] == dates.year).all()
+    assert (parts["month"] == dates.month).all()
+    assert (parts["day"] == dates.day).all()
+    assert (parts["day_of_year"] == dates.day_of_year).all()
+    assert (parts["day_of_week"] == dates.dayofweek).all()
+
+
+##### Test du pipeline de features #####
+# Vérifie l'ordre déclaré et les encodages cycliques
+def test_feature_pipeline_order_and_values():
+    df = pd.DataFrame({
+        "date": ["2024-12-31", "2025-06-15"],
+        "winddirection_10m_dominant": [90, 270],
+        "wind_speed_10m_mean": [12.0, 3.5],
+        "wind_gusts_10m_mean": [30.0, 9.0],
+    })
+
+    X = WIND_FEATURES.frame(df)
+    assert list(X.columns) == WIND_FEATURES.features
+    assert X.iloc[0].tolist() == [30.0, 12.0, 90, 2024, 12, 31, 1]
+
+    cyclical = CYCLICAL_WIND_FEATURES.frame(df)
+    np.testing.assert_allclose(cyclical["day_of_year_sin"], np.sin(2 * np.pi * np.array([366, 166]) / 365.25))
+    np.testing.assert_allclose(cyclical["wind_direction_cos"], [0, 0], atol=1e-12)
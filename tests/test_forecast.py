@@ -0,0 +1,120 @@
+import json
+import threading
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.ensemble import RandomForestRegressor
+
+import prepare_data.weather_sources as weather_sources
+from main import app
+from models.artifacts import FlatForest
+from models.features import WIND_FEATURES
+from prepare_data.weather_sources import CachedWeatherSource, OpenMeteoForecastSource, WeatherSource
+from routes.forecast import get_weather_source
+from routes.predict import get_model
+
+
+class FakeOpenMeteo(BaseHTTPRequestHandler):
+    """Serveur local imitant l'API de prévisions Open-Meteo."""
+
+    calls = []
+
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        start = date.fromisoformat(params["start_date"][0])
+        end = date.fromisoformat(params["end_date"][0])
+        FakeOpenMeteo.calls.append((start, end))
+        days = [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+        body = json.dumps({"daily": {
+            "time": days,
+            "wind_gusts_10m_mean": [30.0] * len(days),
+            "wind_speed_10m_mean": [12.0] * len(days),
+            "winddirection_10m_dominant": [200] * len(days),
+        }}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def client():
+    server = HTTPServer(("127.0.0.1", 0), FakeOpenMeteo)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    FakeOpenMeteo.calls = []
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "date": pd.date_range("2024-01-01", periods=100, freq="D"),
+        "wind_gusts_10m_mean": rng.random(100) * 50,
+        "wind_speed_10m_mean": rng.random(100) * 30,
+        "winddirection_10m_dominant": rng.integers(0, 360, 100),
+    })
+    model = RandomForestRegressor(n_estimators=10, random_state=0)
+    model.fit(WIND_FEATURES.frame(df), rng.random(100))
+
+    source = CachedWeatherSource(OpenMeteoForecastSource(base_url=f"http://127.0.0.1:{server.server_port}"))
+    app.dependency_overrides[get_model] = lambda: FlatForest.from_estimator(model)
+    app.dependency_overrides[get_weather_source] = lambda: source
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    server.shutdown()
+
+
+##### Test de l'endpoint /forecast #####
+# Vérifie qu'une prédiction est renvoyée par jour et que la météo est mise en cache par jour
+def test_forecast_scores_range_and_caches_days(client):
+    response = client.get("/forecast/", params={"start": "2025-05-01", "end": "2025-05-03"})
+
+    assert response.status_code == 200
+    assert [p["date"] for p in response.json()["predictions"]] == ["2025-05-01", "2025-05-02", "2025-05-03"]
+
+    # Seul le jour manquant est redemandé à la source
+    client.get("/forecast/", params={"start": "2025-05-02", "end": "2025-05-04"})
+    assert FakeOpenMeteo.calls == [(date(2025, 5, 1), date(2025, 5, 3)), (date(2025, 5, 4), date(2025, 5, 4))]
+
+
+##### Test de validation de la plage #####
+def test_forecast_rejects_inverted_range(client):
+    response = client.get("/forecast/", params={"start": "2025-05-03", "end": "2025-05-01"})
+
+    assert response.status_code == 422
+
+
+class FakeSource(WeatherSource):
+    """Source météo en mémoire, qui note les périodes demandées."""
+
+    def __init__(self):
+        self.calls = []
+
+    def fetch_daily(self, start, end):
+        self.calls.append((start, end))
+        days = pd.date_range(start, end, freq="D")
+        return pd.DataFrame({"date": days.strftime("%Y-%m-%d"), "wind_speed_10m_mean": 10.0})
+
+
+##### Test du cache météo #####
+# Vérifie que chaque suite de jours manquants est demandée séparément, et que
+# les jours expirés sont retirés du cache
+def test_weather_cache_fetches_missing_runs_and_evicts(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(weather_sources.time, "monotonic", lambda: clock[0])
+    source = FakeSource()
+    cache = CachedWeatherSource(source, ttl=100)
+
+    cache.fetch_daily(date(2025, 5, 3), date(2025, 5, 3))
+    clock[0] = 50
+    assert len(cache.fetch_daily(date(2025, 5, 1), date(2025, 5, 5))) == 5
+    assert source.calls[1:] == [(date(2025, 5, 1), date(2025, 5, 2)), (date(2025, 5, 4), date(2025, 5, 5))]
+
+    clock[0] = 200
+    cache.fetch_daily(date(2025, 6, 1), date(2025, 6, 1))
+    assert list(cache._cache) == [date(2025, 6, 1)]
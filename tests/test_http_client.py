@@ -0,0 +1,64 @@
+from datetime import date, timedelta
+
+import httpx
+import pytest
+from prepare_data.api_handlers import OpenMeteoAPIHandler
+from prepare_data.http_client import HTTPClient, run_sync, split_range
+
+
+def _client(handler, **kwargs):
+    return HTTPClient(transport=httpx.MockTransport(handler), backoff=0, rate_limit=0, **kwargs)
+
+
+##### Test des nouvelles tentatives #####
+# Vérifie qu'une erreur transitoire est retentée puis qu'un échec persistant remonte
+def test_client_retries_transient_errors():
+    statuses = iter([503, 429, 200])
+    client = _client(lambda request: httpx.Response(next(statuses), json={"ok": True}))
+
+    assert run_sync(client.get_json("http://api.test/data")) == {"ok": True}
+
+    failing = _client(lambda request: httpx.Response(503), retries=2)
+    with pytest.raises(httpx.HTTPStatusError):
+        run_sync(failing.get_json("http://api.test/data"))
+
+
+##### Test du découpage en sous-périodes #####
+def test_split_range_covers_every_day_once():
+    ranges = split_range(date(2024, 1, 1), date(2024, 12, 31), 100)
+
+    assert ranges[0] == (date(2024, 1, 1), date(2024, 4, 9))
+    assert ranges[-1][1] == date(2024, 12, 31)
+    assert sum((end - start).days + 1 for start, end in ranges) == 366
+
+
+##### Test du chargement Open-Meteo #####
+# Vérifie que la période est demandée en sous-périodes concurrentes puis réassemblée
+def test_open_meteo_handler_fetches_sub_ranges():
+    requested = []
+
+    def fake_archive(request):
+        start = date.fromisoformat(request.url.params["start_date"])
+        end = date.fromisoformat(request.url.params["end_date"])
+        requested.append(start)
+        days = [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+        return httpx.Response(200, json={"daily": {"time": days, "rain_sum": [0.0] * len(days)}})
+
+    handler = OpenMeteoAPIHandler(client=_client(fake_archive))
+    df = handler.load()
+
+    assert len(requested) == len(split_range(handler.start_date, handler.end_date, handler.chunk_days))
+    assert df["time"].is_monotonic_increasing
+    assert len(df) == (handler.end_date - handler.start_date).days + 1
+
+
+# Vérifie qu'une période vide ou inversée ne lance aucune requête et donne un jeu vide
+def test_open_meteo_handler_empty_range():
+    def fake_archive(request):
+        raise AssertionError("no request expected")
+
+    handler = OpenMeteoAPIHandler(
+        client=_client(fake_archive), start_date=date(2025, 2, 1), end_date=date(2025, 1, 1)
+    )
+
+    assert handler.load().empty
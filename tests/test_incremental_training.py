@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+import models.model as model_module
+from models.energies import WIND
+
+
+def _wind_table(n_days):
+    rng = np.random.default_rng(0)
+    speed = rng.random(n_days) * 20
+    return pd.DataFrame({
+        "date": pd.date_range("2023-01-01", periods=n_days).strftime("%Y-%m-%d"),
+        "wind_gusts_10m_mean": speed * 2 + rng.random(n_days),
+        "wind_speed_10m_mean": speed,
+        "winddirection_10m_dominant": rng.integers(0, 360, n_days),
+        "prod_eolienne": speed * 5 + rng.random(n_days),
+    })
+
+
+##### Test de l'entraînement incrémental #####
+# Vérifie que les arbres ajoutés sont entraînés sur la fenêtre récente (pas
+# sur les seuls nouveaux jours) et que le modèle est évalué avant et après
+def test_incremental_trees_fit_on_recent_window(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "models").mkdir()
+    monkeypatch.setattr(
+        model_module,
+        "initialize_model",
+        lambda: RandomForestRegressor(n_estimators=20, min_samples_leaf=5, random_state=0),
+    )
+    monkeypatch.setattr(model_module, "INCREMENTAL_TREES", 10)
+    monkeypatch.setattr(model_module, "INCREMENTAL_WINDOW_DAYS", 100)
+    df = _wind_table(405)
+
+    model_module.run_full_training(df.iloc[:400])
+    state = model_module.load_training_state(WIND.state_path)
+    entry = model_module.run_incremental_training(df, state, WIND)
+
+    assert entry["n_rows"] == 5
+    assert entry["n_window_rows"] == 100
+    assert entry["n_estimators"] == 30
+    for key in ("mae", "mae_after"):
+        assert entry[key] < 5
+    model = model_module.load_model(WIND.model_path)
+    # Un arbre ajouté a été construit sur la fenêtre (échantillon bootstrap)
+    assert model.estimators_[-1].tree_.weighted_n_node_samples[0] == 100
+    assert model_module.load_training_state(WIND.state_path)["watermark"] == df["date"].iloc[-1]
+    assert model_module.run_incremental_training(df, model_module.load_training_state(WIND.state_path), WIND) is None
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+from prepare_data.merge_handler import HydroDataMerger, align_frames
+
+
+def _frames():
+    api = pd.DataFrame({"date": pd.date_range("2024-01-01", periods=6), "wind": np.arange(6.0)})
+    # Production non triée, avec un jour absent de l'API
+    prod = pd.DataFrame({
+        "date": pd.to_datetime(["2024-01-04", "2024-01-02", "2024-01-03", "2024-01-09"]),
+        "prod": [4, 2, 3, 9],
+    })
+    return api, prod
+
+
+##### Test du moteur d'alignement #####
+# Vérifie que les jointures inner et outer donnent le même résultat que pd.merge
+@pytest.mark.parametrize("how", ["inner", "outer"])
+def test_align_frames_matches_pd_merge(how):
+    api, prod = _frames()
+
+    aligned, report = align_frames({"api": api, "prod": prod}, how=how)
+    expected = pd.merge(api, prod, on="date", how=how).sort_values("date", ignore_index=True)
+
+    pd.testing.assert_frame_equal(aligned, expected, check_dtype=False)
+    if how == "inner":
+        assert report["prod"]["unmatched"] == 1
+        assert report["prod"]["unmatched_dates"] == ["2024-01-09"]
+    else:
+        assert report["prod"]["missing"] == 3
+
+
+# Dates non alignées sur minuit : chemin par recherche dichotomique
+@pytest.mark.parametrize("how", ["inner", "outer"])
+def test_align_frames_hourly_keys(how):
+    api, prod = _frames()
+    api["date"] += pd.Timedelta(hours=6)
+    prod["date"] += pd.Timedelta(hours=6)
+
+    aligned, _ = align_frames({"api": api, "prod": prod}, how=how)
+    expected = pd.merge(api, prod, on="date", how=how).sort_values("date", ignore_index=True)
+
+    pd.testing.assert_frame_equal(aligned, expected, check_dtype=False)
+
+
+##### Test de la fusion hydro à trois sources #####
+def test_hydro_merger_aligns_three_frames():
+    api, prod = _frames()
+    weather = pd.DataFrame({
+        "date": pd.date_range("2024-01-01", periods=6),
+        "rain_sum": np.ones(6),
+        "precipitation_hours": np.zeros(6),
+        "cloud_cover_mean": np.zeros(6),
+    })
+
+    merged = HydroDataMerger(api, weather, prod, "hydro").merge_data("date")
+
+    assert list(merged.columns) == ["date", "wind", "prod", "rain_sum", "precipitation_hours"]
+    assert merged["date"].dt.day.tolist() == [2, 3, 4]
+    assert merged["prod"].tolist() == [2, 3, 4]
+
+
+##### Test des doublons #####
+def test_align_frames_rejects_duplicate_dates():
+    api, prod = _frames()
+    with pytest.raises(ValueError):
+        align_frames({"api": api, "prod": pd.concat([prod, prod])})
+
+
+##### Test des cas limites #####
+# Vérifie une jointure outer avec une table vide, et des dates avec fuseau horaire
+def test_align_frames_empty_frame_outer():
+    api, prod = _frames()
+    empty = prod.iloc[:0]
+
+    aligned, report = align_frames({"api": api, "prod": empty}, how="outer")
+    expected = pd.merge(api, empty, on="date", how="outer")
+
+    pd.testing.assert_frame_equal(aligned, expected, check_dtype=False)
+    assert report["prod"]["missing"] == 6
+    assert align_frames({"api": api, "prod": empty}, how="inner")[0].empty
+
+
+@pytest.mark.parametrize("how", ["inner", "outer"])
+def test_align_frames_keeps_time_zone(how):
+    api, prod = _frames()
+    api["date"] = api["date"].dt.tz_localize("Europe/Paris")
+    prod["date"] = prod["date"].dt.tz_localize("Europe/Paris")
+
+    aligned, _ = align_frames({"api": api, "prod": prod}, how=how)
+    expected = pd.merge(api, prod, on="date", how=how).sort_values("date", ignore_index=True)
+
+    pd.testing.assert_frame_equal(aligned, expected, check_dtype=False)
@@ -0,0 +1,154 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import StandardScaler
+
+import routes.predict
+from main import app
+from models.artifacts import FlatForest, LinearArtifact
+from models.energies import WIND
+from models.registry import ModelRegistry
+from prepare_data.prediction_log import PredictionLogger
+from routes.shedding import LoadShedder
+
+DAYS = [
+    {
+        "date": f"2025-01-{day:02d}",
+        "wind_gusts_10m_mean": 10.0 * day,
+        "wind_speed_10m_mean": 5.0 * day,
+        "winddirection_10m_dominant": 200,
+    }
+    for day in (1, 2, 3)
+]
+
+
+@pytest.fixture
+def forest(monkeypatch):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "date": pd.date_range("2024-01-01", periods=200, freq="D"),
+        "wind_gusts_10m_mean": rng.random(200) * 50,
+        "wind_speed_10m_mean": rng.random(200) * 30,
+        "winddirection_10m_dominant": rng.integers(0, 360, 200),
+    })
+    X, y = WIND.features.frame(df), df["wind_speed_10m_mean"] * 2 + rng.random(200) * 10
+    forest = FlatForest.from_estimator(RandomForestRegressor(n_estimators=30, random_state=0).fit(X, y))
+    scaler = StandardScaler().fit(X)
+    linear = LinearArtifact.from_estimator(
+        scaler, LinearRegression().fit(scaler.transform(X), y), list(X.columns)
+    )
+    models = {WIND.artifact: forest, WIND.fallback_artifact: linear}
+    monkeypatch.setattr(
+        routes.predict, "registry", ModelRegistry(budget_bytes=10**9, loader=models.__getitem__)
+    )
+    monkeypatch.setattr(routes.predict, "prediction_logger", PredictionLogger(sink=None))
+    return forest
+
+
+def _use_shedder(monkeypatch, shedder):
+    monkeypatch.setattr(routes.predict, "shedder", shedder)
+    monkeypatch.setattr("main.shedder", shedder)
+    monkeypatch.setattr("routes.metrics.shedder", shedder)
+
+
+##### Test des intervalles de prédiction #####
+# Vérifie les quantiles par jour, et la réponse inchangée sans quantiles
+def test_batch_returns_ordered_quantiles(forest):
+    client = TestClient(app)
+
+    point = client.post("/predict/batch", json=DAYS).json()
+    response = client.post(
+        "/predict/batch", params={"quantiles": [0.1, 0.5, 0.9]}, json=DAYS
+    ).json()
+
+    assert all("quantiles" not in item for item in point)
+    for item, plain in zip(response, point):
+        assert item["production"] == pytest.approx(plain["production"])
+        assert list(item["quantiles"]) == ["p10", "p50", "p90"]
+        assert item["quantiles"]["p10"] <= item["quantiles"]["p50"] <= item["quantiles"]["p90"]
+
+    single = client.post("/predict/", params={"quantiles": [0.1, 0.9]}, json=DAYS[0]).json()
+    assert single["quantiles"] == pytest.approx(
+        {key: response[0]["quantiles"][key] for key in ("p10", "p90")}
+    )
+    assert client.post("/predict/", params={"quantiles": [1.5]}, json=DAYS[0]).status_code == 422
+
+
+##### Test du délestage #####
+# Vérifie que le modèle de secours répond au-delà du seuil de charge, et que
+# les délestages sont comptés dans les métriques
+def test_fallback_answers_under_load(forest, monkeypatch):
+    client = TestClient(app)
+    assert client.post("/predict/", json=DAYS[0]).json()["model"] == "random_forest"
+
+    _use_shedder(monkeypatch, LoadShedder(max_in_flight=0))
+    response = client.post("/predict/batch", params={"quantiles": [0.1]}, json=DAYS).json()
+
+    assert [item["model"] for item in response] == ["linear_fallback"] * 3
+    assert all("quantiles" not in item for item in response)
+    assert client.get("/metrics/").json()["load_shedding"]["requests"] == {"shed": 1}
+
+
+##### Test de la journalisation des prédictions #####
+# Vérifie qu'une prédiction servie est mise en file avec son modèle et sa version
+def test_served_predictions_are_logged(forest, monkeypatch):
+    records = []
+    logger = PredictionLogger(sink=records.extend, flush_seconds=0.01)
+    monkeypatch.setattr(routes.predict, "prediction_logger", logger)
+    forest.metadata["version"] = "v1"
+
+    TestClient(app).post("/predict/batch", json=DAYS)
+    logger.close()
+
+    assert [record["date"] for record in records] == [day["date"] for day in DAYS]
+    assert records[0]["model"] == "random_forest"
+    assert records[0]["model_version"] == "v1"
+    assert records[0]["batch_size"] == 3
+    assert records[0]["latency_ms"] > 0
+
+
+##### Test des latences retenues pour le délestage #####
+# Vérifie que le chargement du modèle et les appels par lot n'entrent pas
+# dans le p95, et que le p95 est ignoré tant qu'il y a trop peu de mesures
+def test_shedding_p95_ignores_cold_start_and_batches(forest, monkeypatch):
+    models = {WIND.artifact: forest}
+
+    def slow_loader(name):
+        time.sleep(0.6)
+        return models[name]
+
+    monkeypatch.setattr(
+        routes.predict, "registry", ModelRegistry(budget_bytes=10**9, loader=slow_loader)
+    )
+    shedder = LoadShedder(p95_ms=250, min_samples=1)
+    _use_shedder(monkeypatch, shedder)
+    client = TestClient(app)
+
+    client.post("/predict/", json=DAYS[0])
+    client.post("/predict/batch", json=DAYS)
+
+    latencies = [latency for _, latency in shedder._latencies]
+    assert len(latencies) == 1
+    assert latencies[0] < 250
+    assert client.post("/predict/", json=DAYS[0]).json()["model"] == "random_forest"
+
+    warming = LoadShedder(p95_ms=250, min_samples=20)
+    warming._latencies.extend((time.monotonic(), 1000.0) for _ in range(19))
+    assert not warming.should_shed()
+
+
+##### Test de la validation des entrées #####
+# Vérifie qu'une date non ISO est refusée (422) et qu'un lot vide renvoie une liste vide
+def test_invalid_date_and_empty_batch(forest):
+    client = TestClient(app)
+
+    assert client.post("/predict/", json={**DAYS[0], "date": "01/02/2024"}).status_code == 422
+    assert client.post("/predict/batch", json=[{**DAYS[0], "date": "tomorrow"}]).status_code == 422
+    response = client.post("/predict/batch", json=[])
+    assert response.status_code == 200
+    assert response.json() == []
@@ -0,0 +1,67 @@
+import threading
+import time
+
+from prepare_data.prediction_log import PredictionLogger, storage_sink
+from prepare_data.storage import SQLiteBackend
+
+
+##### Test de l'écriture différée #####
+# Vérifie que les prédictions sont écrites par lots en arrière-plan
+def test_records_are_written_in_batches():
+    batches = []
+    written = threading.Event()
+
+    def sink(records):
+        batches.append(records)
+        if sum(map(len, batches)) == 5:
+            written.set()
+
+    logger = PredictionLogger(sink=sink, batch_size=2, flush_seconds=0.05)
+    for i in range(5):
+        logger.log({"i": i})
+
+    assert written.wait(2)
+    assert [record["i"] for batch in batches for record in batch] == [0, 1, 2, 3, 4]
+    assert max(map(len, batches)) <= 2
+    logger.close()
+    assert logger.stats()["written"] == 5
+
+
+##### Test du tampon plein #####
+# Vérifie que les enregistrements en trop sont comptés puis perdus, et que
+# l'arrêt écrit ce qui reste en attente
+def test_full_buffer_drops_and_close_flushes():
+    release = threading.Event()
+    batches = []
+
+    def slow_sink(records):
+        release.wait(2)
+        batches.append(records)
+
+    logger = PredictionLogger(sink=slow_sink, max_pending=3, batch_size=1, flush_seconds=0.01)
+    logger.log({"i": 0})
+    # Laisse le thread prendre le premier enregistrement et se bloquer sur l'écriture
+    deadline = time.monotonic() + 2
+    while logger.stats()["pending"] and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert logger.stats()["pending"] == 0
+    for i in range(1, 6):
+        logger.log({"i": i})
+
+    assert logger.stats()["dropped"] == 2
+    release.set()
+    logger.close(timeout=2)
+    assert sorted(record["i"] for batch in batches for record in batch) == [0, 1, 2, 3]
+
+
+##### Test du stockage des prédictions #####
+# Vérifie l'écriture dans une table SQLite, plusieurs lignes pouvant partager une date
+def test_storage_sink_appends_rows(tmp_path, monkeypatch):
+    backend = SQLiteBackend(str(tmp_path / "db.sqlite"))
+    monkeypatch.setattr("prepare_data.storage._backend", backend)
+    sink = storage_sink("predictions")
+
+    sink([{"date": "2025-01-01", "production": 1.0}])
+    sink([{"date": "2025-01-01", "production": 2.0}])
+
+    assert backend.fetch("predictions")["production"].tolist() == [1.0, 2.0]
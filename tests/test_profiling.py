@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+from prepare_data.profiling import iter_frame_chunks, profile_chunks
+
+
+##### Test du profilage en une passe #####
+# Vérifie les statistiques exactes (Welford) et approchées (sketch) sur des données découpées en blocs
+def test_profile_chunks_matches_full_scan():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"x": rng.normal(10, 3, 100_000), "label": ["a", "b"] * 50_000})
+    df.loc[::10, "x"] = np.nan
+
+    profile = profile_chunks(iter_frame_chunks(df, chunk_size=7_000))
+    x = profile["columns"]["x"]
+
+    assert profile["rows"] == 100_000
+    assert x["nulls"] == 10_000
+    assert x["count"] == 90_000
+    assert np.isclose(x["mean"], df["x"].mean())
+    assert np.isclose(x["variance"], df["x"].var())
+    assert x["min"] == df["x"].min() and x["max"] == df["x"].max()
+    # Quantiles approchés à 0.1 écart-type près
+    assert abs(x["quantiles"]["0.5"] - df["x"].median()) < 0.3
+    assert sum(x["histogram"]["counts"]) == 90_000
+    assert profile["columns"]["label"]["min"] == "a"
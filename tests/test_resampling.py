@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+from prepare_data.resampling import compact_hourly, hourly_to_daily, save_hourly
+
+
+def _hourly():
+    time = pd.date_range("2024-03-01", periods=48, freq="h")
+    speed = np.r_[np.arange(24.0), np.full(24, 50.0)]
+    return pd.DataFrame({
+        "time": time.strftime("%Y-%m-%dT%H:%M"),
+        "wind_speed_10m": speed,
+        "wind_gusts_10m": speed * 1.5,
+        # Le premier jour alterne entre 350° et 10° : moyenne circulaire de 0°
+        "wind_direction_10m": np.r_[np.tile([350.0, 10.0], 12), np.full(24, 90.0)],
+    })
+
+
+##### Test du passage horaire -> journalier #####
+def test_hourly_to_daily_features():
+    daily = hourly_to_daily(compact_hourly(_hourly()))
+
+    assert daily["date"].tolist() == ["2024-03-01", "2024-03-02"]
+    assert daily["wind_gusts_10m_max"].tolist() == [34.5, 75.0]
+    assert daily["wind_speed_10m_p90"].iloc[0] == pytest.approx(np.quantile(np.arange(24.0), 0.9))
+    # 3 m/s = 10,8 km/h : heures 11 à 23 le premier jour, toutes le second
+    assert daily["hours_above_cut_in"].tolist() == [13, 24]
+    assert daily["hours_above_rated"].tolist() == [0, 24]
+    direction = daily["wind_direction_10m_circular_mean"].to_numpy()
+    assert min(direction[0], 360 - direction[0]) == pytest.approx(0, abs=1e-3)
+    assert direction[1] == pytest.approx(90)
+
+
+##### Test du stockage compact #####
+def test_hourly_data_stored_as_float32_parquet(tmp_path):
+    path = save_hourly(compact_hourly(_hourly()), str(tmp_path / "hourly.parquet"))
+
+    stored = pd.read_parquet(path)
+    assert stored["wind_speed_10m"].dtype == np.float32
+    assert pd.api.types.is_datetime64_any_dtype(stored["time"])
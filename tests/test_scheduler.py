@@ -0,0 +1,105 @@
+import json
+import os
+import subprocess
+import sys
+from datetime import date
+
+import pandas as pd
+import pytest
+
+import prepare_data.storage as storage
+from pipeline.scheduler import JobLock, JobLocked, ingestion_window, run_job
+from prepare_data.db_handler import DBHandler
+from prepare_data.storage import SQLiteBackend
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HOLD_LOCK = """
+import sys, time
+from pipeline.scheduler import JobLock
+lock = JobLock(sys.argv[1])
+lock.acquire()
+print("locked", flush=True)
+time.sleep(60)
+"""
+
+
+##### Test de l'historique des tâches #####
+# Vérifie les durées et statuts enregistrés, et l'arrêt au premier échec
+def test_run_job_records_steps_and_stops_on_failure(tmp_path):
+    history = tmp_path / "jobs.jsonl"
+    calls = []
+
+    def fail():
+        raise RuntimeError("API down")
+
+    entry = run_job(
+        "refresh",
+        [("ingest", lambda: calls.append("ingest")), ("train", fail), ("never", lambda: calls.append("never"))],
+        lock=JobLock(str(tmp_path / "job.lock")),
+        history_path=str(history),
+    )
+
+    assert calls == ["ingest"]
+    assert entry["status"] == "failed"
+    assert [step["status"] for step in entry["steps"]] == ["success", "failed"]
+    assert json.loads(history.read_text())["error"] == "train: API down"
+    # Verrou libéré : une nouvelle tâche le prend
+    with JobLock(str(tmp_path / "job.lock")):
+        pass
+
+
+##### Test du verrou #####
+# Vérifie qu'une tâche est ignorée quand une autre tient le verrou, et qu'un
+# fichier de verrou laissé par un processus disparu ne bloque rien
+def test_job_lock_prevents_overlap_and_recovers_stale_lock(tmp_path):
+    lock_path = str(tmp_path / "job.lock")
+    history = str(tmp_path / "jobs.jsonl")
+
+    with JobLock(lock_path):
+        entry = run_job("refresh", [("step", lambda: None)], lock=JobLock(lock_path), history_path=history)
+    assert entry["status"] == "skipped"
+
+    # Verrou laissé par un processus disparu
+    (tmp_path / "job.lock").write_text("999999999")
+    entry = run_job("refresh", [("step", lambda: None)], lock=JobLock(lock_path), history_path=history)
+    assert entry["status"] == "success"
+
+
+# Vérifie que deux processus ne tiennent jamais le verrou en même temps
+def test_job_lock_is_exclusive_across_processes(tmp_path):
+    lock_path = str(tmp_path / "job.lock")
+    holder = subprocess.Popen(
+        [sys.executable, "-c", HOLD_LOCK, lock_path],
+        cwd=ROOT,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        assert holder.stdout.readline().strip() == "locked"  # pyright: ignore[reportOptionalMemberAccess]
+        with pytest.raises(JobLocked):
+            JobLock(lock_path).acquire()
+    finally:
+        holder.kill()
+        holder.wait()
+    # Le noyau libère le verrou à la mort du processus
+    with JobLock(lock_path):
+        pass
+
+
+##### Test de la fenêtre d'ingestion #####
+# Vérifie que la tâche récupère les jours depuis le dernier jour stocké
+# jusqu'à aujourd'hui, et tout l'historique quand une table est vide
+def test_ingestion_window_starts_at_stored_watermark(tmp_path, monkeypatch):
+    backend = SQLiteBackend(str(tmp_path / "energy.sqlite"))
+    monkeypatch.setattr(storage, "_backend", backend)
+    handler = DBHandler(backend=backend)
+    today = date(2025, 10, 20)
+
+    handler.sync(pd.DataFrame({"date": ["2025-10-01"], "prod_eolienne": [1.0]}), "eolienne")
+    assert ingestion_window(("eolienne", "solaire"), today=today) == (None, None)
+
+    handler.sync(pd.DataFrame({"date": ["2025-10-10"], "prod_solaire": [1.0]}), "solaire")
+    assert ingestion_window(("eolienne", "solaire"), refetch_days=7, today=today) == (
+        date(2025, 9, 24),
+        today,
+    )
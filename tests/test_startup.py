@@ -0,0 +1,69 @@
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+from models.artifacts import FlatForest, publish
+from models.energies import WIND
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Budget de temps d'import de `main` (API), en secondes
+IMPORT_BUDGET_S = 1.5
+HEAVY_MODULES = ["sklearn", "xgboost", "supabase", "pipeline.pipeline"]
+
+STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+loaded = [name for name in {heavy} if name in sys.modules]
+
+from fastapi.testclient import TestClient
+response = TestClient(main.app).post("/predict/", json={{
+    "date": "2025-01-15",
+    "wind_gusts_10m_mean": 30.0,
+    "wind_speed_10m_mean": 12.0,
+    "winddirection_10m_dominant": 200,
+}})
+print(json.dumps({{"elapsed": elapsed, "loaded": loaded, "status": response.status_code}}))
+"""
+
+
+##### Test du démarrage de l'API #####
+# Vérifie que l'API démarre sans identifiants de base de données, à partir d'un
+# artefact local, sans charger les modules lourds et dans le budget de temps
+def test_api_starts_from_local_artifact_without_database(tmp_path):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "date": pd.date_range("2024-01-01", periods=100, freq="D"),
+        "wind_gusts_10m_mean": rng.random(100) * 50,
+        "wind_speed_10m_mean": rng.random(100) * 30,
+        "winddirection_10m_dominant": rng.integers(0, 360, 100),
+    })
+    model = RandomForestRegressor(n_estimators=5, random_state=0)
+    model.fit(WIND.features.frame(df), rng.random(100))
+    publish(FlatForest.from_estimator(model), WIND.artifact, root=str(tmp_path))
+
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if key not in ("SUPABASE_URL", "SUPABASE_SECRET_KEY")
+    }
+    env["MODEL_ARTIFACT_DIR"] = str(tmp_path)
+    result = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT.format(heavy=HEAVY_MODULES)],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=ROOT,
+    )
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert report["status"] == 200
+    assert report["loaded"] == []
+    assert report["elapsed"] < IMPORT_BUDGET_S
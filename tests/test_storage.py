@@ -0,0 +1,106 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from prepare_data.db_handler import DBHandler
+from prepare_data.storage import SQLiteBackend
+
+
+def _handler(tmp_path):
+    handler = DBHandler(backend=SQLiteBackend(str(tmp_path / "energy.sqlite")))
+    handler.insert(
+        pd.DataFrame({
+            "date": pd.date_range("2024-01-01", periods=50, freq="D"),
+            "prod_eolienne": np.arange(50.0),
+        }),
+        "eolienne",
+    )
+    return handler
+
+
+##### Test du stockage SQLite local #####
+# Vérifie l'insertion, la lecture complète et les requêtes par période
+def test_sqlite_backend_insert_fetch_and_range(tmp_path):
+    handler = _handler(tmp_path)
+
+    assert len(handler.fetch("eolienne")) == 50
+    january = handler.fetch_range("eolienne", date(2024, 1, 10), date(2024, 1, 31))
+    assert january["date"].tolist()[0] == "2024-01-10"
+    assert len(january) == 22
+
+    pages = list(handler.iter_range("eolienne", start=date(2024, 2, 1), page_size=7))
+    assert [len(page) for page in pages] == [7, 7, 5]
+    assert pages[-1][-1] == {"date": "2024-02-19", "prod_eolienne": 49.0}
+
+
+##### Test de la protection contre les doubles insertions #####
+def test_sqlite_backend_refuses_insert_into_filled_table(tmp_path):
+    handler = _handler(tmp_path)
+
+    handler.insert(pd.DataFrame({"date": pd.to_datetime(["2030-01-01"]), "prod_eolienne": [1.0]}), "eolienne")
+
+    assert len(handler.fetch("eolienne")) == 50
+
+
+##### Test de la synchronisation incrémentale #####
+# Vérifie que seules les lignes nouvelles ou modifiées sont écrites
+def test_sync_writes_only_new_and_changed_rows(tmp_path):
+    handler = _handler(tmp_path)
+    refresh = pd.DataFrame({
+        "date": pd.date_range("2024-02-15", periods=10, freq="D"),
+        "prod_eolienne": np.arange(45.0, 55.0),
+    })
+    refresh.loc[0, "prod_eolienne"] = -1.0
+
+    report = handler.sync(refresh, "eolienne")
+
+    assert report == {"inserted": 5, "updated": 1, "unchanged": 4}
+    stored = handler.fetch("eolienne")
+    assert len(stored) == 55
+    assert stored.loc[stored["date"] == "2024-02-15", "prod_eolienne"].item() == -1.0
+    # Une seconde synchronisation identique n'écrit rien
+    assert handler.sync(refresh, "eolienne") == {"inserted": 0, "updated": 0, "unchanged": 10}
+
+
+##### Test de la synchronisation vers une base vide #####
+# Vérifie que la première synchronisation crée la table, avec une clé (date, site)
+def test_sync_creates_multi_site_table(tmp_path):
+    handler = DBHandler(backend=SQLiteBackend(str(tmp_path / "energy.sqlite")))
+    df = pd.DataFrame({
+        "date": pd.to_datetime(["2024-01-01", "2024-01-01", "2024-01-02", "2024-01-02"]),
+        "site": ["a", "b", "a", "b"],
+        "prod_eolienne": [1.0, 2.0, 3.0, 4.0],
+    })
+
+    assert handler.sync(df, "eolienne") == {"inserted": 4, "updated": 0, "unchanged": 0}
+    df.loc[3, "prod_eolienne"] = 40.0
+    assert handler.sync(df, "eolienne") == {"inserted": 0, "updated": 1, "unchanged": 3}
+    stored = handler.fetch("eolienne")
+    assert len(stored) == 4
+    assert stored.loc[(stored["date"] == "2024-01-02") & (stored["site"] == "b"), "prod_eolienne"].item() == 40.0
+
+
+##### Test de l'ajout de colonnes #####
+# Vérifie que les colonnes absentes de la table sont créées, y compris `site`
+def test_sync_adds_missing_columns(tmp_path):
+    handler = _handler(tmp_path)
+    df = pd.DataFrame({
+        "date": pd.to_datetime(["2024-01-01", "2024-03-01"]),
+        "site": ["a", "a"],
+        "prod_eolienne": [0.0, 7.0],
+        "wind_speed_10m_mean": [3.5, 4.5],
+    })
+
+    assert handler.sync(df, "eolienne")["inserted"] == 2
+    stored = handler.fetch_range("eolienne", date(2024, 3, 1))
+    assert stored[["site", "prod_eolienne", "wind_speed_10m_mean"]].values.tolist() == [["a", 7.0, 4.5]]
+
+
+##### Test de la synchronisation d'un jeu vide #####
+# Vérifie qu'une fenêtre d'ingestion sans nouvelle ligne n'écrit rien et ne lève pas
+def test_sync_empty_frame_writes_nothing(tmp_path):
+    handler = _handler(tmp_path)
+    empty = pd.DataFrame({"date": pd.Series(dtype="datetime64[ns]"), "prod_eolienne": []})
+
+    assert handler.sync(empty, "eolienne") == {"inserted": 0, "updated": 0, "unchanged": 0}
+    assert len(handler.fetch("eolienne")) == 50
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+import models.model as model_module
+from models.artifacts import current_version_path
+from models.energies import WIND
+
+
+def _wind_table(n_days=120):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "date": pd.date_range("2024-01-01", periods=n_days).strftime("%Y-%m-%d"),
+        "wind_gusts_10m_mean": rng.random(n_days) * 40,
+        "wind_speed_10m_mean": rng.random(n_days) * 20,
+        "winddirection_10m_dominant": rng.integers(0, 360, n_days),
+        "prod_eolienne": rng.random(n_days) * 100,
+    })
+
+
+##### Test du cache d'entraînement #####
+# Vérifie qu'un second entraînement sur les mêmes données (dans n'importe quel
+# ordre) s'arrête sur le cache sans rien republier
+def test_full_training_reuses_cached_model(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "models").mkdir()
+    monkeypatch.setattr(
+        model_module,
+        "initialize_model",
+        lambda: RandomForestRegressor(n_estimators=5, random_state=0),
+    )
+    df = _wind_table()
+
+    first = model_module.run_full_training(df)
+    published = current_version_path(WIND.artifact)
+    train_model, publish_artifact = model_module.train_model, model_module.publish_artifact
+    monkeypatch.setattr(
+        model_module, "train_model", lambda *args: pytest.fail("cache hit retrained")
+    )
+    monkeypatch.setattr(
+        model_module, "publish_artifact", lambda *args: pytest.fail("cache hit republished")
+    )
+    second = model_module.run_full_training(df.sample(frac=1, random_state=1))
+
+    assert not first["cache_hit"]
+    assert second["cache_hit"]
+    assert second["mae"] == first["mae"]
+    assert current_version_path(WIND.artifact) == published
+
+    monkeypatch.setattr(model_module, "train_model", train_model)
+    monkeypatch.setattr(model_module, "publish_artifact", publish_artifact)
+    changed = model_module.run_full_training(df.iloc[:-1])
+    assert not changed["cache_hit"]